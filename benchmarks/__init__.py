@@ -0,0 +1 @@
+"""Benchmarks of the scrapers against a local server."""
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+"""Run the scraper benchmarks against the local benchmark server.
+
+Each benchmark scrapes a synthetic page, reports the latency percentiles,
+the throughput and the memory allocated per scrape and writes the results
+as json to compare them between versions, e.g.
+
+    python -m benchmarks.run_benchmarks --output new.json --compare old.json
+"""
+
+import argparse
+import dataclasses
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess  # nosec
+import sys
+import time
+import tracemalloc
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.http_sessions as http_sessions
+import ezscrape.scraping.scraper as scraper
+import ezscrape.scraping.scraper_requests as scraper_requests
+
+import benchmarks.server as bench_server
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_CONCURRENCY = 8
+# Scrapes measured with tracemalloc, which slows down the scrapes
+MEMORY_ITERATIONS = 10
+# Cold imports measured, each in a new interpreter
+IMPORT_RUNS = 5
+IMPORT_MODULES = ['ezscrape.scraping.scraper']
+# Budget of the median cold import of each module
+IMPORT_BUDGET_MS = 500.0
+IMPORT_SCRIPT = (
+    'import time; start = time.perf_counter(); import {module}; '
+    'print((time.perf_counter() - start) * 1000)')
+
+# Scrape all configs and yield the results
+ScrapeRunner = Callable[[List[core.ScrapeConfig]], Iterable[core.ScrapeResult]]
+
+
+@dataclass
+class Benchmark():
+    """Define a benchmark, scraping url iterations times with runner."""
+
+    name: str
+    url: str
+    runner: ScrapeRunner
+    iterations: int
+    concurrency: int = 1
+
+
+@dataclass
+class BenchmarkResult():
+    """The measurements of a benchmark, times in milliseconds.
+
+    latency_ms has the min, mean, p50, p90, p99 and max of the scrapes,
+    memory_kib_per_scrape the peak and the retained memory.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    name: str
+    iterations: int
+    concurrency: int
+    duration_s: float
+    throughput_per_s: float
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    memory_kib_per_scrape: Dict[str, float] = field(default_factory=dict)
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Get the percentile of the values, interpolated between ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+
+    rank = (len(ordered) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def scrape_duration_ms(result: core.ScrapeResult) -> float:
+    """Get the duration of all attempts of the scrape."""
+    return sum(attempt.duration_ms for attempt in result.attempts)
+
+
+def run_benchmark(benchmark: Benchmark, *,
+                  memory_iterations: int = MEMORY_ITERATIONS
+                  ) -> BenchmarkResult:
+    """Run the benchmark and measure the memory in a separate run."""
+    configs = [core.ScrapeConfig(benchmark.url)
+               for _ in range(benchmark.iterations)]
+
+    # Warm up connections and imports
+    list(benchmark.runner(configs[:1]))
+
+    start = time.perf_counter()
+    results = list(benchmark.runner(configs))
+    duration_s = time.perf_counter() - start
+
+    latencies = [scrape_duration_ms(result) for result in results]
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[result.status.name] = statuses.get(result.status.name, 0) + 1
+
+    return BenchmarkResult(
+        name=benchmark.name,
+        iterations=benchmark.iterations,
+        concurrency=benchmark.concurrency,
+        duration_s=round(duration_s, 3),
+        throughput_per_s=round(len(results) / duration_s, 2),
+        latency_ms={
+            'min': round(min(latencies), 3),
+            'mean': round(statistics.mean(latencies), 3),
+            'p50': round(percentile(latencies, 50), 3),
+            'p90': round(percentile(latencies, 90), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'max': round(max(latencies), 3)},
+        memory_kib_per_scrape=measure_memory(
+            benchmark, min(memory_iterations, benchmark.iterations)),
+        statuses=statuses)
+
+
+def measure_memory(benchmark: Benchmark, iterations: int) -> Dict[str, float]:
+    """Measure the peak and the retained memory per scrape in KiB."""
+    if iterations < 1:
+        return {}
+
+    configs = [core.ScrapeConfig(benchmark.url) for _ in range(iterations)]
+    # Starting tracemalloc also starts the peak
+    tracemalloc.start()
+    try:
+        start_current, _ = tracemalloc.get_traced_memory()
+        # Keep the results, their pages are part of the retained memory
+        results = list(benchmark.runner(configs))
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+
+    return {
+        'peak': round((peak - start_current) / 1024 / iterations, 3),
+        'retained': round((current - start_current) / 1024 / iterations, 3)}
+
+
+def measure_import_ms(module: str, runs: int = IMPORT_RUNS) -> float:
+    """Measure the median cold import time of the module."""
+    durations = []
+    for _ in range(runs):
+        output = subprocess.run(  # nosec
+            [sys.executable, '-c', IMPORT_SCRIPT.format(module=module)],
+            check=True, stdout=subprocess.PIPE, universal_newlines=True)
+        durations.append(float(output.stdout.strip()))
+    return round(statistics.median(durations), 3)
+
+
+def sequential_runner(
+        scrape: Callable[[core.ScrapeConfig], core.ScrapeResult]
+) -> ScrapeRunner:
+    """Get a runner scraping the configs one by one."""
+    def _run(configs: List[core.ScrapeConfig]
+             ) -> Iterator[core.ScrapeResult]:
+        for config in configs:
+            yield scrape(config)
+    return _run
+
+
+def concurrent_runner(concurrency: int) -> ScrapeRunner:
+    """Get a runner scraping the configs with scraper.scrape_urls."""
+    def _run(configs: List[core.ScrapeConfig]
+             ) -> Iterable[core.ScrapeResult]:
+        return scraper.scrape_urls(configs, max_workers=concurrency,
+                                   max_per_host=concurrency)
+    return _run
+
+
+def requests_benchmarks(server: bench_server.BenchmarkServer,
+                        iterations: int,
+                        concurrency: int) -> List[Benchmark]:
+    """Get the benchmarks for the requests scraper and scrape_url."""
+    session_pool = http_sessions.SessionPool()
+
+    def _requests_scrape(config: core.ScrapeConfig) -> core.ScrapeResult:
+        return scraper_requests.RequestsScraper(
+            config, session_pool=session_pool).scrape()
+
+    requests_runner = sequential_runner(_requests_scrape)
+    return [
+        Benchmark('requests_small', server.page_url(),
+                  requests_runner, iterations),
+        Benchmark('requests_latency_50ms', server.page_url(latency_ms=50),
+                  requests_runner, iterations),
+        Benchmark('requests_large_5mb', server.page_url(size=5 * 1024 * 1024),
+                  requests_runner, max(iterations // 5, 1)),
+        Benchmark('requests_drip_10x20ms',
+                  server.page_url(size=10 * 1024, chunk_bytes=1024,
+                                  drip_ms=20),
+                  requests_runner, max(iterations // 5, 1)),
+        Benchmark('requests_error_rate_20pct',
+                  server.page_url(error_rate=0.2),
+                  requests_runner, iterations),
+        Benchmark('scrape_url_small', server.page_url(),
+                  sequential_runner(scraper.scrape_url), iterations),
+        Benchmark('scrape_urls_latency_50ms', server.page_url(latency_ms=50),
+                  concurrent_runner(concurrency), iterations * 2,
+                  concurrency)]
+
+
+def selenium_benchmarks(server: bench_server.BenchmarkServer,
+                        iterations: int) -> List[Benchmark]:
+    """Get the Selenium benchmarks, none if Chrome is not set up."""
+    # Imported here so the requests benchmarks run without Selenium
+    # pylint: disable=import-outside-toplevel
+    import ezscrape.scraping.scraper_selenium as scraper_selenium
+
+    session_cls = scraper_selenium.SeleniumChromeSession
+    if not (os.environ.get(session_cls.chrome_exec_env_var) and
+            os.environ.get(session_cls.chrome_webdriver_env_var)):
+        print('Chrome not set up, skip the Selenium benchmarks')
+        return []
+
+    driver_pool = scraper_selenium.ChromeDriverPool(1)
+
+    def _selenium_scrape(config: core.ScrapeConfig) -> core.ScrapeResult:
+        config.wait_for_elem_list.append(core.WaitForXpathElem(
+            R'''//p[contains(text(),'LOADED-Javascript Line')]'''))
+        return scraper_selenium.SeleniumChromeScraper(
+            config, driver_pool=driver_pool).scrape()
+
+    return [Benchmark('selenium_js_delayed',
+                      server.file_url('SinglePageJS_Delayed.html'),
+                      sequential_runner(_selenium_scrape),
+                      max(iterations // 5, 1))]
+
+
+def compare_results(results: List[BenchmarkResult],
+                    baseline: Dict[str, BenchmarkResult]) -> List[str]:
+    """Describe the change of p50 latency and throughput to the baseline."""
+    lines = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            lines.append(F'{result.name}: no baseline')
+            continue
+
+        changes = []
+        for label, new, old in [
+                ('p50', result.latency_ms['p50'], base.latency_ms['p50']),
+                ('throughput', result.throughput_per_s,
+                 base.throughput_per_s)]:
+            change = ((new - old) / old * 100) if old else 0.0
+            changes.append(F'{label} {old} -> {new} ({change:+.1f}%)')
+        lines.append(F'{result.name}: ' + ', '.join(changes))
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks and write the json results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                        help='scrapes per benchmark')
+    parser.add_argument('--concurrency', type=int,
+                        default=DEFAULT_CONCURRENCY,
+                        help='workers for the concurrent benchmarks')
+    parser.add_argument('--filter', default='',
+                        help='only run benchmarks containing the text')
+    parser.add_argument('--selenium', action='store_true',
+                        help='also run the Selenium benchmarks')
+    parser.add_argument('--output', help='write the json results to the file')
+    parser.add_argument('--compare', help='json results to compare with')
+    parser.add_argument('--import-budget-ms', type=float,
+                        default=IMPORT_BUDGET_MS,
+                        help='fail if a cold import takes longer')
+    args = parser.parse_args(argv)
+
+    import_ms = {module: measure_import_ms(module)
+                 for module in IMPORT_MODULES}
+    over_budget = [module for module, duration in import_ms.items()
+                   if duration > args.import_budget_ms]
+    for module, duration in import_ms.items():
+        print(F'import {module}: {duration}ms')
+
+    with bench_server.BenchmarkServer() as server:
+        benchmarks = requests_benchmarks(server, args.iterations,
+                                         args.concurrency)
+        if args.selenium:
+            benchmarks += selenium_benchmarks(server, args.iterations)
+
+        results = []
+        for benchmark in benchmarks:
+            if args.filter not in benchmark.name:
+                continue
+            result = run_benchmark(benchmark)
+            results.append(result)
+            print(F'{result.name}: {result.throughput_per_s}/s, '
+                  F'p50 {result.latency_ms["p50"]}ms, '
+                  F'p99 {result.latency_ms["p99"]}ms, '
+                  F'peak {result.memory_kib_per_scrape.get("peak")}KiB')
+
+    output = {
+        'metadata': {
+            'timestamp': datetime.datetime.now(
+                datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform()},
+        'import_ms': import_ms,
+        'results': [dataclasses.asdict(result) for result in results]}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file_ptr:
+            json.dump(output, file_ptr, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file_ptr:
+            baseline = {entry['name']: BenchmarkResult(**entry)
+                        for entry in json.load(file_ptr)['results']}
+        print('\n'.join(compare_results(results, baseline)))
+
+    if over_budget:
+        print(F'Imports over the {args.import_budget_ms}ms budget: '
+              F'{", ".join(over_budget)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""Local multi threaded http server emulating slow, large and failing pages.
+
+/page answers a synthetic html page controlled by the query:
+    latency_ms:  delay before sending the headers
+    size:        size of the body in bytes
+    drip_ms:     delay before each chunk of the body
+    chunk_bytes: size of the dripped chunks
+    error_rate:  probability (0 to 1) of answering with a 500 error
+
+All other paths are served from tests/TestServerContent, e.g. for the
+Selenium benchmarks.
+"""
+
+import functools
+import http.server
+import os
+import random
+import threading
+import time
+import urllib.parse
+
+from typing import Dict, Optional
+
+TEST_SERVER_CONTENT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'tests', 'TestServerContent')
+
+DEFAULT_SIZE = 2048
+DEFAULT_CHUNK_BYTES = 16 * 1024
+
+_PAGE_START = b'<html><head><title>Benchmark</title></head><body><p>'
+_PAGE_END = b'</p></body></html>'
+
+
+def page_body(size: int) -> bytes:
+    """Get a html page of exactly size bytes, unless smaller than a page."""
+    filler = max(size - len(_PAGE_START) - len(_PAGE_END), 0)
+    return _PAGE_START + b'x' * filler + _PAGE_END
+
+
+class _BenchmarkHandler(http.server.SimpleHTTPRequestHandler):
+    """Handle the synthetic pages, serve files otherwise."""
+
+    # Keep connections alive like most servers, without Nagle the headers
+    # and the body written separately don't wait for delayed acks
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Answer the synthetic page or the file."""
+        url_split = urllib.parse.urlsplit(self.path)
+        if url_split.path != '/page':
+            super().do_GET()
+            return
+
+        query = urllib.parse.parse_qs(url_split.query)
+
+        def _param(name: str, default: float = 0) -> float:
+            return float(query.get(name, [default])[0])
+
+        time.sleep(_param('latency_ms') / 1000)
+
+        # Not used for security purposes
+        if random.random() < _param('error_rate'):  # nosec
+            body = b'<html><body>Error</body></html>'
+            self.send_response(500)
+        else:
+            body = page_body(int(_param('size', DEFAULT_SIZE)))
+            self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        drip_time = _param('drip_ms') / 1000
+        chunk_bytes = int(_param('chunk_bytes', DEFAULT_CHUNK_BYTES))
+        for start in range(0, len(body), chunk_bytes):
+            if drip_time:
+                time.sleep(drip_time)
+            self.wfile.write(body[start:start + chunk_bytes])
+
+    def log_message(self, format: str, *args) -> None:  # type: ignore
+        """Don't log every request."""
+        # pylint: disable=redefined-builtin
+
+
+class BenchmarkServer():
+    """Context Manager running the benchmark server in a thread."""
+
+    def __init__(self, port: int = 0):
+        """Initialize the server on the port, 0 picks a free port."""
+        handler = functools.partial(_BenchmarkHandler,
+                                    directory=TEST_SERVER_CONTENT)
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', port),
+                                                       handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={'poll_interval': 0.01}, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """Property to get the url of the server."""
+        return F'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def page_url(self, **params: Optional[float]) -> str:
+        """Get the url of the synthetic page for the query parameters."""
+        query: Dict[str, float] = {
+            name: value for name, value in params.items() if value}
+        if not query:
+            return F'{self.base_url}/page'
+        return F'{self.base_url}/page?{urllib.parse.urlencode(query)}'
+
+    def file_url(self, path: str) -> str:
+        """Get the url of the file in the test server content."""
+        return F'{self.base_url}/{path}'
+
+    def __enter__(self) -> 'BenchmarkServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,32 @@
+@echo off
+
+setlocal
+
+set PROJ_MAIN_DIR=%~dp0..
+
+pushd %PROJ_MAIN_DIR%
+
+for /f "delims=" %%a in ('wmic OS Get localdatetime ^| find "."') do set DateTime=%%a
+
+set Yr=%DateTime:~0,4%
+set Mon=%DateTime:~4,2%
+set Day=%DateTime:~6,2%
+set Hr=%DateTime:~8,2%
+set Min=%DateTime:~10,2%
+set Sec=%DateTime:~12,2%
+
+set datetimef=%Yr%.%Mon%.%Day%_%Hr%-%Min%-%Sec%
+
+set BENCHMARK_DIR=%PROJ_MAIN_DIR%\benchmark_results
+if not exist "%BENCHMARK_DIR%" mkdir "%BENCHMARK_DIR%"
+set BENCHMARK_OUTPUT=%BENCHMARK_DIR%\benchmark_%datetimef%.json
+
+rem Pass e.g. "--compare <previous results> --selenium" to the runner
+echo Command: "python -m benchmarks.run_benchmarks --output "%BENCHMARK_OUTPUT%" %*"
+python -m benchmarks.run_benchmarks --output "%BENCHMARK_OUTPUT%" %*
+set return_code=%errorlevel%
+
+popd
+
+endlocal
+exit /B %return_code%
@@ -0,0 +1,19 @@
+#!/bin/bash
+
+SCRIPT_PATH="$( cd "$( dirname "${BASH_SOURCE[0]}" )" >/dev/null 2>&1 && pwd )"
+PROJ_MAIN_DIR=$SCRIPT_PATH/..
+BENCHMARK_DIR=$PROJ_MAIN_DIR/benchmark_results
+
+mkdir -p "$BENCHMARK_DIR"
+BENCHMARK_OUTPUT=$BENCHMARK_DIR/benchmark_$(date +%Y.%m.%d_%H-%M-%S).json
+
+echo BENCHMARK_OUTPUT: $BENCHMARK_OUTPUT
+
+# Pass e.g. "--compare <previous results> --selenium" to the runner
+pushd "$PROJ_MAIN_DIR"
+python -m benchmarks.run_benchmarks --output "$BENCHMARK_OUTPUT" "$@"
+return_code=$?
+popd
+
+echo "exit $return_code"
+exit $return_code
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+"""Module providing the blocking of browser resources by the Selenium scraper.
+
+Resources are blocked by url pattern with the cdp commands of Chrome,
+hosts by the host resolver rules Chrome is launched with.
+"""
+
+import contextlib
+import logging
+
+from typing import Iterable, Iterator, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+import ezscrape.scraping.core as core
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# File extensions of the resource types blocked by url, images are also
+# blocked by preference if Chrome is launched for the config
+RESOURCE_EXTENSIONS = {
+    core.ResourceType.IMAGE: ('apng', 'avif', 'bmp', 'gif', 'ico', 'jpeg',
+                              'jpg', 'png', 'svg', 'webp'),
+    core.ResourceType.FONT: ('eot', 'otf', 'ttf', 'woff', 'woff2'),
+    core.ResourceType.MEDIA: ('avi', 'flac', 'm4a', 'mkv', 'mov', 'mp3',
+                              'mp4', 'mpeg', 'ogg', 'wav', 'webm'),
+    core.ResourceType.STYLESHEET: ('css',)}
+BLOCK_IMAGES_PREF = 'profile.managed_default_content_settings.images'
+
+
+def blocked_url_patterns(
+        policy: Optional[core.ResourcePolicy]) -> List[str]:
+    """Get the url patterns blocked by the resource policy."""
+    if policy is None:
+        return []
+
+    patterns = list(policy.blocked_urls)
+    for resource_type in core.ResourceType:
+        if resource_type in policy.blocked_types:
+            for extension in RESOURCE_EXTENSIONS[resource_type]:
+                # Also match urls with a query
+                patterns += [F'*.{extension}', F'*.{extension}?*']
+    return patterns
+
+
+def host_resolver_rules(allowed_hosts: Iterable[str]) -> str:
+    """Get the Chrome host resolver rules failing all but the hosts."""
+    rules = ['MAP * ~NOTFOUND']
+    for host in dict.fromkeys(allowed_hosts):
+        rules.append(F'EXCLUDE {host}')
+    return ', '.join(rules)
+
+
+@contextlib.contextmanager
+def blocked_urls(driver: RemoteWebDriver,
+                 patterns: List[str]) -> Iterator[None]:
+    """Context Manager blocking the url patterns in the browser."""
+    if not patterns:
+        yield
+        return
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except (AttributeError, WebDriverException) as error:
+        logger.warning(F'Driver cannot block urls, load all: {error}')
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        try:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        except WebDriverException as error:
+            logger.debug(F'Error unblocking urls: {error}')
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+"""Module providing the javascript run in the browser by the Selenium scraper.
+
+Scripts return their results, async scripts call the callback passed as
+the last argument.
+"""
+
+RESET_STORAGE_SCRIPT = R'''
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+'''
+
+# Functions to check a [locator type, locator, clickable, ...] condition,
+# returning [state, element] with state 'found', 'missing' or 'invalid' if
+# the locator can't be checked by the script. Clickable is approximated
+# with the element having a layout box, not hidden, transparent or disabled.
+_CONDITION_FUNCTIONS = R'''
+function findElement(by, locator) {
+    if (by === 'xpath') {
+        return document.evaluate(locator, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (by === 'css selector') {
+        return document.querySelector(locator);
+    }
+    return document.getElementById(locator);
+}
+
+function isClickable(elem) {
+    if (!elem.getClientRects().length || elem.matches(':disabled')) {
+        return false;
+    }
+    var style = window.getComputedStyle(elem);
+    return style.visibility !== 'hidden' && style.opacity !== '0';
+}
+
+function checkCondition(condition) {
+    var elem;
+    try {
+        elem = findElement(condition[0], condition[1]);
+    } catch (e) {
+        return ['invalid', null];
+    }
+    if (elem === null) {
+        return ['missing', null];
+    }
+    if (elem.nodeType !== Node.ELEMENT_NODE) {
+        return ['invalid', null];
+    }
+    if (condition[2] && !isClickable(elem)) {
+        return ['missing', null];
+    }
+    return ['found', elem];
+}
+'''
+
+# Check [[locator type, locator, clickable], ...] in one round trip, return
+# [state, element] for each condition
+FIND_CONDITIONS_SCRIPT = _CONDITION_FUNCTIONS + R'''
+return arguments[0].map(checkCondition);
+'''
+
+# Async script checking [[locator type, locator, clickable, must have], ...]
+# on each change of the dom or the ready state, and every recheck interval
+# for style changes not visible as mutation. Resolves with [state, element]
+# for each condition once met or a condition is invalid, null on timeout.
+OBSERVE_CONDITIONS_SCRIPT = _CONDITION_FUNCTIONS + R'''
+var conditions = arguments[0];
+var timeoutMs = arguments[1];
+var recheckMs = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function check() {
+    var checks = conditions.map(checkCondition);
+    var mustHaveOk = true;
+    var foundCount = 0;
+    for (var idx = 0; idx < checks.length; idx++) {
+        if (checks[idx][0] === 'invalid') {
+            return checks;
+        }
+        if (checks[idx][0] === 'found') {
+            foundCount++;
+        } else if (conditions[idx][3]) {
+            mustHaveOk = false;
+        }
+    }
+    return (mustHaveOk && foundCount > 0) ? checks : null;
+}
+
+var checks = check();
+if (checks !== null) {
+    done(checks);
+    return;
+}
+
+var finished = false;
+var observer = new MutationObserver(onChange);
+var recheckTimer = setInterval(onChange, recheckMs);
+var timeoutTimer = setTimeout(function () { finish(null); }, timeoutMs);
+
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearInterval(recheckTimer);
+    clearTimeout(timeoutTimer);
+    document.removeEventListener('readystatechange', onChange);
+    done(result);
+}
+
+function onChange() {
+    var checks = check();
+    if (checks !== null) {
+        finish(checks);
+    }
+}
+
+observer.observe(document, {
+    childList: true, subtree: true, attributes: true, characterData: true});
+document.addEventListener('readystatechange', onChange);
+'''
+
+# Extract the elements matching [[locator type, locator], ...] in one round
+# trip, return [[outer html, text], ...] for each locator or null if the
+# locator is invalid. Nodes other than elements, e.g. attributes or text
+# nodes, return their text as html. The text is the textContent, which
+# unlike innerText doesn't need a layout.
+EXTRACT_ELEMENTS_SCRIPT = R'''
+function findAll(by, locator) {
+    if (by === 'xpath') {
+        var snapshot = document.evaluate(locator, document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var idx = 0; idx < snapshot.snapshotLength; idx++) {
+            nodes.push(snapshot.snapshotItem(idx));
+        }
+        return nodes;
+    }
+    return Array.prototype.slice.call(document.querySelectorAll(locator));
+}
+
+return arguments[0].map(function (locator) {
+    var nodes;
+    try {
+        nodes = findAll(locator[0], locator[1]);
+    } catch (e) {
+        return null;
+    }
+    return nodes.map(function (node) {
+        var text = node.textContent || '';
+        if (node.nodeType === Node.ELEMENT_NODE) {
+            return [node.outerHTML, text];
+        }
+        return [text, text];
+    });
+});
+'''
@@ -4,16 +4,38 @@
 
 import enum
 import logging
+import random
+import time
 
-from dataclasses import dataclass
-from typing import Iterator, List, Optional
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING, Callable, Dict, FrozenSet, Generator, Iterator, List,
+    Optional, Tuple)
 
 import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.http_cache as http_cache
+import ezscrape.scraping.metrics as metrics
+import ezscrape.scraping.ratelimit as ratelimit
+import ezscrape.scraping.timing as timing
+import ezscrape.scraping.useragent as useragent
+import ezscrape.scraping.web_lib as web_lib
+
+if TYPE_CHECKING:
+    # pylint: disable=cyclic-import
+    import ezscrape.scraping.proxypool as proxypool  # noqa: F401
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 DEFAULT_REQUEST_TIMEOUT = 5.0
 DEFAULT_MAX_PAGES = 15
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Same as the default of selenium's WebDriverWait
+DEFAULT_WAIT_POLL_FREQUENCY = 0.5
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF_BASE = 0.5
+DEFAULT_RETRY_BACKOFF_CAP = 30.0
+DEFAULT_RETRY_MAX_RETRY_AFTER = 300.0
 
 
 @enum.unique
@@ -26,6 +48,162 @@ class ScrapeStatus(enum.Enum):
     SUCCESS = 'Success'
     ERROR = 'Error'
     PROXY_ERROR = 'Proxy Error'
+    BODY_TOO_LARGE = 'Body Too Large'
+
+
+@enum.unique
+class PageContent(enum.Enum):
+    """Enum for how the content of a scraped page is provided."""
+
+    # pylint: disable=invalid-name
+    FULL = 'full'
+    CHUNKS = 'chunks'
+
+
+@enum.unique
+class WaitStrategy(enum.Enum):
+    """Enum for how the browser checks the wait conditions.
+
+    SCRIPT checks all conditions in a single script per poll, ELEMENTS
+    finds each element separately. OBSERVE waits in the browser and checks
+    the conditions on each change of the page, returning as soon as they
+    are met instead of at the next poll.
+    """
+
+    # pylint: disable=invalid-name
+    SCRIPT = 'script'
+    ELEMENTS = 'elements'
+    OBSERVE = 'observe'
+
+
+@enum.unique
+class PageLoadStrategy(enum.Enum):
+    """Enum for when the browser considers a page loaded.
+
+    NORMAL waits for all resources, EAGER only for the html to be parsed
+    and NONE returns once the html is received.
+    """
+
+    # pylint: disable=invalid-name
+    NORMAL = 'normal'
+    EAGER = 'eager'
+    NONE = 'none'
+
+
+@enum.unique
+class ResourceType(enum.Enum):
+    """Enum for the resource types the browser can block."""
+
+    # pylint: disable=invalid-name
+    IMAGE = 'image'
+    FONT = 'font'
+    MEDIA = 'media'
+    STYLESHEET = 'stylesheet'
+
+
+@dataclass
+class ResourcePolicy():
+    """Define the resources the browser doesn't load.
+
+    blocked_types blocks resources by type, blocked_urls by url pattern
+    with * as wildcard. If allowed_hosts is set only these hosts and the
+    host of the scraped url are loaded, *.website.com also allows the
+    subdomains, not supported together with proxies. Only used by the
+    Selenium scraper.
+    """
+
+    blocked_types: FrozenSet[ResourceType] = frozenset()
+    blocked_urls: List[str] = field(default_factory=list)
+    allowed_hosts: Optional[List[str]] = None
+
+
+@dataclass
+class RetryPolicy():
+    """Define if and when a failed scrape is retried.
+
+    The wait before retry n is backoff_base * 2^(n-1) seconds, capped at
+    backoff_cap. With jitter a random time up to that is waited instead.
+    A result is retried if its status or its HTTP status code is
+    retryable, no retry is started that would end after the deadline
+    (seconds since the first attempt, 0 is unlimited). A Retry-After of
+    the server is waited for at most max_retry_after seconds.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    max_attempts: int = DEFAULT_RETRY_ATTEMPTS
+    backoff_base: float = DEFAULT_RETRY_BACKOFF_BASE
+    backoff_cap: float = DEFAULT_RETRY_BACKOFF_CAP
+    jitter: bool = True
+    retry_statuses: FrozenSet[ScrapeStatus] = frozenset(
+        {ScrapeStatus.TIMEOUT, ScrapeStatus.PROXY_ERROR})
+    retry_status_codes: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    deadline: float = 0
+    max_retry_after: float = DEFAULT_RETRY_MAX_RETRY_AFTER
+
+    def backoff(self, attempt: int) -> float:
+        """Get the seconds to wait after the attempt (starting at 1)."""
+        backoff = min(self.backoff_cap,
+                      self.backoff_base * (2.0 ** (attempt - 1)))
+        if self.jitter:
+            # Not used for security purposes
+            backoff = random.uniform(0, backoff)  # nosec
+        return backoff
+
+    def next_delay(self, result: 'ScrapeResult', attempt: int, *,
+                   elapsed: float,
+                   retry_after: Optional[float] = None) -> Optional[float]:
+        """Get the seconds to wait before the next attempt.
+
+        None if the result is not retried. A Retry-After of the server is
+        waited at least, up to max_retry_after.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if (result.status not in self.retry_statuses) and\
+           (result.status_code not in self.retry_status_codes):
+            return None
+
+        delay = self.backoff(attempt)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+
+        if self.deadline and (elapsed + delay >= self.deadline):
+            return None
+        return delay
+
+
+@dataclass
+class ConnectionInfo():
+    """The connection a response was received over.
+
+    peer_ip is the server or the proxy connected to, tls_version is only
+    set for https and reused if earlier responses used the connection.
+    """
+
+    peer_ip: str
+    local_ip: str
+    tls_version: Optional[str] = None
+    reused: bool = False
+
+
+@dataclass
+class ScrapeAttempt():
+    """The outcome of a single attempt of a scrape."""
+
+    status: ScrapeStatus
+    status_code: int = 0
+    error_msg: str = ''
+    wait_ms: float = 0
+    duration_ms: float = 0
+
+    @classmethod
+    def from_result(cls, result: 'ScrapeResult', *, wait_time: float,
+                    start_time: float) -> 'ScrapeAttempt':
+        """Create the attempt for the result, started at the monotonic time."""
+        return cls(status=result.status, status_code=result.status_code,
+                   error_msg=result.error_msg, wait_ms=wait_time * 1000,
+                   duration_ms=(time.monotonic() - start_time) * 1000)
 
 
 @enum.unique
@@ -34,6 +212,11 @@ class WaitForPageType(enum.Enum):
 
     # pylint: disable=invalid-name
     XPATH = 'xpath'
+    CSS = 'css'
+
+
+# Key of the elements extracted for a WaitForPageElem
+ExtractKey = Tuple[WaitForPageType, str]
 
 
 class WaitForPageElem():
@@ -72,6 +255,11 @@ class WaitForPageElem():
         self._wait_type = new_wait_type
         # pylint: enable=attribute-defined-outside-init
 
+    @property
+    def key(self) -> ExtractKey:
+        """Property to get the key of the element, its type and text."""
+        return (self.wait_type, self.wait_text)
+
 
 class WaitForXpathElem(WaitForPageElem):
     """A wait for Xpath Element."""
@@ -81,6 +269,37 @@ class WaitForXpathElem(WaitForPageElem):
         super().__init__(WaitForPageType.XPATH, xpath)
 
 
+class WaitForCssElem(WaitForPageElem):
+    """A wait for Css Selector Element."""
+
+    def __init__(self, selector: str):
+        """Set up the Css Selector Element."""
+        super().__init__(WaitForPageType.CSS, selector)
+
+
+@dataclass
+class Pagination():
+    """Define how the requests scraper follows links to the next page.
+
+    The next page is linked by the first element located by next_link
+    with a href, xpaths can also select the href directly, or with
+    rel_next a rel="next" link. With prefetch the next page is downloaded
+    while the current page is processed, e.g. while streaming the pages.
+    """
+
+    next_link: Optional[WaitForPageElem] = None
+    rel_next: bool = True
+    prefetch: bool = False
+
+
+@dataclass
+class ExtractedElem():
+    """An element extracted from a page, its outer html and text."""
+
+    html: str
+    text: str
+
+
 class ScrapeConfig():
     """Class to hold scrape config data needed for downloading the html."""
 
@@ -95,11 +314,29 @@ class ScrapeConfig():
 
         self.proxy_http = ''
         self.proxy_https = ''
+        self.proxy_pool: Optional['proxypool.ProxyPool'] = None
         self.useragent = None
+        self.useragent_provider: Optional[useragent.UserAgentProvider] = None
         self.max_pages = DEFAULT_MAX_PAGES
 
         self.next_button: Optional[WaitForPageElem] = None
+        self.pagination: Optional[Pagination] = None
         self.wait_for_elem_list: List[WaitForPageElem] = []
+        self.wait_strategy = WaitStrategy.SCRIPT
+        self.wait_poll_frequency = DEFAULT_WAIT_POLL_FREQUENCY
+        self.page_load_strategy = PageLoadStrategy.NORMAL
+        self.resource_policy: Optional[ResourcePolicy] = None
+
+        self.cache_policy: Optional[http_cache.CachePolicy] = None
+        self.rate_limiter: Optional[ratelimit.RateLimiter] = None
+        self.retry_policy: Optional[RetryPolicy] = None
+
+        self.max_body_bytes = 0
+        self.chunk_size = DEFAULT_CHUNK_SIZE
+        self.page_content = PageContent.FULL
+
+        self.extract_elem_list: List[WaitForPageElem] = []
+        self.include_page_source = True
 
     @property
     def url(self) -> str:
@@ -113,31 +350,116 @@ class ScrapeConfig():
             raise exceptions.ScrapeConfigError('Url cannot be blank')
         self._url = new_url  # pylint: disable=attribute-defined-outside-init
 
+    def get_useragent(self) -> str:
+        """Get the user agent to use for the request.
+
+        The useragent takes precedence over the useragent_provider, the
+        default provider is used if neither is set.
+        """
+        if self.useragent:
+            return str(self.useragent)
+        return useragent.get_useragent(self.useragent_provider)
+
+    def get_proxies(self) -> Dict[str, str]:
+        """Get the proxies to use for the request, by url scheme."""
+        proxies = {}
+        if self.proxy_http:
+            proxies['http'] = self.proxy_http
+        if self.proxy_https:
+            proxies['https'] = self.proxy_https
+        return proxies
+
     def __str__(self) -> str:
         return str(self.__dict__)
 
 
-@dataclass
 class ScrapePage():
-    """Class to represent a single scraped page."""
+    """Class to represent a single scraped page.
 
-    html: str
-    request_time_ms: float = 0
-    status = ScrapeStatus.UNKNOWN
+    Pages scraped over http keep the raw content and decode the html on
+    first access. The encoding is the declared one or detected when
+    needed. Pages scraped with PageContent.CHUNKS only provide chunks,
+    they can only be iterated once and keep the connection open until
+    exhausted.
+
+    request_time_ms is the monotonic time of the scrape and timings its
+    duration per phase, see the timing module. The decode phase is added
+    when the html is first decoded.
+
+    extracts has the elements matching each of the extract_elem_list of
+    the config by its key, the html is empty if the page source is
+    not included.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, html: Optional[str] = None, *,
+                 content: Optional[bytes] = None,
+                 encoding: Optional[str] = None,
+                 chunks: Optional[Iterator[bytes]] = None):
+        """Initialize the Scrape Page from the html or the content."""
+        self._html = html
+        self._content = content
+        self._declared_encoding = encoding
+        self._encoding: Optional[str] = None
+        self.chunks = chunks
+        self.request_time_ms: float = 0
+        self.timings: timing.PhaseTimings = {}
+        self.extracts: Dict[ExtractKey, List[ExtractedElem]] = {}
+        self.status = ScrapeStatus.UNKNOWN
+
+    @property
+    def html(self) -> str:
+        """Property to get the html, decoded from the content if needed."""
+        if self._html is None:
+            if self._content is None:
+                return ''
+            start_ns = time.perf_counter_ns()
+            self._html = self._content.decode(self.encoding, errors='replace')
+            self.timings[timing.PHASE_DECODE] = timing.elapsed_ms(start_ns)
+        return self._html
+
+    @property
+    def content(self) -> Optional[bytes]:
+        """Property to get the raw content, encoded from the html if needed."""
+        if (self._content is None) and (self._html is not None):
+            self._content = self._html.encode('utf-8')
+            self._declared_encoding = 'utf-8'
+        return self._content
+
+    @property
+    def encoding(self) -> str:
+        """Property to get the encoding of the content."""
+        if self.content is None:
+            return web_lib.lookup_encoding(self._declared_encoding) or 'utf-8'
+        if self._encoding is None:
+            self._encoding = web_lib.detect_encoding(self.content,
+                                                     self._declared_encoding)
+        return self._encoding
+
+    def __repr__(self) -> str:
+        return (F'{type(self).__name__}(request_time_ms='
+                F'{self.request_time_ms}, status={self.status})')
 
 
 class ScrapeResult():
     """Class to keep the Download Result Data."""
 
+    # pylint: disable=too-many-instance-attributes
+
     def __init__(self, url: str):
         """Initialize the Scrape Result."""
         self._scrape_pages: List[ScrapePage] = []
         self._idx = 0
 
         self.url = url
-        self.caller_ip = None
+        self.caller_ip: Optional[str] = None
+        self.connection: Optional[ConnectionInfo] = None
         self.status: ScrapeStatus = ScrapeStatus.UNKNOWN
+        self.status_code = 0
         self.error_msg = ''
+        self.from_cache = False
+        self.attempts: List[ScrapeAttempt] = []
 
     @property
     def request_time_ms(self) -> float:
@@ -147,6 +469,14 @@ class ScrapeResult():
             req_time += page.request_time_ms
         return req_time
 
+    @property
+    def timings(self) -> timing.PhaseTimings:
+        """Property to calculate the combined time per phase."""
+        phase_timer = timing.PhaseTimer()
+        for page in self:
+            phase_timer.update(page.timings)
+        return phase_timer.phases
+
     @property
     def first_page(self) -> Optional[ScrapePage]:
         """Property to get the first page scraped."""
@@ -155,13 +485,30 @@ class ScrapeResult():
 
         return None
 
-    def add_scrape_page(self, html: str, *,
+    def add_scrape_page(self, html: Optional[str] = None, *,
                         scrape_time: float = 0,
-                        status: ScrapeStatus) -> None:
-        """Add a scraped page."""
-        page = ScrapePage(html)
+                        status: ScrapeStatus,
+                        content: Optional[bytes] = None,
+                        encoding: Optional[str] = None,
+                        chunks: Optional[Iterator[bytes]] = None,
+                        timings: Optional[timing.PhaseTimings] = None,
+                        extracts: Optional[
+                            Dict[ExtractKey, List[ExtractedElem]]] = None
+                        ) -> None:
+        """Add a scraped page from the html or the content."""
+        # pylint: disable=too-many-arguments
+        page = ScrapePage(html, content=content, encoding=encoding,
+                          chunks=chunks)
         page.request_time_ms = scrape_time
+        if timings:
+            page.timings = dict(timings)
+        if extracts:
+            page.extracts = extracts
         page.status = status
+        self.add_page(page)
+
+    def add_page(self, page: ScrapePage) -> None:
+        """Add a scraped page."""
         self._scrape_pages.append(page)
 
     def __iter__(self) -> Iterator[ScrapePage]:
@@ -183,6 +530,100 @@ class ScrapeResult():
         return self.status == ScrapeStatus.SUCCESS
 
 
+class PageStream():
+    """Iterator of the pages of a scrape as they are scraped.
+
+    Streaming scrapers only scrape the next page once it is requested and
+    don't keep the pages in the result, which has the status and error of
+    the scrape so far. Closing the stream, also by leaving the with block,
+    stops the scrape early.
+    """
+
+    def __init__(self, result: ScrapeResult,
+                 pages: Generator[ScrapePage, None, None]):
+        """Initialize the Page Stream of the result."""
+        self.result = result
+        self._pages = pages
+
+    def close(self) -> None:
+        """Stop the scrape and release its resources."""
+        self._pages.close()
+
+    def __iter__(self) -> Iterator[ScrapePage]:
+        return self
+
+    def __next__(self) -> ScrapePage:
+        return next(self._pages)
+
+    def __enter__(self) -> 'PageStream':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
+        self.close()
+
+
+class RetryState():
+    """Keep track of the attempts of a scrape with a retry policy.
+
+    Each attempt is counted in the default metrics, labeled with the
+    scraper name.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy], *, scraper: str = ''):
+        """Initialize the Retry State, no policy means a single attempt."""
+        self.policy = policy
+        self.scraper = scraper
+        self.attempts: List[ScrapeAttempt] = []
+        self._start_time = time.monotonic()
+        self._attempt_start_time = self._start_time
+        self._wait_time = 0.0
+
+    def start_attempt(self) -> None:
+        """Mark the start of an attempt."""
+        self._attempt_start_time = time.monotonic()
+
+    def finish_attempt(self, result: ScrapeResult, *,
+                       retry_after: Optional[float] = None
+                       ) -> Optional[float]:
+        """Record the attempt, return the seconds to wait before the next.
+
+        None if there is no further attempt. The result gets all attempts
+        so far.
+        """
+        attempt = ScrapeAttempt.from_result(
+            result, wait_time=self._wait_time,
+            start_time=self._attempt_start_time)
+        self.attempts.append(attempt)
+        result.attempts = list(self.attempts)
+        self._emit_metrics(result, attempt)
+
+        if self.policy is None:
+            return None
+
+        delay = self.policy.next_delay(
+            result, len(self.attempts),
+            elapsed=time.monotonic() - self._start_time,
+            retry_after=retry_after)
+        if delay is not None:
+            self._wait_time = delay
+        return delay
+
+    def _emit_metrics(self, result: ScrapeResult,
+                      attempt: ScrapeAttempt) -> None:
+        """Count the attempt and its duration per host."""
+        collector = metrics.get_default_metrics()
+        if not collector.enabled:
+            return
+
+        collector.increment(metrics.REQUESTS_TOTAL, labels={
+            'scraper': self.scraper, 'status': result.status.name})
+        collector.observe(metrics.REQUEST_DURATION_MS, attempt.duration_ms,
+                          labels={'host': metrics.host_label(result.url)})
+        if len(self.attempts) > 1:
+            collector.increment(metrics.RETRIES_TOTAL,
+                                labels={'scraper': self.scraper})
+
+
 class Scraper():
     """Base Class for Scraper Functionality."""
 
@@ -217,5 +658,35 @@ class Scraper():
         """Scrape based on the set config."""
         raise NotImplementedError
 
+    def iter_pages(self) -> PageStream:
+        """Scrape and stream the pages.
+
+        Scrapers without streaming support scrape all pages at once, with
+        retries, and keep them in the result.
+        """
+        result = self.scrape()
+        return PageStream(result, (page for page in list(result)))
+
+    def _scrape_with_retries(
+            self, scrape_attempt: Callable[[], ScrapeResult]) -> ScrapeResult:
+        """Run the scrape attempts as defined by the retry policy."""
+        retries = RetryState(self.config.retry_policy,
+                             scraper=type(self).__name__)
+        while True:
+            retries.start_attempt()
+            result = scrape_attempt()
+            delay = retries.finish_attempt(
+                result, retry_after=self._retry_after_seconds())
+            if delay is None:
+                return result
+
+            logger.debug(F'Retry "{self.config.url}" in {delay:.3f}s after '
+                         F'{result.status}: {result.error_msg}')
+            time.sleep(delay)
+
+    def _retry_after_seconds(self) -> Optional[float]:
+        """Get the Retry-After of the last attempt if the server sent one."""
+        return None
+
     def __str__(self) -> str:
         return F'{type(self).__name__} for Url: {self.config.url}'
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+"""Module providing an in process dns cache for the requests transport.
+
+The system resolver doesn't report the ttl of its answers so entries are
+kept for a fixed time, failed lookups for a shorter one.
+"""
+
+import concurrent.futures
+import ipaddress
+import logging
+import socket
+import threading
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.transport as transport
+import ezscrape.scraping.web_lib as web_lib
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_PREFETCH_WORKERS = 16
+
+
+@dataclass
+class _Entry():
+    """Cached answer for a host, the error of a failed lookup."""
+
+    addresses: List[str]
+    expires: float
+    error: Optional[socket.gaierror] = None
+
+
+def is_ip_address(host: str) -> bool:
+    """Check whether the host is an ip address that needs no lookup."""
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def config_host(config: core.ScrapeConfig) -> Optional[str]:
+    """Get the host the transport resolves for the config.
+
+    Proxied requests connect to the proxy, which resolves the url itself.
+    """
+    url = config.url
+    if web_lib.split_url(url).scheme == 'https':
+        proxy = config.proxy_https
+    else:
+        proxy = config.proxy_http
+    if proxy:
+        url = proxy
+
+    hostname = web_lib.split_url(url).hostname
+    return hostname.lower() if hostname else None
+
+
+class DnsCache():
+    """Thread safe cache of resolved host addresses.
+
+    Answers are cached for ttl seconds and failed lookups for negative_ttl
+    seconds, the least recently used hosts are dropped above max_entries.
+    """
+
+    def __init__(self, *, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the empty cache."""
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Resolve the host, from the cache while the answer is fresh.
+
+        Raises socket.gaierror for failed lookups, also cached ones.
+        """
+        if is_ip_address(host):
+            return [host]
+
+        key = host.lower()
+        entry = self._lookup(key)
+        if entry is None:
+            try:
+                entry = _Entry(transport.resolve(host, port),
+                               time.monotonic() + self.ttl)
+            except socket.gaierror as error:
+                entry = _Entry([], time.monotonic() + self.negative_ttl,
+                               error=error)
+            self._store(key, entry)
+
+        if entry.error is not None:
+            # A new error each time, raising adds the traceback to it
+            raise socket.gaierror(*entry.error.args)
+        return list(entry.addresses)
+
+    def cached(self, host: str) -> Optional[List[str]]:
+        """Get the fresh cached addresses of the host without resolving.
+
+        None if the host is not cached, empty if its lookup failed.
+        """
+        entry = self._lookup(host.lower())
+        if entry is None:
+            return None
+        return list(entry.addresses)
+
+    def prefetch(self, hosts: Iterable[str], *,
+                 max_workers: int = DEFAULT_PREFETCH_WORKERS
+                 ) -> Dict[str, List[str]]:
+        """Resolve the hosts in parallel, the ones not cached yet.
+
+        Returns the addresses per lowercase host, empty for failed lookups.
+        Ip addresses need no lookup and are left out.
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+
+        hosts = {host.lower() for host in hosts if not is_ip_address(host)}
+        pending = sorted(hosts - set(self._fresh_hosts()))
+        if pending:
+            logger.debug(F'Prefetching {len(pending)} hosts')
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(max_workers, len(pending))) as executor:
+                # Failed lookups are cached negatively, nothing to raise
+                list(executor.map(self._resolve_quietly, pending))
+
+        resolved = {}
+        for host in hosts:
+            addresses = self.cached(host)
+            if addresses is not None:
+                resolved[host] = addresses
+        return resolved
+
+    def prefetch_configs(self, configs: Iterable[core.ScrapeConfig], *,
+                         max_workers: int = DEFAULT_PREFETCH_WORKERS
+                         ) -> Dict[str, List[str]]:
+        """Resolve the hosts the configs connect to in parallel."""
+        hosts = [host for host in (config_host(config) for config in configs)
+                 if host]
+        return self.prefetch(hosts, max_workers=max_workers)
+
+    def clear(self) -> None:
+        """Remove all cached hosts."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _resolve_quietly(self, host: str) -> None:
+        """Resolve the host for the cache, ignoring failed lookups."""
+        try:
+            self.resolve(host, 0)
+        except socket.gaierror as error:
+            logger.debug(F'Prefetching "{host}" failed: {error}')
+
+    def _fresh_hosts(self) -> List[str]:
+        """Get the hosts with a fresh entry."""
+        now = time.monotonic()
+        with self._lock:
+            return [host for host, entry in self._entries.items()
+                    if entry.expires > now]
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        """Get the fresh entry of the host, dropping an expired one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        """Store the entry, dropping the least recently used hosts."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_DEFAULT_CACHE: Optional[DnsCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_cache() -> DnsCache:
+    """Get the process wide dns cache, create it if needed."""
+    global _DEFAULT_CACHE  # pylint: disable=global-statement
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = DnsCache()
+        return _DEFAULT_CACHE
@@ -9,3 +9,7 @@ class ScrapeError(Exception):
 
 class ScrapeConfigError(ScrapeError):
     """Error with the Scrape Config."""
+
+
+class ScrapeBodyTooLargeError(ScrapeError):
+    """The response body exceeds the configured maximum size."""
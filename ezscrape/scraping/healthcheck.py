@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+"""Module checking whether urls are reachable without downloading them.
+
+Checks send a HEAD request, or a GET for the first byte if the server
+doesn't allow HEAD, over the pooled sessions of the requests scraper.
+"""
+
+import concurrent.futures
+import http
+import logging
+import time
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.http_sessions as http_sessions
+import ezscrape.scraping.timing as timing
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_CHECK_TIMEOUT = 5.0
+DEFAULT_MAX_WORKERS = 32
+# Bodies up to this size are read to keep the connection open
+MAX_DRAIN_BYTES = 65536
+
+# Responses of servers not supporting HEAD requests
+HEAD_NOT_SUPPORTED = (http.HTTPStatus.METHOD_NOT_ALLOWED,
+                      http.HTTPStatus.NOT_IMPLEMENTED)
+DEADLINE_EXCEEDED_MSG = 'Deadline exceeded'
+
+
+@dataclass
+class HealthResult():
+    """Define the outcome of a health check.
+
+    status_code and final_url are of the last response after redirects,
+    None if no response was received.
+    """
+
+    url: str
+    status: core.ScrapeStatus
+    latency_ms: float = 0.0
+    status_code: Optional[int] = None
+    final_url: Optional[str] = None
+    method: str = ''
+    error_msg: str = ''
+
+    def __bool__(self) -> bool:
+        return self.status == core.ScrapeStatus.SUCCESS
+
+
+def check(url: str, *, timeout: float = DEFAULT_CHECK_TIMEOUT,
+          session_pool: Optional[http_sessions.SessionPool] = None,
+          config: Optional[core.ScrapeConfig] = None) -> HealthResult:
+    """Check whether the url responds with a success status.
+
+    Uses the given session_pool or the process wide default pool. The user
+    agent and proxies of config are used like the scrape would, the
+    defaults if None.
+    """
+    if config is None:
+        config = core.ScrapeConfig(url)
+    if session_pool is None:
+        session_pool = http_sessions.get_default_pool()
+    session = session_pool.session_for(config)
+
+    headers = {'User-Agent': config.get_useragent()}
+    proxies = config.get_proxies()
+
+    start_ns = time.perf_counter_ns()
+    method = 'HEAD'
+    try:
+        resp = _request(session, method, url, timeout,
+                        headers=headers, proxies=proxies)
+        if resp.status_code in HEAD_NOT_SUPPORTED:
+            method = 'GET'
+            resp = _request(session, method, url, timeout,
+                            headers={**headers, 'Range': 'bytes=0-0'},
+                            proxies=proxies)
+    except requests.RequestException as error:
+        if isinstance(error, requests.exceptions.Timeout):
+            status = core.ScrapeStatus.TIMEOUT
+        else:
+            status = core.ScrapeStatus.ERROR
+        return HealthResult(
+            url, status, latency_ms=timing.elapsed_ms(start_ns),
+            method=method,
+            error_msg=F'EXCEPTION: {type(error).__name__} - {error}')
+
+    result = HealthResult(url, core.ScrapeStatus.SUCCESS,
+                          latency_ms=timing.elapsed_ms(start_ns),
+                          status_code=resp.status_code, final_url=resp.url,
+                          method=method)
+    if resp.status_code >= 400:
+        result.status = core.ScrapeStatus.ERROR
+        result.error_msg = F'HTTP Error: {resp.status_code} - {resp.reason}'
+    return result
+
+
+def check_urls(urls: Iterable[str], *,
+               max_workers: int = DEFAULT_MAX_WORKERS,
+               deadline: Optional[float] = None,
+               timeout: float = DEFAULT_CHECK_TIMEOUT,
+               session_pool: Optional[http_sessions.SessionPool] = None,
+               config: Optional[core.ScrapeConfig] = None
+               ) -> List[HealthResult]:
+    """Check the urls concurrently, the results in input order.
+
+    Checks not done within deadline seconds have the TIMEOUT status, no
+    check waits for longer than the time left. All checks use the user
+    agent and proxies of config.
+    """
+    # pylint: disable=too-many-arguments
+    if max_workers < 1:
+        raise ValueError('max_workers must be at least 1')
+
+    urls = list(urls)
+    start_ns = time.perf_counter_ns()
+    end_time = None if deadline is None else time.monotonic() + deadline
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(_check_until, url, end_time, timeout,
+                                   session_pool, config=config)
+                   for url in urls]
+        concurrent.futures.wait(futures, timeout=deadline)
+    finally:
+        # Checks still running are bound by the time left
+        executor.shutdown(wait=False)
+
+    results = []
+    for url, future in zip(urls, futures):
+        if future.done():
+            results.append(future.result())
+        else:
+            future.cancel()
+            results.append(HealthResult(url, core.ScrapeStatus.TIMEOUT,
+                                        latency_ms=timing.elapsed_ms(start_ns),
+                                        error_msg=DEADLINE_EXCEEDED_MSG))
+    return results
+
+
+def _check_until(url: str, end_time: Optional[float], timeout: float,
+                 session_pool: Optional[http_sessions.SessionPool], *,
+                 config: Optional[core.ScrapeConfig]) -> HealthResult:
+    """Check the url, with a timeout limited by the time left."""
+    # pylint: disable=too-many-arguments
+    if end_time is not None:
+        time_left = end_time - time.monotonic()
+        if time_left <= 0:
+            return HealthResult(url, core.ScrapeStatus.TIMEOUT,
+                                error_msg=DEADLINE_EXCEEDED_MSG)
+        timeout = min(timeout, time_left)
+    return check(url, timeout=timeout, session_pool=session_pool,
+                 config=config)
+
+
+def _request(session: requests.Session, method: str, url: str,
+             timeout: float, *, headers: Dict[str, str],
+             proxies: Dict[str, str]) -> requests.Response:
+    """Make the request, releasing the connection without the body."""
+    # pylint: disable=too-many-arguments
+    try:
+        resp = session.request(method, url, timeout=timeout, headers=headers,
+                               proxies=proxies, stream=True, verify=False)
+    finally:
+        # Cookies are only kept for the redirects of a single request
+        session.cookies.clear()
+
+    # Closing an unread response closes the connection, read small bodies
+    length = resp.headers.get('Content-Length', '')
+    if (method == 'HEAD') or (length.isdigit() and
+                              int(length) <= MAX_DRAIN_BYTES):
+        try:
+            resp.content  # pylint: disable=pointless-statement
+        except requests.RequestException as error:
+            logger.debug(F'Reading the body of "{url}" failed: {error}')
+    resp.close()
+    return resp
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+"""Module providing a response cache for the requests scraper."""
+
+import base64
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_CACHE_TTL = 300.0
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry():
+    """A cached response."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    url: str
+    content: bytes
+    encoding: str = ''
+    request_time_ms: float = 0
+    stored_at: float = 0
+    fresh_for: float = 0
+    etag: str = ''
+    last_modified: str = ''
+
+    @property
+    def size(self) -> int:
+        """Property to get the approximate memory size in bytes."""
+        return len(self.content) + len(self.url)
+
+    def validators(self) -> Dict[str, str]:
+        """Get the headers to revalidate the entry with a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache():
+    """Base Class for Response Cache backends."""
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Get the entry for the url if cached."""
+        raise NotImplementedError
+
+    def set(self, entry: CacheEntry) -> None:
+        """Store the entry."""
+        raise NotImplementedError
+
+    def delete(self, url: str) -> None:
+        """Remove the entry for the url if cached."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """Thread safe in memory LRU cache limited by the size of the entries."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES):
+        """Initialize the Memory Cache."""
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Property to get the combined size of all entries."""
+        return self._size
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Get the entry for the url if cached."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def set(self, entry: CacheEntry) -> None:
+        """Store the entry, evict the least recently used if too big."""
+        with self._lock:
+            self._remove(entry.url)
+            if entry.size > self.max_bytes:
+                logger.debug(F'Entry too big to cache: {entry.url}')
+                return
+
+            self._entries[entry.url] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def delete(self, url: str) -> None:
+        """Remove the entry for the url if cached."""
+        with self._lock:
+            self._remove(url)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, url: str) -> None:
+        """Remove the entry, the lock must be held."""
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache(ResponseCache):
+    """Cache storing each entry as a json file in a directory.
+
+    The content is stored base64 encoded.
+    """
+
+    def __init__(self, directory: str):
+        """Initialize the Disk Cache, create the directory if needed."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        """Get the file path of the entry for the url."""
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, F'{name}.json')
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Get the entry for the url if cached."""
+        try:
+            with open(self._path(url), encoding='utf-8') as file_handle:
+                data = json.load(file_handle)
+            data['content'] = base64.b64decode(data['content'])
+            entry = CacheEntry(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError) as error:
+            logger.warning(F'Ignore invalid cache entry for "{url}": {error}')
+            return None
+
+        # Protect against hash collisions
+        if entry.url != url:
+            return None
+        return entry
+
+    def set(self, entry: CacheEntry) -> None:
+        """Store the entry, replacing the file atomically."""
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w',
+                           encoding='utf-8') as file_handle:
+                data = dataclasses.asdict(entry)
+                data['content'] = base64.b64encode(entry.content).decode(
+                    'ascii')
+                json.dump(data, file_handle)
+            os.replace(temp_path, self._path(entry.url))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def delete(self, url: str) -> None:
+        """Remove the entry for the url if cached."""
+        try:
+            os.remove(self._path(url))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
+
+
+class CachePolicy():
+    """Define how responses are cached and revalidated.
+
+    Entries are served without a request for ttl seconds, afterwards they
+    are revalidated with a conditional GET if they have an ETag or a
+    Last-Modified header. If honour_cache_control is set, the max-age,
+    no-cache and no-store directives of the response take precedence.
+    """
+
+    def __init__(self, cache: ResponseCache, *,
+                 ttl: float = DEFAULT_CACHE_TTL,
+                 honour_cache_control: bool = True):
+        """Initialize the Cache Policy."""
+        self.cache = cache
+        self.ttl = ttl
+        self.honour_cache_control = honour_cache_control
+
+    @staticmethod
+    def is_fresh(entry: CacheEntry) -> bool:
+        """Check if the entry can be used without revalidating."""
+        return (time.time() - entry.stored_at) < entry.fresh_for
+
+    def store(self, url: str, headers: Mapping[str, str], content: bytes, *,
+              encoding: str = '',
+              request_time_ms: float) -> Optional[CacheEntry]:
+        """Store the response if allowed, return the stored entry."""
+        directives = parse_cache_control(headers.get('Cache-Control', ''))
+        if self.honour_cache_control and ('no-store' in directives):
+            self.cache.delete(url)
+            return None
+
+        entry = CacheEntry(url=url, content=content, encoding=encoding,
+                           request_time_ms=request_time_ms,
+                           etag=headers.get('ETag', ''),
+                           last_modified=headers.get('Last-Modified', ''))
+        self._set_freshness(entry, directives)
+        self.cache.set(entry)
+        return entry
+
+    def refresh(self, entry: CacheEntry, headers: Mapping[str, str]) -> None:
+        """Mark the entry as fresh again after a Not Modified response."""
+        directives = parse_cache_control(headers.get('Cache-Control', ''))
+        entry.etag = headers.get('ETag', entry.etag)
+        entry.last_modified = headers.get('Last-Modified',
+                                          entry.last_modified)
+        self._set_freshness(entry, directives)
+        self.cache.set(entry)
+
+    def _set_freshness(self, entry: CacheEntry,
+                       directives: Mapping[str, str]) -> None:
+        """Set the time the entry was stored and how long it is fresh."""
+        entry.stored_at = time.time()
+        entry.fresh_for = self.ttl
+
+        if self.honour_cache_control:
+            if 'no-cache' in directives:
+                entry.fresh_for = 0
+            elif 'max-age' in directives:
+                try:
+                    entry.fresh_for = max(float(directives['max-age']), 0)
+                except ValueError:
+                    pass
+
+
+def parse_cache_control(value: str) -> Dict[str, str]:
+    """Parse a Cache-Control header into lowercase directives."""
+    directives = {}
+    for part in value.split(','):
+        name, _, arg = part.partition('=')
+        name = name.strip().lower()
+        if name:
+            directives[name] = arg.strip().strip('"')
+    return directives
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""Module providing pooled keep-alive sessions for the requests module."""
+
+import atexit
+import logging
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import requests
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.dnscache as dnscache
+import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.transport as transport
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_SESSIONS = 32
+
+ProxyKey = Tuple[str, str]
+
+
+@dataclass
+class SessionPoolConfig():
+    """Define the sizing of the connection pools.
+
+    pool_connections: number of per host connection pools kept per session
+    pool_maxsize: number of keep-alive connections kept per host
+    pool_block: block instead of opening extra connections if maxsize reached
+    max_sessions: number of proxy specific sessions kept open
+    """
+
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+    pool_block: bool = False
+    max_sessions: int = DEFAULT_MAX_SESSIONS
+
+
+class SessionPool():
+    """Thread safe pool of keep-alive sessions keyed by the proxy settings.
+
+    Users clear the session cookies after each request so scrapes stay
+    independent of each other, cookies set during redirects are kept.
+    Sessions use the instrumented transport to measure the request phases.
+    Hosts are resolved through the dns_cache if given.
+    """
+
+    def __init__(self, pool_config: Optional[SessionPoolConfig] = None, *,
+                 dns_cache: Optional[dnscache.DnsCache] = None):
+        """Initialize the Session Pool."""
+        if pool_config is None:
+            pool_config = SessionPoolConfig()
+        self.pool_config = pool_config
+        self.dns_cache = dns_cache
+
+        self._sessions: 'OrderedDict[ProxyKey, requests.Session]' =\
+            OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def proxy_key(config: core.ScrapeConfig) -> ProxyKey:
+        """Get the key of the session used for the given config."""
+        return (config.proxy_http, config.proxy_https)
+
+    def session_for(self, config: core.ScrapeConfig) -> requests.Session:
+        """Get the session to use for the given config."""
+        key = self.proxy_key(config)
+        evicted = None
+
+        with self._lock:
+            if self._closed:
+                raise exceptions.ScrapeError('Session Pool is closed')
+
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._new_session(key)
+                self._sessions[key] = session
+                if len(self._sessions) > self.pool_config.max_sessions:
+                    _, evicted = self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(key)
+
+        if evicted is not None:
+            logger.debug('Session limit reached, close oldest session')
+            evicted.close()
+
+        return session
+
+    def _new_session(self, key: ProxyKey) -> requests.Session:
+        """Create a new session for the given proxy key."""
+        session = requests.Session()
+
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, transport.TimedHTTPAdapter(
+                pool_connections=self.pool_config.pool_connections,
+                pool_maxsize=self.pool_config.pool_maxsize,
+                pool_block=self.pool_config.pool_block,
+                dns_cache=self.dns_cache))
+
+        proxy_http, proxy_https = key
+        if proxy_http:
+            session.proxies['http'] = proxy_http
+        if proxy_https:
+            session.proxies['https'] = proxy_https
+
+        return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def closed(self) -> bool:
+        """Property to check if the pool has been closed."""
+        return self._closed
+
+    def close(self) -> None:
+        """Close all sessions and their pooled connections."""
+        with self._lock:
+            self._closed = True
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> 'SessionPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
+        self.close()
+
+
+_DEFAULT_POOL: Optional[SessionPool] = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def get_default_pool() -> SessionPool:
+    """Get the process wide session pool, create it if needed.
+
+    The pool resolves hosts through the process wide dns cache.
+    """
+    global _DEFAULT_POOL  # pylint: disable=global-statement
+    with _DEFAULT_POOL_LOCK:
+        if (_DEFAULT_POOL is None) or _DEFAULT_POOL.closed:
+            _DEFAULT_POOL = SessionPool(
+                dns_cache=dnscache.get_default_cache())
+        return _DEFAULT_POOL
+
+
+def close_default_pool() -> None:
+    """Close the process wide session pool if it exists."""
+    global _DEFAULT_POOL  # pylint: disable=global-statement
+    with _DEFAULT_POOL_LOCK:
+        pool = _DEFAULT_POOL
+        _DEFAULT_POOL = None
+
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close_default_pool)
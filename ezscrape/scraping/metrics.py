@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+"""Module providing pluggable metrics emitted by the scrapers.
+
+Metrics are disabled by default, enable them by setting a collector, e.g.
+
+    collector = metrics.InMemoryMetrics()
+    metrics.set_default_metrics(collector)
+    ...
+    print(collector.to_prometheus())
+"""
+
+import bisect
+import threading
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import ezscrape.scraping.web_lib as web_lib
+
+# Metrics emitted by ezscrape
+SCRAPES_TOTAL = 'ezscrape_scrapes_total'
+REQUESTS_TOTAL = 'ezscrape_requests_total'
+RETRIES_TOTAL = 'ezscrape_retries_total'
+REQUEST_DURATION_MS = 'ezscrape_request_duration_ms'
+DOWNLOADED_BYTES_TOTAL = 'ezscrape_downloaded_bytes_total'
+SELENIUM_WAIT_POLLS = 'ezscrape_selenium_wait_polls'
+SELENIUM_DRIVER_LAUNCH_MS = 'ezscrape_selenium_driver_launch_ms'
+
+DEFAULT_BUCKETS = (5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0,
+                   2500.0, 5000.0, 10000.0, 30000.0)
+COUNT_BUCKETS = (1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0)
+METRIC_BUCKETS = {SELENIUM_WAIT_POLLS: COUNT_BUCKETS}
+
+Labels = Optional[Dict[str, str]]
+_LabelKey = Tuple[Tuple[str, str], ...]
+_MetricKey = Tuple[str, _LabelKey]
+
+
+class MetricsCollector():
+    """Base Class for Metrics Collectors.
+
+    Counters only increase, histograms count the observed values per
+    bucket. Callers can skip preparing the labels if not enabled.
+    """
+
+    enabled = True
+
+    def increment(self, name: str, value: float = 1.0,
+                  labels: Labels = None) -> None:
+        """Increase the counter with the labels by value."""
+        raise NotImplementedError()
+
+    def observe(self, name: str, value: float,
+                labels: Labels = None) -> None:
+        """Add the value to the histogram with the labels."""
+        raise NotImplementedError()
+
+
+class NullMetrics(MetricsCollector):
+    """Collector discarding all metrics, the default."""
+
+    enabled = False
+
+    def increment(self, name: str, value: float = 1.0,
+                  labels: Labels = None) -> None:
+        """Discard the counter."""
+
+    def observe(self, name: str, value: float,
+                labels: Labels = None) -> None:
+        """Discard the observed value."""
+
+
+@dataclass
+class HistogramData():
+    """The observed values of a histogram.
+
+    bucket_counts[idx] counts the values up to buckets[idx], the last
+    entry the values above the largest bucket.
+    """
+
+    buckets: Sequence[float]
+    bucket_counts: List[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0
+
+    def __post_init__(self) -> None:
+        """Start with empty buckets."""
+        if not self.bucket_counts:
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        """Add the value to its bucket."""
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+
+class InMemoryMetrics(MetricsCollector):
+    """Thread safe collector keeping the metrics in memory."""
+
+    def __init__(self, buckets: Optional[Dict[str, Sequence[float]]] = None):
+        """Initialize the collector, buckets overrides the default buckets."""
+        self._buckets: Dict[str, Sequence[float]] = dict(METRIC_BUCKETS)
+        if buckets:
+            self._buckets.update(buckets)
+
+        self._counters: Dict[_MetricKey, float] = {}
+        self._histograms: Dict[_MetricKey, HistogramData] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1.0,
+                  labels: Labels = None) -> None:
+        """Increase the counter with the labels by value."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float,
+                labels: Labels = None) -> None:
+        """Add the value to the histogram with the labels."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = HistogramData(
+                    sorted(self._buckets.get(name, DEFAULT_BUCKETS)))
+                self._histograms[key] = histogram
+            histogram.observe(value)
+
+    def counter(self, name: str, labels: Labels = None) -> float:
+        """Get the value of the counter, 0 if never increased."""
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0.0)
+
+    def histogram(self, name: str,
+                  labels: Labels = None) -> Optional[HistogramData]:
+        """Get a copy of the histogram, None if nothing was observed."""
+        with self._lock:
+            histogram = self._histograms.get((name, _label_key(labels)))
+            if histogram is None:
+                return None
+            return HistogramData(histogram.buckets,
+                                 list(histogram.bucket_counts),
+                                 histogram.count, histogram.total)
+
+    def reset(self) -> None:
+        """Remove all collected metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Export the metrics in the Prometheus text format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(),
+                                key=lambda item: item[0])
+
+            lines: List[str] = []
+            last_name = None
+            for (name, label_key), value in counters:
+                if name != last_name:
+                    lines.append(F'# TYPE {name} counter')
+                    last_name = name
+                lines.append(
+                    F'{name}{_format_labels(label_key)} {_format(value)}')
+
+            for (name, label_key), histogram in histograms:
+                if name != last_name:
+                    lines.append(F'# TYPE {name} histogram')
+                    last_name = name
+                lines.extend(_histogram_lines(name, label_key, histogram))
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def host_label(url: str) -> str:
+    """Get the host of the url to label metrics with."""
+    return (web_lib.split_url(url).hostname or '').lower()
+
+
+def count_downloaded_bytes(url: str, received: int) -> None:
+    """Add the bytes received from the url to the default metrics."""
+    collector = get_default_metrics()
+    if collector.enabled and received:
+        collector.increment(DOWNLOADED_BYTES_TOTAL, received,
+                            labels={'host': host_label(url)})
+
+
+def _label_key(labels: Labels) -> _LabelKey:
+    """Get the hashable and ordered key of the labels."""
+    if not labels:
+        return ()
+    return tuple(sorted(labels.items()))
+
+
+def _format(value: float) -> str:
+    """Format the value, without decimals for whole numbers."""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(label_key: _LabelKey) -> str:
+    """Format the labels, escaped as required by Prometheus."""
+    if not label_key:
+        return ''
+
+    labels = []
+    for name, value in label_key:
+        value = (str(value).replace('\\', R'\\').replace('"', R'\"')
+                 .replace('\n', R'\n'))
+        labels.append(F'{name}="{value}"')
+    return '{' + ','.join(labels) + '}'
+
+
+def _histogram_lines(name: str, label_key: _LabelKey,
+                     histogram: HistogramData) -> List[str]:
+    """Get the cumulative bucket, sum and count lines of the histogram."""
+    lines = []
+    cumulative = 0
+    upper_bounds = [_format(bucket) for bucket in histogram.buckets] + ['+Inf']
+    for upper_bound, count in zip(upper_bounds, histogram.bucket_counts):
+        cumulative += count
+        bucket_labels = _format_labels(label_key + (('le', upper_bound),))
+        lines.append(F'{name}_bucket{bucket_labels} {cumulative}')
+
+    labels = _format_labels(label_key)
+    lines.append(F'{name}_sum{labels} {_format(histogram.total)}')
+    lines.append(F'{name}_count{labels} {histogram.count}')
+    return lines
+
+
+_DEFAULT_METRICS: MetricsCollector = NullMetrics()
+_DEFAULT_METRICS_LOCK = threading.Lock()
+
+
+def get_default_metrics() -> MetricsCollector:
+    """Get the process wide metrics collector."""
+    return _DEFAULT_METRICS
+
+
+def set_default_metrics(collector: Optional[MetricsCollector]) -> None:
+    """Set the process wide metrics collector, None disables metrics."""
+    global _DEFAULT_METRICS  # pylint: disable=global-statement
+    with _DEFAULT_METRICS_LOCK:
+        _DEFAULT_METRICS = collector if collector is not None\
+            else NullMetrics()
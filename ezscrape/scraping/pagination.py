@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""Module providing the next page links followed by the requests scraper.
+
+Needs the optional lxml, and cssselect for css selectors.
+"""
+
+import urllib.parse
+
+from typing import List, Optional, Union
+
+import lxml.etree
+import lxml.html
+
+import ezscrape.scraping.core as core
+
+# Links with next as one of their rel values
+REL_NEXT_XPATH = (
+    '//link[contains(concat(" ", normalize-space(@rel), " "), " next ")]'
+    ' | //a[contains(concat(" ", normalize-space(@rel), " "), " next ")]')
+
+
+def next_page_url(page: core.ScrapePage, url: str,
+                  pagination: core.Pagination) -> Optional[str]:
+    """Get the absolute url of the next page linked by the page.
+
+    The next_link of the pagination is tried first, then a rel="next"
+    link. None if the page links no next page.
+    """
+    tree = _parse(page)
+    if tree is None:
+        return None
+
+    hrefs: List[str] = []
+    if pagination.next_link is not None:
+        hrefs += _find_hrefs(tree, pagination.next_link)
+    if pagination.rel_next:
+        hrefs += _hrefs(tree.xpath(REL_NEXT_XPATH))
+
+    for href in hrefs:
+        href = href.strip()
+        if href and not href.startswith(('#', 'javascript:')):
+            return urllib.parse.urljoin(_base_url(tree, url), href)
+    return None
+
+
+def _parse(page: core.ScrapePage) -> Optional[lxml.html.HtmlElement]:
+    """Parse the html of the page, None if there is no document."""
+    # pylint: disable=c-extension-no-member
+    try:
+        return lxml.html.document_fromstring(page.html)
+    except ValueError:
+        # Strings with an xml encoding declaration need to be parsed as bytes
+        if page.content is None:
+            return None
+        try:
+            return lxml.html.document_fromstring(page.content)
+        except (ValueError, lxml.etree.ParserError):
+            return None
+    except lxml.etree.ParserError:
+        # E.g. an empty document
+        return None
+
+
+def _find_hrefs(tree: lxml.html.HtmlElement,
+                next_link: core.WaitForPageElem) -> List[str]:
+    """Get the hrefs of the elements located by the next link."""
+    if next_link.wait_type == core.WaitForPageType.CSS:
+        return _hrefs(tree.cssselect(next_link.wait_text))
+    if next_link.wait_type == core.WaitForPageType.XPATH:
+        return _hrefs(tree.xpath(next_link.wait_text))
+
+    raise ValueError(F'Next Link "{next_link.wait_type}" not supported')
+
+
+def _hrefs(found: Union[List[lxml.html.HtmlElement], List[str]]
+           ) -> List[str]:
+    """Get the hrefs of the elements, xpath strings are hrefs already."""
+    if not isinstance(found, list):
+        found = [found]
+
+    hrefs = []
+    for item in found:
+        if isinstance(item, str):
+            hrefs.append(str(item))
+        elif item.get('href') is not None:
+            hrefs.append(item.get('href'))
+    return hrefs
+
+
+def _base_url(tree: lxml.html.HtmlElement, url: str) -> str:
+    """Get the url relative links are resolved against."""
+    base_hrefs = tree.xpath('//base/@href')
+    if base_hrefs:
+        return urllib.parse.urljoin(url, str(base_hrefs[0]).strip())
+    return url
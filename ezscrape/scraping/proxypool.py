@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+"""Module providing a pool of proxies rotated by their health."""
+
+import dataclasses
+import logging
+import random
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+import ezscrape.scraping.core as core
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_QUARANTINE_TIME = 60.0
+DEFAULT_MAX_QUARANTINE_TIME = 3600.0
+DEFAULT_SMOOTHING = 0.3
+# Success score of a proxy that comes back from quarantine
+PROBATION_SUCCESS_SCORE = 0.5
+# Avoid dividing by 0 for proxies that always fail
+MIN_SUCCESS_SCORE = 0.01
+# Latency assumed for proxies without a success, as slow as a timeout
+FAILED_PROXY_LATENCY_MS = core.DEFAULT_REQUEST_TIMEOUT * 1000
+
+DEFAULT_FAILURE_STATUSES = frozenset(
+    {core.ScrapeStatus.PROXY_ERROR, core.ScrapeStatus.TIMEOUT})
+DEFAULT_FAILURE_STATUS_CODES = frozenset({403, 407, 429})
+
+
+@dataclass
+class ProxyStats():
+    """Health statistics of a single proxy.
+
+    success_score and latency_ms are exponentially weighted moving
+    averages, latency_ms is 0 until the first success.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    url: str
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    success_score: float = 1.0
+    latency_ms: float = 0
+    in_flight: int = 0
+    quarantines: int = 0
+    quarantined_until: float = 0
+
+    @property
+    def cost(self) -> float:
+        """Property to get the expected cost of a request, lower is better.
+
+        Untried proxies cost nothing so they are tried first, proxies that
+        only failed are assumed as slow as a timeout. Requests in flight
+        make a proxy more expensive so the load is spread over similarly
+        fast proxies.
+        """
+        if not self.successes:
+            if not self.failures:
+                return 0.0
+            latency_ms = FAILED_PROXY_LATENCY_MS
+        else:
+            latency_ms = self.latency_ms
+        return (latency_ms * (1 + self.in_flight) /
+                max(self.success_score, MIN_SUCCESS_SCORE))
+
+    def is_quarantined(self, now: float) -> bool:
+        """Check if the proxy is quarantined at the monotonic time."""
+        return now < self.quarantined_until
+
+
+class ProxyPool():
+    """Thread safe pool of proxies, picking the fastest healthy proxy.
+
+    A result counts as a proxy failure if its status is one of the
+    failure_statuses or its status code one of the failure_status_codes.
+    After failure_threshold consecutive failures a proxy is quarantined,
+    starting with quarantine_time and doubling for repeated quarantines
+    up to max_quarantine_time. Successes decay the quarantine count again.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, proxies: Iterable[str], *,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 quarantine_time: float = DEFAULT_QUARANTINE_TIME,
+                 max_quarantine_time: float = DEFAULT_MAX_QUARANTINE_TIME,
+                 smoothing: float = DEFAULT_SMOOTHING,
+                 failure_statuses: FrozenSet[core.ScrapeStatus] =
+                 DEFAULT_FAILURE_STATUSES,
+                 failure_status_codes: FrozenSet[int] =
+                 DEFAULT_FAILURE_STATUS_CODES):
+        """Initialize the Proxy Pool with the proxy urls.
+
+        Each proxy is used for http and https requests.
+        """
+        # pylint: disable=too-many-arguments
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+        if not 0 < smoothing <= 1:
+            raise ValueError('smoothing must be between 0 and 1')
+
+        self.failure_threshold = failure_threshold
+        self.quarantine_time = quarantine_time
+        self.max_quarantine_time = max_quarantine_time
+        self.smoothing = smoothing
+        self.failure_statuses = failure_statuses
+        self.failure_status_codes = failure_status_codes
+
+        self._proxies: Dict[str, ProxyStats] = {}
+        self._lock = threading.Lock()
+        for proxy in proxies:
+            self.add(proxy)
+
+    def add(self, proxy: str) -> None:
+        """Add the proxy to the pool if not in it yet."""
+        with self._lock:
+            if proxy not in self._proxies:
+                self._proxies[proxy] = ProxyStats(proxy)
+
+    def remove(self, proxy: str) -> None:
+        """Remove the proxy from the pool."""
+        with self._lock:
+            self._proxies.pop(proxy, None)
+
+    def acquire(self) -> Optional[str]:
+        """Pick the proxy for a request, None if all are quarantined.
+
+        Every acquired proxy must be reported with report() or released
+        with release().
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates: List[ProxyStats] = []
+            best_cost = 0.0
+            for stats in self._proxies.values():
+                if stats.is_quarantined(now):
+                    continue
+                cost = stats.cost
+                if (not candidates) or (cost < best_cost):
+                    candidates = [stats]
+                    best_cost = cost
+                elif cost == best_cost:
+                    candidates.append(stats)
+
+            if not candidates:
+                return None
+
+            # Not used for security purposes
+            picked = random.choice(candidates)  # nosec
+            picked.in_flight += 1
+            return picked.url
+
+    def release(self, proxy: str) -> None:
+        """Release the proxy without a result, e.g. if the scrape raised."""
+        with self._lock:
+            stats = self._proxies.get(proxy)
+            if stats is not None:
+                stats.in_flight = max(stats.in_flight - 1, 0)
+
+    def report(self, proxy: str, result: core.ScrapeResult) -> None:
+        """Update the health of the proxy from the scrape result."""
+        failed = ((result.status in self.failure_statuses) or
+                  (result.status_code in self.failure_status_codes))
+
+        with self._lock:
+            stats = self._proxies.get(proxy)
+            if stats is None:
+                return
+
+            stats.in_flight = max(stats.in_flight - 1, 0)
+            stats.success_score += self.smoothing * (
+                (0.0 if failed else 1.0) - stats.success_score)
+
+            if failed:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.failure_threshold:
+                    self._quarantine(stats)
+            else:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+                stats.quarantines = max(stats.quarantines - 1, 0)
+                if result.request_time_ms > 0:
+                    if stats.latency_ms:
+                        stats.latency_ms += self.smoothing * (
+                            result.request_time_ms - stats.latency_ms)
+                    else:
+                        stats.latency_ms = result.request_time_ms
+
+    def scrape_through(self, url: str,
+                       scrape: Callable[[str], core.ScrapeResult]
+                       ) -> core.ScrapeResult:
+        """Call scrape with a proxy of the pool and report the result.
+
+        A PROXY_ERROR result is returned if no healthy proxy is available.
+        """
+        proxy = self.acquire()
+        if proxy is None:
+            result = core.ScrapeResult(url)
+            result.status = core.ScrapeStatus.PROXY_ERROR
+            result.error_msg = 'No healthy proxy available'
+            return result
+
+        scrape_result = None
+        try:
+            scrape_result = scrape(proxy)
+        finally:
+            if scrape_result is None:
+                self.release(proxy)
+            else:
+                self.report(proxy, scrape_result)
+        return scrape_result
+
+    def stats(self) -> List[ProxyStats]:
+        """Get a snapshot of the statistics of all proxies."""
+        with self._lock:
+            return [dataclasses.replace(stats)
+                    for stats in self._proxies.values()]
+
+    def healthy_count(self) -> int:
+        """Get the number of proxies not quarantined."""
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for stats in self._proxies.values()
+                       if not stats.is_quarantined(now))
+
+    def _quarantine(self, stats: ProxyStats) -> None:
+        """Quarantine the proxy, the lock must be held."""
+        quarantine_time = min(
+            self.quarantine_time * (2.0 ** stats.quarantines),
+            self.max_quarantine_time)
+        logger.debug(F'Quarantine proxy "{stats.url}" for {quarantine_time}s')
+
+        stats.quarantines += 1
+        stats.quarantined_until = time.monotonic() + quarantine_time
+        stats.consecutive_failures = 0
+        stats.success_score = PROBATION_SUCCESS_SCORE
+
+    def __len__(self) -> int:
+        return len(self._proxies)
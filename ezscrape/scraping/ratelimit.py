@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+
+"""Module providing a per host rate limiter shared between scrapers."""
+
+import contextlib
+import datetime
+import email.utils
+import logging
+import threading
+import time
+import urllib.robotparser
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional
+
+import requests
+
+import ezscrape.scraping.web_lib as web_lib
+
+if TYPE_CHECKING:
+    # pylint: disable=cyclic-import
+    import ezscrape.scraping.core as core  # noqa: F401
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_BURST = 1
+DEFAULT_MAX_PER_HOST = 2
+DEFAULT_MAX_RETRY_AFTER = 300.0
+DEFAULT_ROBOTS_TIMEOUT = 5.0
+# How often to check for a free slot if the caller can't block
+CONCURRENCY_POLL_INTERVAL = 0.05
+# Idle hosts are dropped once this many hosts are tracked
+HOST_PRUNE_THRESHOLD = 1024
+
+
+@dataclass
+class RobotsRequest():
+    """Define how robots.txt is requested, the same as the scrape.
+
+    A random user agent is used if blank, a new session if None.
+    """
+
+    useragent: str = ''
+    proxies: Dict[str, str] = field(default_factory=dict)
+    session: Optional[requests.Session] = None
+
+
+def robots_request_for(config: 'core.ScrapeConfig',
+                       session: Optional[requests.Session] = None
+                       ) -> Optional[RobotsRequest]:
+    """Get the request for robots.txt with the user agent and proxies.
+
+    None if the rate limiter of the config doesn't load robots.txt.
+    """
+    limiter = config.rate_limiter
+    if (limiter is None) or (not limiter.honour_robots_txt):
+        return None
+
+    return RobotsRequest(config.get_useragent(), config.get_proxies(),
+                         session)
+
+
+def fetch_robots_txt(url: str,
+                     robots_request: Optional[RobotsRequest] = None) -> str:
+    """Fetch the robots.txt for the host of the url, blank if not found."""
+    if robots_request is None:
+        robots_request = RobotsRequest()
+    url_split = web_lib.split_url(url)
+    netloc = url_split.hostname
+    if url_split.port:
+        netloc = F'{netloc}:{url_split.port}'
+    robots_url = F'{url_split.scheme}://{netloc}/robots.txt'
+
+    session = robots_request.session
+    useragent = robots_request.useragent or web_lib.random_useragent()
+    try:
+        resp = (requests if session is None else session).get(
+            robots_url, timeout=DEFAULT_ROBOTS_TIMEOUT,
+            headers={'User-Agent': useragent},
+            proxies=robots_request.proxies)
+    except requests.RequestException as error:
+        logger.debug(F'Fetching "{robots_url}" failed: {error}')
+        return ''
+
+    if resp.status_code != 200:
+        return ''
+    return resp.text
+
+
+RobotsFetcher = Callable[[str, Optional[RobotsRequest]], str]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header into seconds from now."""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=datetime.timezone.utc)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((retry_date - now).total_seconds(), 0.0)
+
+
+class _HostState():
+    """The limiter state of a single host."""
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+
+    def __init__(self, requests_per_second: float, burst: int):
+        """Initialize the Host State with a full bucket."""
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.waiting = 0
+        self.blocked_until = 0.0
+        self.robots_loaded = False
+        self.robots_loading = False
+
+    def refill(self, now: float) -> None:
+        """Add the tokens for the time passed since the last update."""
+        self.tokens = min(
+            self.burst,
+            self.tokens + (now - self.updated) * self.requests_per_second)
+        self.updated = now
+
+    def idle(self, now: float) -> bool:
+        """Check if the state is no different from a new state.
+
+        The robots.txt limits are lost, it is loaded again if needed.
+        """
+        if (self.in_flight or self.waiting or self.robots_loading or
+                (now < self.blocked_until)):
+            return False
+        self.refill(now)
+        return self.tokens >= self.burst
+
+
+class RateLimiter():
+    """Thread safe rate limiter using a token bucket per host.
+
+    Each host gets requests_per_second with bursts of up to burst requests
+    and at most max_per_host concurrent requests (0 is unlimited). A host
+    can be deferred, e.g. for a Retry-After header. With
+    honour_robots_txt the Crawl-delay and Request-rate of the host's
+    robots.txt lower the rate of the host, it is requested like the first
+    scrape of the host if its robots_request is given. Hosts with a full
+    bucket and nothing in flight are dropped once many hosts are tracked.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, *,
+                 burst: int = DEFAULT_BURST,
+                 max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+                 honour_robots_txt: bool = False,
+                 robots_useragent: str = '*',
+                 robots_fetcher: RobotsFetcher = fetch_robots_txt):
+        """Initialize the Rate Limiter."""
+        # pylint: disable=too-many-arguments
+        if requests_per_second <= 0:
+            raise ValueError('requests_per_second must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+        if max_per_host < 0:
+            raise ValueError('max_per_host cannot be negative')
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_per_host = max_per_host
+        self.max_retry_after = max_retry_after
+        self.honour_robots_txt = honour_robots_txt
+        self.robots_useragent = robots_useragent
+        self._robots_fetcher = robots_fetcher
+
+        self._hosts: Dict[str, _HostState] = {}
+        self._prune_at = HOST_PRUNE_THRESHOLD
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Get the key the url is limited by."""
+        return web_lib.split_url(url).hostname or ''
+
+    def acquire(self, url: str, timeout: Optional[float] = None, *,
+                robots_request: Optional[RobotsRequest] = None) -> bool:
+        """Wait until a request to the url's host is allowed.
+
+        Return False if the timeout expired first. Every successful acquire
+        must be followed by a release.
+        """
+        self.load_robots_txt(url, robots_request)
+
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        with self._condition:
+            state = self._state(url)
+            while True:
+                wait_time = self._try_acquire(state)
+                if wait_time == 0:
+                    return True
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    if (wait_time is None) or (wait_time > remaining):
+                        wait_time = remaining
+
+                # Waiting hosts are not pruned, the state is kept
+                state.waiting += 1
+                try:
+                    self._condition.wait(wait_time)
+                finally:
+                    state.waiting -= 1
+
+    def try_acquire(self, url: str) -> float:
+        """Acquire without blocking.
+
+        Return 0 if acquired, otherwise the seconds to wait before trying
+        again. Intended for callers that must not block, like asyncio.
+        """
+        with self._condition:
+            wait_time = self._try_acquire(self._state(url))
+        if wait_time is None:
+            return CONCURRENCY_POLL_INTERVAL
+        return wait_time
+
+    def release(self, url: str, *,
+                retry_after: Optional[float] = None) -> None:
+        """Release the request slot, defer the host if retry_after is set."""
+        with self._condition:
+            state = self._state(url)
+            state.in_flight = max(state.in_flight - 1, 0)
+            if retry_after is not None:
+                self._defer(state, retry_after)
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def limit(self, url: str, *,
+              robots_request: Optional[RobotsRequest] = None
+              ) -> Iterator[None]:
+        """Context manager to acquire and release a request slot."""
+        self.acquire(url, robots_request=robots_request)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Allow no new requests to the url's host for the seconds."""
+        with self._condition:
+            self._defer(self._state(url), seconds)
+            self._condition.notify_all()
+
+    def load_robots_txt(self, url: str,
+                        robots_request: Optional[RobotsRequest] = None
+                        ) -> None:
+        """Apply the robots.txt limits of the url's host, once per host."""
+        if not self.honour_robots_txt:
+            return
+
+        with self._condition:
+            state = self._state(url)
+            while state.robots_loading:
+                self._condition.wait()
+            if state.robots_loaded:
+                return
+            state.robots_loading = True
+
+        # Fetch without holding the lock, other hosts can continue
+        requests_per_second = None
+        try:
+            parser = urllib.robotparser.RobotFileParser()
+            parser.parse(
+                self._robots_fetcher(url, robots_request).splitlines())
+            requests_per_second = self._robots_rate(parser)
+        finally:
+            with self._condition:
+                if requests_per_second is not None:
+                    logger.debug(F'robots.txt limits "{self.host_key(url)}" '
+                                 F'to {requests_per_second} requests/second')
+                    state.requests_per_second = requests_per_second
+                    state.burst = 1
+                    state.tokens = min(state.tokens, 1)
+                state.robots_loaded = True
+                state.robots_loading = False
+                self._condition.notify_all()
+
+    def _robots_rate(self, parser: urllib.robotparser.RobotFileParser
+                     ) -> Optional[float]:
+        """Get the requests per second if robots.txt requires a lower rate."""
+        rates = []
+
+        crawl_delay = parser.crawl_delay(self.robots_useragent)
+        if crawl_delay:
+            rates.append(1 / float(crawl_delay))
+
+        request_rate = parser.request_rate(self.robots_useragent)
+        if request_rate and request_rate.requests and request_rate.seconds:
+            rates.append(request_rate.requests / request_rate.seconds)
+
+        if rates and (min(rates) < self.requests_per_second):
+            return min(rates)
+        return None
+
+    def _state(self, url: str) -> _HostState:
+        """Get the state of the url's host, the lock must be held."""
+        key = self.host_key(url)
+        state = self._hosts.get(key)
+        if state is None:
+            if len(self._hosts) >= self._prune_at:
+                self._prune()
+            state = _HostState(self.requests_per_second, self.burst)
+            self._hosts[key] = state
+        return state
+
+    def _prune(self) -> None:
+        """Drop the idle hosts, the lock must be held."""
+        now = time.monotonic()
+        self._hosts = {key: state for key, state in self._hosts.items()
+                       if not state.idle(now)}
+        # Prune again only after the busy hosts doubled
+        self._prune_at = max(HOST_PRUNE_THRESHOLD, 2 * len(self._hosts))
+
+    def _try_acquire(self, state: _HostState) -> Optional[float]:
+        """Take a token and a slot, the lock must be held.
+
+        Return 0 if acquired, the seconds until the next token is available
+        or None if all slots are in use.
+        """
+        now = time.monotonic()
+        if now < state.blocked_until:
+            return state.blocked_until - now
+
+        if self.max_per_host and (state.in_flight >= self.max_per_host):
+            return None
+
+        state.refill(now)
+        if state.tokens < 1:
+            return (1 - state.tokens) / state.requests_per_second
+
+        state.tokens -= 1
+        state.in_flight += 1
+        return 0
+
+    def _defer(self, state: _HostState, seconds: float) -> None:
+        """Block the host for the seconds, the lock must be held."""
+        seconds = min(max(seconds, 0), self.max_retry_after)
+        state.blocked_until = max(state.blocked_until,
+                                  time.monotonic() + seconds)
@@ -2,80 +2,256 @@
 
 """Main Scrape Functionality."""
 
+import collections
+import concurrent.futures
+import importlib
 import ipaddress
 import logging
-import urllib
+import types
 
-from typing import Optional
+from typing import (
+    TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional, Tuple)
 
 import ezscrape.scraping.scraper_requests as scraper_requests
-import ezscrape.scraping.scraper_selenium as scraper_selenium
 
 import ezscrape.scraping.core as core
+import ezscrape.scraping.dnscache as dnscache
 import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.healthcheck as healthcheck
+import ezscrape.scraping.http_sessions as http_sessions
+import ezscrape.scraping.metrics as metrics
+import ezscrape.scraping.urlclass as urlclass
+import ezscrape.scraping.web_lib as web_lib
+
+if TYPE_CHECKING:
+    # Imported on first use, importing Selenium is slow
+    import ezscrape.scraping.scraper_selenium as scraper_selenium  # noqa: F401
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
-SPECIAL_LOCAL_ADDRESSES = [
-    'localhost',
-    '0.0',
-    '127.1'
-]
+SPECIAL_LOCAL_ADDRESSES = urlclass.SPECIAL_LOCAL_ADDRESSES
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_HOST = 2
+
+
+def scrape_url(
+        config: core.ScrapeConfig, *,
+        session_pool: Optional[http_sessions.SessionPool] = None,
+        driver_pool: Optional['scraper_selenium.ChromeDriverPool'] = None
+) -> core.ScrapeResult:
+    """Handle all scraping requests.
+
+    Requests share the given session_pool and Selenium drivers are leased
+    from the given driver_pool, or the process wide default pools if None.
+    """
+    scraper = _scraper_for_config(config, session_pool=session_pool,
+                                  driver_pool=driver_pool)
+    result = scraper.scrape()
+
+    collector = metrics.get_default_metrics()
+    if collector.enabled:
+        collector.increment(metrics.SCRAPES_TOTAL, labels={
+            'scraper': type(scraper).__name__,
+            'status': result.status.name})
+    return result
+
+
+def iter_pages(
+        config: core.ScrapeConfig, *,
+        session_pool: Optional[http_sessions.SessionPool] = None,
+        driver_pool: Optional['scraper_selenium.ChromeDriverPool'] = None
+) -> core.PageStream:
+    """Stream the pages of the scrape as they are scraped.
+
+    The scraper and pools are chosen like for scrape_url, see the
+    iter_pages method of core.Scraper.
+    """
+    scraper = _scraper_for_config(config, session_pool=session_pool,
+                                  driver_pool=driver_pool)
+    return scraper.iter_pages()
+
+
+def scrape_urls(configs: Iterable[core.ScrapeConfig], *,
+                max_workers: int = DEFAULT_MAX_WORKERS,
+                max_per_host: int = DEFAULT_MAX_PER_HOST,
+                ordered: bool = False,
+                session_pool: Optional[http_sessions.SessionPool] = None,
+                driver_pool: Optional[
+                    'scraper_selenium.ChromeDriverPool'] = None
+                ) -> Iterator[core.ScrapeResult]:
+    """Scrape multiple configs concurrently and yield the results.
+
+    Results are yielded as they complete, or in input order if ordered is
+    set. At most max_per_host scrapes run at the same time for each host,
+    the scraper is chosen for each config the same way as in scrape_url.
+    Exceptions of a scrape are returned as a result with the ERROR status.
+    If the session pool has a dns cache the hosts are resolved in parallel
+    before the first scrape.
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    if max_workers < 1:
+        raise ValueError('max_workers must be at least 1')
+    if max_per_host < 1:
+        raise ValueError('max_per_host must be at least 1')
+
+    # Queue the configs per host so busy hosts don't block the workers
+    host_queues: Dict[str, Deque[Tuple[int, core.ScrapeConfig]]] =\
+        collections.OrderedDict()
+    for idx, config in enumerate(configs):
+        host = _host_key(config.url)
+        host_queues.setdefault(host, collections.deque()).append(
+            (idx, config))
+
+    _prefetch_hosts([config for queue in host_queues.values()
+                     for _, config in queue], session_pool)
+
+    running_per_host: Dict[str, int] = collections.defaultdict(int)
+    running: Dict['concurrent.futures.Future[core.ScrapeResult]',
+                  Tuple[int, str, str]] = {}
+    finished: Dict[int, core.ScrapeResult] = {}
+    next_idx = 0
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers) as executor:
+        while True:
+            # Start as many scrapes as the limits allow
+            for host, queue in host_queues.items():
+                while (queue and (len(running) < max_workers) and
+                       (running_per_host[host] < max_per_host)):
+                    idx, config = queue.popleft()
+                    future = executor.submit(
+                        scrape_url, config, session_pool=session_pool,
+                        driver_pool=driver_pool)
+                    running[future] = (idx, host, config.url)
+                    running_per_host[host] += 1
 
+            if not running:
+                break
 
-def scrape_url(config: core.ScrapeConfig) -> core.ScrapeResult:
-    """Handle all scraping requests."""
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                idx, host, url = running.pop(future)
+                running_per_host[host] -= 1
+                result = _future_result(future, url)
+
+                if ordered:
+                    finished[idx] = result
+                else:
+                    yield result
+
+            while next_idx in finished:
+                yield finished.pop(next_idx)
+                next_idx += 1
+
+
+def _future_result(future: 'concurrent.futures.Future[core.ScrapeResult]',
+                   url: str) -> core.ScrapeResult:
+    """Get the result of the scrape, an error result if it raised."""
+    # pylint: disable=broad-except
+    try:
+        return future.result()
+    except Exception as error:
+        logger.warning(F'Scraping "{url}" failed: {error}')
+        result = core.ScrapeResult(url)
+        result.status = core.ScrapeStatus.ERROR
+        result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+        return result
+
+
+def _prefetch_hosts(configs: List[core.ScrapeConfig],
+                    session_pool: Optional[http_sessions.SessionPool]
+                    ) -> None:
+    """Resolve the hosts in the dns cache of the session pool, if any."""
+    if session_pool is None:
+        session_pool = http_sessions.get_default_pool()
+    if session_pool.dns_cache is not None:
+        session_pool.dns_cache.prefetch_configs(configs)
+
+
+def _scraper_for_config(
+        config: core.ScrapeConfig, *,
+        session_pool: Optional[http_sessions.SessionPool] = None,
+        driver_pool: Optional['scraper_selenium.ChromeDriverPool'] = None
+) -> core.Scraper:
+    """Get the least resource intensive scraper supporting the config."""
     scraper: Optional[core.Scraper] = None
 
     # 1.) Try to use Normal Requests Model
     if scraper is None:
         try:
-            scraper = scraper_requests.RequestsScraper(config)
+            scraper = scraper_requests.RequestsScraper(
+                config, session_pool=session_pool)
         except exceptions.ScrapeConfigError:
             pass
 
     # 2.) Try Using Selenium chrome if no scraper found yet
     if scraper is None:
+        # pylint: disable=import-outside-toplevel,redefined-outer-name
+        import ezscrape.scraping.scraper_selenium as scraper_selenium
         try:
-            scraper = scraper_selenium.SeleniumChromeScraper(config)
+            selenium_scraper = scraper_selenium.SeleniumChromeScraper(config)
         except exceptions.ScrapeConfigError:
             pass
+        else:
+            if driver_pool is None:
+                driver_pool = scraper_selenium.get_default_driver_pool()
+            selenium_scraper.driver_pool = driver_pool
+            scraper = selenium_scraper
 
-    if scraper is not None:
-        result = scraper.scrape()
-    else:
+    if scraper is None:
         raise ValueError(F'No Scraper found for config: {config}')
 
-    return result
+    return scraper
 
 
-def is_local_address(url: str) -> bool:
-    """Check whether the given url is a local address."""
-    # Parse the URL
-    result = urllib.parse.urlparse(url)
-    addr = result.netloc
-    if not addr:
-        addr = result.path
-    addr = addr.split(':')[0].lower()
+def _host_key(url: str) -> str:
+    """Get the host used for limiting the concurrency of the url."""
+    hostname = web_lib.split_url(url).hostname
+    if not hostname:
+        return ''
+    return hostname.lower()
 
-    # Check if it is a special local address
-    if addr in SPECIAL_LOCAL_ADDRESSES:
-        return True
 
-    # Check the Ip Range
-    is_private = False
-    try:
-        is_private = ipaddress.ip_address(addr).is_private
-    except ValueError:
-        is_private = False
-    return is_private
+def is_local_address(
+        url: str, *, dns_cache: Optional[dnscache.DnsCache] = None,
+        classifier: Optional[urlclass.UrlClassifier] = None) -> bool:
+    """Check whether the given url is a local address.
+
+    Classified by the given classifier or the default one. Host names
+    cached in the dns_cache are local if all their addresses are, the
+    cache is not used to resolve the host.
+    """
+    if classifier is None:
+        classifier = urlclass.DEFAULT_CLASSIFIER
 
+    url_class = classifier.classify(url)
+    if (url_class == urlclass.UrlClass.NAME) and (dns_cache is not None):
+        addresses = dns_cache.cached(urlclass.url_host(url))
+        if addresses:
+            return all(
+                classifier.classify_address(ipaddress.ip_address(address)) ==
+                urlclass.UrlClass.LOCAL for address in addresses)
 
-def check_url(url: str, *, local_only: bool) -> bool:
-    """Check if the Local url is reachable."""
+    return url_class == urlclass.UrlClass.LOCAL
+
+
+def check_url(url: str, *, local_only: bool,
+              config: Optional[core.ScrapeConfig] = None) -> bool:
+    """Check if the Local url is reachable.
+
+    Only requests the headers with the user agent and proxies of config,
+    see the healthcheck module.
+    """
     if local_only and (not is_local_address(url)):
         raise ValueError('Url is not a local address')
 
-    result = scrape_url(core.ScrapeConfig(url))
+    return bool(healthcheck.check(url, config=config))
+
 
-    return result.status == core.ScrapeStatus.SUCCESS
+def __getattr__(name: str) -> types.ModuleType:
+    """Import the Selenium scraper module on first access."""
+    if name == 'scraper_selenium':
+        return importlib.import_module('ezscrape.scraping.scraper_selenium')
+    raise AttributeError(F'module "{__name__}" has no attribute "{name}"')
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+"""Module to provide asyncio Scrape functionality using the aiohttp module."""
+
+import asyncio
+import http
+import logging
+
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+import aiohttp
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.metrics as metrics
+import ezscrape.scraping.ratelimit as ratelimit
+import ezscrape.scraping.scraper_requests as scraper_requests
+import ezscrape.scraping.timing as timing
+import ezscrape.scraping.web_lib as web_lib
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_MAX_CONCURRENCY = 1000
+
+
+class AsyncRequestsScraper(core.Scraper):
+    """Implement an asyncio Scraper using aiohttp."""
+
+    def __init__(self, config: core.ScrapeConfig, *,
+                 session: Optional[aiohttp.ClientSession] = None):
+        """Initialize the Async Request Scraper.
+
+        If no session is given a new session is created for each scrape.
+        """
+        super().__init__(config)
+        self.session = session
+        self._retry_after: Optional[float] = None
+
+    # The asyncio version of Scraper.scrape()
+    # pylint: disable=invalid-overridden-method
+    async def scrape(self) -> core.ScrapeResult:  # type: ignore
+        """Scrape using aiohttp."""
+        if self.session is not None:
+            return await self._scrape_with_session(self.session)
+
+        async with aiohttp.ClientSession() as session:
+            return await self._scrape_with_session(session)
+    # pylint: enable=invalid-overridden-method
+
+    async def _scrape_with_session(
+            self, session: aiohttp.ClientSession) -> core.ScrapeResult:
+        """Scrape the config using the given session.
+
+        Retry as defined by the config without blocking the event loop.
+        """
+        retries = core.RetryState(self.config.retry_policy,
+                                  scraper=type(self).__name__)
+        while True:
+            retries.start_attempt()
+            result = await self._scrape_attempt(session)
+            delay = retries.finish_attempt(result,
+                                           retry_after=self._retry_after)
+            if delay is None:
+                return result
+            await asyncio.sleep(delay)
+
+    async def _scrape_attempt(
+            self, session: aiohttp.ClientSession) -> core.ScrapeResult:
+        """Scrape once, wait for the rate limiter if set."""
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return await self._scrape_request(session)
+
+        await self._acquire_rate_limit(limiter)
+        try:
+            return await self._scrape_request(session)
+        finally:
+            limiter.release(self.config.url, retry_after=self._retry_after)
+
+    async def _acquire_rate_limit(
+            self, limiter: ratelimit.RateLimiter) -> None:
+        """Wait for the rate limiter without blocking the event loop."""
+        if limiter.honour_robots_txt:
+            await asyncio.get_running_loop().run_in_executor(
+                None, limiter.load_robots_txt, self.config.url,
+                ratelimit.robots_request_for(self.config))
+
+        while True:
+            wait_time = limiter.try_acquire(self.config.url)
+            if not wait_time:
+                return
+            await asyncio.sleep(wait_time)
+
+    async def _scrape_request(
+            self, session: aiohttp.ClientSession) -> core.ScrapeResult:
+        """Make the request with the given session."""
+        result = core.ScrapeResult(self.config.url)
+        self._retry_after = None
+
+        # Prepare the Request Data
+        headers = {'User-Agent': self.config.get_useragent()}
+
+        # aiohttp only supports a single proxy per request
+        proxy = None
+        if self.config.url.startswith('https'):
+            proxy = self.config.proxy_https or None
+        elif self.config.url.startswith('http'):
+            proxy = self.config.proxy_http or None
+
+        timeout = aiohttp.ClientTimeout(total=self.config.request_timeout)
+
+        # Make the Request
+        phase_timer = timing.PhaseTimer()
+        try:
+            async with session.get(self.config.url,
+                                   timeout=timeout,
+                                   proxy=proxy,
+                                   headers=headers,
+                                   ssl=False) as resp:
+                # Includes connecting, aiohttp doesn't report the phases
+                phase_timer.add(timing.PHASE_TTFB, phase_timer.total_ms())
+                result.status_code = resp.status
+                # Decide if Success or Not
+                if resp.status >= 400:
+                    result.status = core.ScrapeStatus.ERROR
+                    if resp.status in (http.HTTPStatus.TOO_MANY_REQUESTS,
+                                       http.HTTPStatus.SERVICE_UNAVAILABLE):
+                        self._retry_after = ratelimit.parse_retry_after(
+                            resp.headers.get('Retry-After'))
+                    result.error_msg = (
+                        F'HTTP Error: {resp.status} - '
+                        F'{web_lib.phrase_from_response_code(resp.status)}')
+                else:
+                    # The html is only decoded when accessed
+                    with phase_timer.phase(timing.PHASE_DOWNLOAD):
+                        content = await resp.read()
+                    metrics.count_downloaded_bytes(
+                        self.config.url, len(content))
+                    result.status = core.ScrapeStatus.SUCCESS
+                    result.add_scrape_page(
+                        content=content, encoding=resp.charset,
+                        scrape_time=phase_timer.total_ms(),
+                        status=core.ScrapeStatus.SUCCESS,
+                        timings=phase_timer.phases)
+
+        except (aiohttp.ClientProxyConnectionError,
+                aiohttp.ClientSSLError) as error:
+            result.status = core.ScrapeStatus.PROXY_ERROR
+            result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+        except asyncio.TimeoutError as error:
+            result.status = core.ScrapeStatus.TIMEOUT
+            result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+        except (aiohttp.ClientError, ValueError) as error:
+            result.status = core.ScrapeStatus.ERROR
+            result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+
+        return result
+
+    @classmethod
+    def _validate_config(cls, config: core.ScrapeConfig) -> None:
+        """Verify the config can be scraped by aiohttp."""
+        # Same restrictions as the blocking requests scraper
+        # pylint: disable=protected-access
+        scraper_requests.RequestsScraper._validate_config(config)
+
+        if config.page_content != core.PageContent.FULL:
+            raise exceptions.ScrapeConfigError(
+                'No Support for streaming the page content')
+
+        if config.max_body_bytes:
+            raise exceptions.ScrapeConfigError(
+                'No Support for limiting the body size')
+
+        if config.proxy_pool is not None:
+            raise exceptions.ScrapeConfigError(
+                'No Support for proxy pools')
+
+        if config.pagination is not None:
+            raise exceptions.ScrapeConfigError(
+                'No Support for following next links')
+
+        if config.cache_policy is not None:
+            raise exceptions.ScrapeConfigError(
+                'No Support for caching responses')
+
+
+async def scrape_url(config: core.ScrapeConfig, *,
+                     session: Optional[aiohttp.ClientSession] = None
+                     ) -> core.ScrapeResult:
+    """Scrape a single config with aiohttp."""
+    return await AsyncRequestsScraper(config, session=session).scrape()
+
+
+async def scrape_urls(configs: Iterable[core.ScrapeConfig], *,
+                      max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                      max_per_host: int = 0,
+                      ordered: bool = False
+                      ) -> AsyncIterator[core.ScrapeResult]:
+    """Scrape multiple configs concurrently and yield the results.
+
+    All scrapes share one session, at most max_concurrency requests are in
+    flight at the same time and max_per_host per host (0 is unlimited).
+    Results are yielded as they complete, or in input order if ordered is set.
+    """
+    if max_concurrency < 1:
+        raise ValueError('max_concurrency must be at least 1')
+    if max_per_host < 0:
+        raise ValueError('max_per_host cannot be negative')
+
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Limit before sending, otherwise waiting for a free connection
+        # would count towards the request timeout
+        semaphore = asyncio.Semaphore(max_concurrency)
+        host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        async def _scrape(config: core.ScrapeConfig) -> core.ScrapeResult:
+            if not max_per_host:
+                async with semaphore:
+                    return await scrape_url(config, session=session)
+
+            host = web_lib.split_url(config.url).hostname or ''
+            if host not in host_semaphores:
+                host_semaphores[host] = asyncio.Semaphore(max_per_host)
+            async with host_semaphores[host], semaphore:
+                return await scrape_url(config, session=session)
+
+        tasks = [asyncio.ensure_future(_scrape(config)) for config in configs]
+        try:
+            if ordered:
+                for task in tasks:
+                    yield await task
+            else:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -2,13 +2,22 @@
 
 """Module to provie Scrape functionality using the requests module."""
 
-import datetime
+import concurrent.futures
+import copy
+import http
 import logging
-import socket
+
+from typing import Dict, Generator, Iterator, Optional
 
 import requests
 
 import ezscrape.scraping.core as core
+import ezscrape.scraping.http_cache as http_cache
+import ezscrape.scraping.http_sessions as http_sessions
+import ezscrape.scraping.metrics as metrics
+import ezscrape.scraping.ratelimit as ratelimit
+import ezscrape.scraping.timing as timing
+import ezscrape.scraping.transport as transport
 import ezscrape.scraping.web_lib as web_lib
 import ezscrape.scraping.exceptions as exceptions
 
@@ -18,81 +27,331 @@ logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 class RequestsScraper(core.Scraper):
     """Implement the Scraper using requests."""
 
-    def __init__(self, config: core.ScrapeConfig):
-        """Initialize the Request Scraper."""
+    def __init__(self, config: core.ScrapeConfig, *,
+                 session_pool: Optional[http_sessions.SessionPool] = None):
+        """Initialize the Request Scraper.
+
+        If no session_pool is given the process wide default pool is used.
+        """
         super().__init__(config)
-        self._caller_ip = None
+        self.session_pool = session_pool
+        self._retry_after: Optional[float] = None
 
     def scrape(self) -> core.ScrapeResult:
-        """Scrape using Requests."""
+        """Scrape using Requests, retry as defined by the config.
+
+        With a pagination the linked next pages are scraped as well, each
+        with its own retries.
+        """
+        if self.config.pagination is None:
+            return self._scrape_with_retries(self._scrape_attempt)
+
+        result = core.ScrapeResult(self.config.url)
+        for page in self._linked_pages(result):
+            result.add_page(page)
+        return result
+
+    def iter_pages(self) -> core.PageStream:
+        """Stream the pages, the next page is scraped once requested.
+
+        With prefetch the next page is scraped while the current page is
+        processed. Without a pagination the single page is streamed.
+        """
+        if self.config.pagination is None:
+            return super().iter_pages()
+
+        result = core.ScrapeResult(self.config.url)
+        return core.PageStream(result, self._linked_pages(result))
+
+    def _linked_pages(self, result: core.ScrapeResult
+                      ) -> Generator[core.ScrapePage, None, None]:
+        """Yield the page of the url and the pages linked as next page.
+
+        The result gets the status of the last page scraped and all
+        attempts. A page already scraped is not followed again.
+        """
+        # Only imported if used, needs the optional lxml
+        # pylint: disable=import-outside-toplevel
+        import ezscrape.scraping.pagination as pagination
+
+        policy = self.config.pagination
+        assert policy is not None  # nosec
+
+        executor = None
+        if policy.prefetch:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        try:
+            url = self.config.url
+            page_result = self._scrape_with_retries(self._scrape_attempt)
+            seen = {url}
+            count = 0
+            while True:
+                _update_result(result, page_result)
+                page = page_result.first_page
+                if (page is None) or (not page_result):
+                    return
+                count += 1
+
+                next_url = None
+                if count < self.config.max_pages:
+                    next_url = pagination.next_page_url(page, url, policy)
+                    if next_url in seen:
+                        logger.debug(F'Next page "{next_url}" already '
+                                     'scraped, stop scraping')
+                        next_url = None
+
+                prefetched = None
+                if (next_url is not None) and (executor is not None):
+                    prefetched = executor.submit(self._scrape_page, next_url)
+
+                yield page
+
+                if next_url is None:
+                    return
+                seen.add(next_url)
+                url = next_url
+                if prefetched is not None:
+                    page_result = prefetched.result()
+                else:
+                    page_result = self._scrape_page(next_url)
+        finally:
+            if executor is not None:
+                # Don't wait for a prefetch if the stream is closed early
+                executor.shutdown(wait=False)
+
+    def _scrape_page(self, url: str) -> core.ScrapeResult:
+        """Scrape the linked page with the config and the session pool."""
+        config = copy.copy(self.config)
+        config.url = url
+        config.pagination = None
+        return RequestsScraper(config,
+                               session_pool=self.session_pool).scrape()
+
+    def _scrape_attempt(self) -> core.ScrapeResult:
+        """Scrape once, from the cache if possible."""
+        # Use the cached response if still fresh
+        cached = None
+        policy = self._cache_policy()
+        if policy is not None:
+            cached = policy.cache.get(self.config.url)
+            if (cached is not None) and policy.is_fresh(cached):
+                return self._result_from_cache(cached)
+
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return self._scrape_with_proxy(cached)
+
+        limiter.acquire(self.config.url,
+                        robots_request=ratelimit.robots_request_for(
+                            self.config, self._session()))
+        try:
+            return self._scrape_with_proxy(cached)
+        finally:
+            limiter.release(self.config.url, retry_after=self._retry_after)
+
+    def _scrape_with_proxy(self, cached: Optional[http_cache.CacheEntry]
+                           ) -> core.ScrapeResult:
+        """Make the request through a proxy of the proxy pool if set."""
+        proxy_pool = self.config.proxy_pool
+        if proxy_pool is None:
+            return self._scrape_request(cached, self.config.get_proxies())
+
+        return proxy_pool.scrape_through(
+            self.config.url,
+            lambda proxy: self._scrape_request(
+                cached, {'http': proxy, 'https': proxy}))
+
+    def _scrape_request(self, cached: Optional[http_cache.CacheEntry],
+                        proxies: Dict[str, str]) -> core.ScrapeResult:
+        """Make the request, revalidate the cached entry if given."""
         result = core.ScrapeResult(self.config.url)
+        self._retry_after = None
 
         # Prepare the Request Data
-        headers = {'User-Agent': web_lib.random_useragent()}
-        proxies = {}
-        hooks = {'response': self._get_caller_ip}
-
-        # Setup the user agent
-        if self.config.useragent:
-            headers['User-Agent'] = self.config.useragent
-
-        # Setup the Proxy
-        if self.config.proxy_http:
-            proxies['http'] = self.config.proxy_http
-        if self.config.proxy_https:
-            proxies['https'] = self.config.proxy_https
-
-        # Make the Request
-        time = datetime.datetime.now()
+        headers = {'User-Agent': self.config.get_useragent()}
+
+        # Revalidate the cached response
+        if cached is not None:
+            headers.update(cached.validators())
+
+        # Make the Request, only the headers are read at this point
+        phase_timer = timing.PhaseTimer()
+        session = self._session()
         try:
-            resp = requests.request('get',
-                                    self.config.url,
-                                    timeout=self.config.request_timeout,
-                                    proxies=proxies,
-                                    headers=headers,
-                                    hooks=hooks,
-                                    verify=False)
-
-        except (requests.exceptions.ProxyError,
-                requests.exceptions.SSLError) as error:
-            result.status = core.ScrapeStatus.PROXY_ERROR
-            result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
-        except requests.exceptions.Timeout as error:
-            result.status = core.ScrapeStatus.TIMEOUT
-            result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+            resp = session.request('get',
+                                   self.config.url,
+                                   timeout=self.config.request_timeout,
+                                   proxies=proxies,
+                                   headers=headers,
+                                   stream=True,
+                                   verify=False)
         except requests.RequestException as error:
+            self._set_error_status(result, error)
+            return result
+        finally:
+            # Cookies are only kept for the redirects of a single request
+            session.cookies.clear()
+
+        phase_timer.update(transport.response_timings(resp))
+        _set_connection(result, resp)
+        result.status_code = resp.status_code
+
+        # Decide if Success or Not
+        try:
+            resp.raise_for_status()
+        except requests.exceptions.HTTPError:
             result.status = core.ScrapeStatus.ERROR
-            result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+            if resp.status_code in (http.HTTPStatus.TOO_MANY_REQUESTS,
+                                    http.HTTPStatus.SERVICE_UNAVAILABLE):
+                self._retry_after = ratelimit.parse_retry_after(
+                    resp.headers.get('Retry-After'))
+
+            result.error_msg = (
+                F'HTTP Error: {resp.status_code} - '
+                F'{web_lib.phrase_from_response_code(resp.status_code)}')
+            resp.close()
         else:
-            result.caller_ip = self._caller_ip
+            if (cached is not None) and\
+               (resp.status_code == http.HTTPStatus.NOT_MODIFIED):
+                result = self._result_from_revalidated(cached, resp)
+                resp.close()
+            else:
+                self._read_response(result, resp, phase_timer)
+        return result
+
+    def _read_response(self, result: core.ScrapeResult,
+                       resp: requests.Response,
+                       phase_timer: timing.PhaseTimer) -> None:
+        """Read the response body as defined by the config."""
+        # Abort early if the server announces a body too big
+        max_bytes = self.config.max_body_bytes
+        length = resp.headers.get('Content-Length', '')
+        if max_bytes and length.isdigit() and (int(length) > max_bytes):
+            result.status = core.ScrapeStatus.BODY_TOO_LARGE
+            result.error_msg = (F'Body Too Large: Content-Length {length} '
+                                F'exceeds {max_bytes} bytes')
+            resp.close()
+            return
 
-            # Decide if Success or Not
-            try:
-                resp.raise_for_status()
-            except requests.exceptions.HTTPError as error:
-                result.status = core.ScrapeStatus.ERROR
+        # The html is only decoded when accessed
+        encoding = web_lib.encoding_from_content_type(
+            resp.headers.get('Content-Type'))
 
-                result.error_msg = (
-                    F'HTTP Error: {resp.status_code} - '
-                    F'{web_lib.phrase_from_response_code(resp.status_code)}')
-            else:
-                result.status = core.ScrapeStatus.SUCCESS
-                timediff = datetime.datetime.now() - time
-                scrape_time = (timediff.total_seconds() * 1000 +
-                               timediff.microseconds / 1000)
-                result.add_scrape_page(resp.text, scrape_time=scrape_time,
-                                       status=core.ScrapeStatus.SUCCESS)
+        # The caller reads the body, the connection stays open until then
+        if self.config.page_content == core.PageContent.CHUNKS:
+            result.status = core.ScrapeStatus.SUCCESS
+            result.add_scrape_page(encoding=encoding,
+                                   scrape_time=phase_timer.total_ms(),
+                                   status=core.ScrapeStatus.SUCCESS,
+                                   chunks=self._iter_chunks(resp),
+                                   timings=phase_timer.phases)
+            return
 
+        try:
+            with phase_timer.phase(timing.PHASE_DOWNLOAD):
+                content = b''.join(self._iter_body(resp))
+        except exceptions.ScrapeBodyTooLargeError as error:
+            result.status = core.ScrapeStatus.BODY_TOO_LARGE
+            result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+        except requests.RequestException as error:
+            self._set_error_status(result, error)
+        else:
+            result.status = core.ScrapeStatus.SUCCESS
+            scrape_time = phase_timer.total_ms()
+            result.add_scrape_page(content=content, encoding=encoding,
+                                   scrape_time=scrape_time,
+                                   status=core.ScrapeStatus.SUCCESS,
+                                   timings=phase_timer.phases)
+            self._store_in_cache(resp, content, encoding, scrape_time)
+        finally:
             resp.close()
+
+    def _iter_body(self, resp: requests.Response) -> Iterator[bytes]:
+        """Iterate over the body chunks, enforce the maximum body size."""
+        max_bytes = self.config.max_body_bytes
+        received = 0
+        try:
+            for chunk in resp.iter_content(
+                    chunk_size=self.config.chunk_size):
+                received += len(chunk)
+                if max_bytes and (received > max_bytes):
+                    raise exceptions.ScrapeBodyTooLargeError(
+                        F'Body exceeds {max_bytes} bytes')
+                yield chunk
+        finally:
+            metrics.count_downloaded_bytes(self.config.url, received)
+
+    def _iter_chunks(self, resp: requests.Response) -> Iterator[bytes]:
+        """Iterate over the body chunks, close the response when done."""
+        try:
+            yield from self._iter_body(resp)
+        finally:
+            resp.close()
+
+    @staticmethod
+    def _set_error_status(result: core.ScrapeResult,
+                          error: requests.RequestException) -> None:
+        """Set the result status for the request exception."""
+        if isinstance(error, (requests.exceptions.ProxyError,
+                              requests.exceptions.SSLError)):
+            result.status = core.ScrapeStatus.PROXY_ERROR
+        elif isinstance(error, requests.exceptions.Timeout):
+            result.status = core.ScrapeStatus.TIMEOUT
+        else:
+            result.status = core.ScrapeStatus.ERROR
+        result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
+
+    def _cache_policy(self) -> Optional[http_cache.CachePolicy]:
+        """Get the cache policy, streamed chunks are not cached."""
+        if self.config.page_content == core.PageContent.CHUNKS:
+            return None
+        return self.config.cache_policy
+
+    def _session(self) -> requests.Session:
+        """Get the pooled session to use for the request."""
+        session_pool = self.session_pool
+        if session_pool is None:
+            session_pool = http_sessions.get_default_pool()
+        return session_pool.session_for(self.config)
+
+    def _store_in_cache(self, resp: requests.Response, content: bytes,
+                        encoding: Optional[str], scrape_time: float) -> None:
+        """Store the response if caching is enabled."""
+        policy = self._cache_policy()
+        if policy is not None:
+            policy.store(self.config.url, resp.headers, content,
+                         encoding=encoding or '',
+                         request_time_ms=scrape_time)
+
+    def _result_from_revalidated(
+            self, entry: http_cache.CacheEntry,
+            resp: requests.Response) -> core.ScrapeResult:
+        """Create the Scrape Result for a Not Modified response."""
+        policy = self.config.cache_policy
+        if policy is not None:
+            policy.refresh(entry, resp.headers)
+
+        result = self._result_from_cache(entry)
+        _set_connection(result, resp)
+        result.status_code = resp.status_code
+        return result
+
+    def _result_from_cache(
+            self, entry: http_cache.CacheEntry) -> core.ScrapeResult:
+        """Create the Scrape Result from the cache entry."""
+        result = core.ScrapeResult(self.config.url)
+        result.status = core.ScrapeStatus.SUCCESS
+        result.from_cache = True
+        result.add_scrape_page(content=entry.content,
+                               encoding=entry.encoding or None,
+                               scrape_time=entry.request_time_ms,
+                               status=core.ScrapeStatus.SUCCESS)
         return result
 
-    def _get_caller_ip(self, response: requests.Response,  # type: ignore
-                       *args, **kwargs) -> None:
-        """Get the caller IP from the raw socket."""
-        # pylint: disable=unused-argument
-        sock = socket.fromfd(response.raw.fileno(), socket.AF_INET,
-                             socket.SOCK_STREAM)
-        self._caller_ip = sock.getpeername()[0]
+    def _retry_after_seconds(self) -> Optional[float]:
+        """Get the Retry-After of the last attempt if the server sent one."""
+        return self._retry_after
 
     @classmethod
     def _validate_config(cls, config: core.ScrapeConfig) -> None:
@@ -108,3 +367,32 @@ class RequestsScraper(core.Scraper):
         if config.page_load_wait > 0:
             raise exceptions.ScrapeConfigError(
                 'No Support for waiting for page load')
+
+        if config.extract_elem_list:
+            raise exceptions.ScrapeConfigError(
+                'No Support for extracting page elements')
+
+        if (config.pagination is not None) and\
+           (config.page_content != core.PageContent.FULL):
+            raise exceptions.ScrapeConfigError(
+                'No Support for following next links of streamed pages')
+
+
+def _set_connection(result: core.ScrapeResult,
+                    resp: requests.Response) -> None:
+    """Set the connection of the response and its peer as caller ip."""
+    result.connection = transport.response_connection(resp)
+    if result.connection is not None:
+        result.caller_ip = result.connection.peer_ip
+
+
+def _update_result(result: core.ScrapeResult,
+                   page_result: core.ScrapeResult) -> None:
+    """Update the result with the status and attempts of a page."""
+    result.status = page_result.status
+    result.status_code = page_result.status_code
+    result.error_msg = page_result.error_msg
+    result.caller_ip = page_result.caller_ip
+    result.connection = page_result.connection
+    result.from_cache = page_result.from_cache
+    result.attempts = result.attempts + page_result.attempts
@@ -2,12 +2,24 @@
 
 """Module to provie Scrape functionality using the selenium module."""
 
+# pylint: disable=too-many-lines
+
+import atexit
+import concurrent.futures
+import contextlib
+import dataclasses
 import enum
+import functools
 import logging
 import os
+import threading
+import time
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union
+from typing import (
+    Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple,
+    Union)
 
 from selenium.common.exceptions import (
     NoSuchElementException, TimeoutException, WebDriverException)
@@ -17,11 +29,31 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 
+import ezscrape.scraping.browser_resources as browser_resources
+import ezscrape.scraping.browser_scripts as browser_scripts
 import ezscrape.scraping.core as core
+import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.metrics as metrics
+import ezscrape.scraping.ratelimit as ratelimit
+import ezscrape.scraping.timing as timing
 import ezscrape.scraping.web_lib as web_lib
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+DEFAULT_DRIVER_POOL_SIZE = 2
+DEFAULT_MAX_PAGES_PER_DRIVER = 100
+DEFAULT_MAX_PROXY_POOLS = 8
+
+# Timeouts of new chromedriver sessions in seconds, restored after changes
+DEFAULT_PAGE_LOAD_TIMEOUT = 300
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+# Locators the condition scripts can find
+SCRIPT_LOCATORS = frozenset({By.XPATH, By.CSS_SELECTOR, By.ID})
+
+# Seconds the driver waits for the observer script beyond its own timeout
+OBSERVE_SCRIPT_TIMEOUT_MARGIN = 5
+
 
 class SeleniumSetupError(Exception):
     """Exception is Selenium is not Setup Correctly."""
@@ -60,40 +92,108 @@ class WaitCondition():
 
 
 class ScraperWait():
-    """Handle simple multiple conditions for waiting for Elements to Load."""
+    """Handle simple multiple conditions for waiting for Elements to Load.
+
+    With WaitStrategy.SCRIPT all outstanding conditions are checked in a
+    single script per poll instead of a WebDriver call per element and
+    check. Conditions the script can't check, e.g. for other locators or
+    invalid selectors, are checked per element.
+
+    With WaitStrategy.OBSERVE observe() waits in the browser until the
+    conditions are met, polls check them like WaitStrategy.SCRIPT.
+    """
 
     # pylint: disable=too-few-public-methods
 
-    def __init__(self, conditions: List[WaitCondition]):
+    def __init__(self, conditions: List[WaitCondition], *,
+                 strategy: core.WaitStrategy = core.WaitStrategy.SCRIPT):
         """Initialize the Waiter object."""
         self._conditions = conditions
+        self._strategy = strategy
         self.found_elements: Dict[str, WebElement] = {}
+        self.polls = 0
         self._found_might_have_count = 0
         self._found_must_have_count = 0
 
     def __call__(self, driver: RemoteWebDriver) -> Union[bool, WebElement]:
         """Handle Object Calls."""
+        self.polls += 1
+
+        outstanding = self._outstanding()
+        return self._evaluate(outstanding,
+                              self._find_outstanding(driver, outstanding))
+
+    def observe(self, driver: RemoteWebDriver, timeout: float,
+                recheck_interval: float) -> Union[bool, WebElement]:
+        """Wait in the browser until the conditions are met.
+
+        Return like a poll, False if the conditions need to be polled, e.g.
+        if the script can't check them or failed. Raise TimeoutException
+        if the conditions are not met within timeout seconds. The script
+        timeout of the driver is restored to the default afterwards.
+        """
+        outstanding = self._outstanding()
+        if (self._strategy == core.WaitStrategy.ELEMENTS) or\
+           (not outstanding) or\
+           any(cond.locator[0] not in SCRIPT_LOCATORS
+               for cond in outstanding):
+            return False
+
+        self.polls += 1
+        driver.set_script_timeout(timeout + OBSERVE_SCRIPT_TIMEOUT_MARGIN)
+        try:
+            checks = driver.execute_async_script(
+                browser_scripts.OBSERVE_CONDITIONS_SCRIPT,
+                [[cond.locator[0], cond.locator[1],
+                  cond.wait_type == WaitType.WAIT_FOR_CLICKABLE,
+                  cond.wait_logic == WaitLogic.MUST_HAVE]
+                 for cond in outstanding],
+                int(timeout * 1000), int(recheck_interval * 1000))
+        except TimeoutException:
+            raise
+        except WebDriverException as error:
+            # E.g. the page navigated away, poll the new page instead
+            logger.debug(F'Observe script failed, poll the conditions: '
+                         F'{error}')
+            return False
+        finally:
+            driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+
+        if checks is None:
+            raise TimeoutException(
+                F'Wait conditions not met within {timeout} seconds')
+
+        return self._evaluate(outstanding, {
+            cond.key: elem for cond, (state, elem) in zip(outstanding, checks)
+            if state == 'found'})
+
+    def _outstanding(self) -> List[WaitCondition]:
+        """Get the conditions without a found element."""
+        return [cond for cond in self._conditions
+                if cond.key not in self.found_elements]
+
+    def _evaluate(self, outstanding: List[WaitCondition],
+                  found: Dict[str, Optional[WebElement]]
+                  ) -> Union[bool, WebElement]:
+        """Add the found elements, return one if the conditions are met."""
         # Test all outstanding events
         must_have_ok = True
-        for cond in self._conditions:
-            if cond.key not in self.found_elements:
-                elem = None
-                if cond.wait_type == WaitType.WAIT_FOR_CLICKABLE:
-                    elem = self._find_element(
-                        driver, cond.locator, visible=True, enabled=True)
-                elif cond.wait_type == WaitType.WAIT_FOR_LOCATED:
-                    elem = self._find_element(driver, cond.locator)
-
-                # If must have and not found we cannot complete yet
-                if (elem is None) and (cond.wait_logic == WaitLogic.MUST_HAVE):
-                    must_have_ok = False
-
-                if elem is not None:
-                    self.found_elements[cond.key] = elem
-                    if cond.wait_logic == WaitLogic.OPTIONAL:
-                        self._found_might_have_count += 1
-                    elif cond.wait_logic == WaitLogic.MUST_HAVE:
-                        self._found_must_have_count += 1
+        for cond in outstanding:
+            # A condition can be listed more than once
+            if cond.key in self.found_elements:
+                continue
+            elem = found.get(cond.key)
+
+            # If must have and not found we cannot complete yet
+            if (elem is None) and (cond.wait_logic == WaitLogic.MUST_HAVE):
+                must_have_ok = False
+
+            if elem is not None:
+                self.found_elements[cond.key] = elem
+                if cond.wait_logic == WaitLogic.OPTIONAL:
+                    self._found_might_have_count += 1
+                elif cond.wait_logic == WaitLogic.MUST_HAVE:
+                    self._found_must_have_count += 1
 
         # Verify if we have everything we need
         # Our conditions are met if
@@ -108,12 +208,63 @@ class ScraperWait():
         # We haven't found an element fulfilling our conditions
         return False
 
+    def _find_outstanding(self, driver: RemoteWebDriver,
+                          conditions: List[WaitCondition]
+                          ) -> Dict[str, Optional[WebElement]]:
+        """Find the elements of the conditions, None if not found."""
+        found: Dict[str, Optional[WebElement]] = {}
+        per_element = conditions
+        if self._strategy != core.WaitStrategy.ELEMENTS:
+            per_element = []
+            script_conditions = []
+            for cond in conditions:
+                if cond.locator[0] in SCRIPT_LOCATORS:
+                    script_conditions.append(cond)
+                else:
+                    per_element.append(cond)
+
+            if script_conditions:
+                try:
+                    checks = driver.execute_script(
+                        browser_scripts.FIND_CONDITIONS_SCRIPT,
+                        [[cond.locator[0], cond.locator[1],
+                          cond.wait_type == WaitType.WAIT_FOR_CLICKABLE]
+                         for cond in script_conditions])
+                except WebDriverException as error:
+                    # E.g. scripts disabled, keep checking per element
+                    logger.debug(F'Wait script failed, check conditions '
+                                 F'per element: {error}')
+                    self._strategy = core.WaitStrategy.ELEMENTS
+                    per_element = conditions
+                else:
+                    for cond, (state, elem) in zip(script_conditions,
+                                                   checks):
+                        if state == 'invalid':
+                            per_element.append(cond)
+                        else:
+                            found[cond.key] = elem
+
+        for cond in per_element:
+            found[cond.key] = self._find_condition(driver, cond)
+        return found
+
+    @classmethod
+    def _find_condition(cls, driver: RemoteWebDriver,
+                        cond: WaitCondition) -> Optional[WebElement]:
+        """Find the element of the condition with WebDriver calls."""
+        if cond.wait_type == WaitType.WAIT_FOR_CLICKABLE:
+            return cls._find_element(
+                driver, cond.locator, visible=True, enabled=True)
+        if cond.wait_type == WaitType.WAIT_FOR_LOCATED:
+            return cls._find_element(driver, cond.locator)
+        return None
+
     @staticmethod
     def _find_element(driver: RemoteWebDriver,
                       locator: Tuple[By, str],
                       *,
                       visible: bool = False,
-                      enabled: bool = False) -> WebElement:
+                      enabled: bool = False) -> Optional[WebElement]:
         found_elem = None
         try:
             candidate_elem = driver.find_element(locator[0], locator[1])
@@ -135,8 +286,13 @@ class SeleniumChromeSession():
     chrome_webdriver_env_var = 'CHROME_WEBDRIVER_PATH'
     chrome_exec_env_var = 'CHROME_EXEC_PATH'
 
-    def __init__(self, *, config: Optional[core.ScrapeConfig] = None):
-        """Initialize the Session."""
+    def __init__(self, *, config: Optional[core.ScrapeConfig] = None,
+                 proxy: Optional[str] = None):
+        """Initialize the Session.
+
+        The proxy is used for all requests if given, otherwise the proxy of
+        the config for its url scheme.
+        """
         # Using Portable Chrome, we see some issues
         #   "DevToolsActivePort file doesn't exist"
         # raised from selenium sometimes, not always for the same tests
@@ -153,18 +309,20 @@ class SeleniumChromeSession():
                 (F'Webdriver not found, set path as env '
                  F'Variable: "{self.chrome_webdriver_env_var}"'))
 
-        proxy = ''
+        useragent = web_lib.random_useragent()
         if config is not None:
-            if config.url.startswith('https'):
-                proxy = config.proxy_https
-            elif config.url.startswith('http'):
-                proxy = config.proxy_http
+            useragent = config.get_useragent()
+            if not proxy:
+                if config.url.startswith('https'):
+                    proxy = config.proxy_https
+                elif config.url.startswith('http'):
+                    proxy = config.proxy_http
 
         self._chrome_options = webdriver.ChromeOptions()
         self._chrome_options.add_argument('--headless')
         self._chrome_options.add_argument('--no-sandbox')
         self._chrome_options.add_argument(
-            F'user-agent={web_lib.random_useragent()}')
+            F'user-agent={useragent}')
         if self._chrome_path is not None:
             self._chrome_options.binary_location = self._chrome_path
 
@@ -176,9 +334,51 @@ class SeleniumChromeSession():
         if proxy:
             self._chrome_options.add_argument(F'--proxy-server={proxy}')
 
+        if config is not None:
+            self._chrome_options.page_load_strategy =\
+                config.page_load_strategy.value
+            self._add_resource_options(config, proxy)
+
+        start_ns = time.perf_counter_ns()
         self._driver = webdriver.Chrome(
             chrome_options=self._chrome_options,
             executable_path=self._chrome_web_driver_path)
+        metrics.get_default_metrics().observe(
+            metrics.SELENIUM_DRIVER_LAUNCH_MS, timing.elapsed_ms(start_ns))
+
+    def _add_resource_options(self, config: core.ScrapeConfig,
+                              proxy: Optional[str]) -> None:
+        """Add the launch options of the resource policy."""
+        policy = config.resource_policy
+        if policy is None:
+            return
+
+        if core.ResourceType.IMAGE in policy.blocked_types:
+            self._chrome_options.add_experimental_option(
+                'prefs', {browser_resources.BLOCK_IMAGES_PREF: 2})
+
+        if policy.allowed_hosts is not None:
+            if proxy:
+                # Hosts are resolved by the proxy, not by the rules
+                logger.warning('Allowed hosts not enforced through a proxy')
+
+            # The scraped url must still be resolved
+            allowed_hosts = list(policy.allowed_hosts)
+            host = web_lib.split_url(config.url).hostname
+            if host:
+                allowed_hosts.append(host)
+            rules = browser_resources.host_resolver_rules(allowed_hosts)
+            self._chrome_options.add_argument(
+                F'--host-resolver-rules={rules}')
+
+    @property
+    def driver(self) -> RemoteWebDriver:
+        """Property to get the driver of the session."""
+        return self._driver
+
+    def close(self) -> None:
+        """Quit the driver and the browser."""
+        self._driver.quit()
 
     def __enter__(self) -> RemoteWebDriver:
         return self._driver.__enter__()
@@ -187,30 +387,484 @@ class SeleniumChromeSession():
         self._driver.__exit__(exc_type, exc_val, exc_tb)
 
 
+# Creates the sessions of a Driver Pool, called with proxy=... for proxies
+SessionFactory = Callable[..., SeleniumChromeSession]
+
+
+@dataclass
+class DriverPoolStats():
+    """Usage statistics of a Driver Pool.
+
+    launches: browsers started
+    leases: drivers handed out
+    waits: leases that had to wait for a driver to be released
+    wait_time_ms: combined time spent waiting for a driver
+    recycles: drivers quit because of the page limit or a crash
+    idle: drivers currently ready to be leased
+    in_use: drivers currently leased
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    launches: int = 0
+    leases: int = 0
+    waits: int = 0
+    wait_time_ms: float = 0
+    recycles: int = 0
+    idle: int = 0
+    in_use: int = 0
+
+
+@dataclass
+class _PooledSession():
+    """A session owned by the Driver Pool."""
+
+    session: SeleniumChromeSession
+    pages: int = 0
+
+
+class ChromeDriverPool():
+    """Thread safe pool of reusable Chrome drivers.
+
+    Drivers are reset between leases (cookies, storage, cache, timeouts,
+    blank page) and quit after max_pages_per_driver pages or if they are
+    released as broken.
+    Drivers launched with a proxy are kept in pools per proxy, up to
+    max_proxy_pools of them.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, size: int = DEFAULT_DRIVER_POOL_SIZE, *,
+                 max_pages_per_driver: int = DEFAULT_MAX_PAGES_PER_DRIVER,
+                 prewarm: bool = True,
+                 max_proxy_pools: int = DEFAULT_MAX_PROXY_POOLS,
+                 session_factory: SessionFactory = SeleniumChromeSession):
+        """Initialize the Driver Pool, launch all drivers if prewarm.
+
+        If a launch fails the launched drivers are quit and the error raised.
+        """
+        if size < 1:
+            raise ValueError('Pool size must be at least 1')
+        if max_pages_per_driver < 1:
+            raise ValueError('max_pages_per_driver must be at least 1')
+
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_proxy_pools = max_proxy_pools
+        self._session_factory = session_factory
+        self._proxy_pools: 'OrderedDict[str, ChromeDriverPool]' =\
+            OrderedDict()
+
+        self._idle: List[_PooledSession] = []
+        self._leased: Dict[int, _PooledSession] = {}
+        self._launching = 0
+        self._closed = False
+        self._stats = DriverPoolStats()
+        self._condition = threading.Condition()
+
+        if prewarm:
+            try:
+                self.prewarm()
+            except BaseException:
+                self.close()
+                raise
+
+    def prewarm(self) -> None:
+        """Launch drivers in parallel until the pool is full."""
+        with self._condition:
+            missing = self.size - self._driver_count()
+            self._launching += missing
+
+        if missing <= 0:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=missing) as executor:
+            futures = [executor.submit(self._launch) for _ in range(missing)]
+
+        # Keep all launched drivers even if some failed to launch
+        launch_error: Optional[BaseException] = None
+        with self._condition:
+            for future in futures:
+                self._launching -= 1
+                error = future.exception()
+                if error is None:
+                    self._idle.append(future.result())
+                elif launch_error is None:
+                    launch_error = error
+            self._condition.notify_all()
+
+        if launch_error is not None:
+            raise launch_error
+
+    def acquire(self, timeout: Optional[float] = None) -> RemoteWebDriver:
+        """Lease a driver, launch or wait for one if none is idle."""
+        wait_start = None
+        launch = False
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise SeleniumSetupError('Driver Pool is closed')
+
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+
+                if self._driver_count() < self.size:
+                    self._launching += 1
+                    launch = True
+                    break
+
+                if wait_start is None:
+                    wait_start = time.perf_counter()
+                    self._stats.waits += 1
+
+                remaining = None
+                if timeout is not None:
+                    remaining = timeout - (time.perf_counter() - wait_start)
+                    if remaining <= 0:
+                        raise TimeoutException(
+                            'No driver released in time from the pool')
+                self._condition.wait(remaining)
+
+            if wait_start is not None:
+                self._stats.wait_time_ms +=\
+                    (time.perf_counter() - wait_start) * 1000
+
+        if launch:
+            try:
+                pooled = self._launch()
+            finally:
+                with self._condition:
+                    self._launching -= 1
+                    self._condition.notify()
+
+        with self._condition:
+            self._leased[id(pooled.session.driver)] = pooled
+            self._stats.leases += 1
+
+        return pooled.session.driver
+
+    def release(self, driver: RemoteWebDriver, *,
+                pages: int = 1, broken: bool = False) -> None:
+        """Return a leased driver after scraping the given page count."""
+        with self._condition:
+            pooled = self._leased.pop(id(driver))
+
+        pooled.pages += pages
+        recycle = broken or (pooled.pages >= self.max_pages_per_driver)
+
+        if not (recycle or self._closed):
+            try:
+                self._reset_driver(driver)
+            except WebDriverException as error:
+                logger.debug(F'Driver reset failed, recycle driver: {error}')
+                recycle = True
+
+        with self._condition:
+            keep = not (recycle or self._closed)
+            if keep:
+                self._idle.append(pooled)
+            elif recycle:
+                self._stats.recycles += 1
+            self._condition.notify()
+
+        if not keep:
+            self._quit(pooled)
+
+    @contextlib.contextmanager
+    def lease(self, timeout: Optional[float] = None
+              ) -> Iterator[RemoteWebDriver]:
+        """Context Manager to lease a driver for a single page."""
+        driver = self.acquire(timeout)
+        broken = True
+        try:
+            yield driver
+            broken = False
+        finally:
+            self.release(driver, broken=broken)
+
+    def for_proxy(self, proxy: str) -> 'ChromeDriverPool':
+        """Get the pool of drivers launched with the given proxy."""
+        evicted = None
+
+        with self._condition:
+            if self._closed:
+                raise SeleniumSetupError('Driver Pool is closed')
+
+            pool = self._proxy_pools.get(proxy)
+            if pool is None:
+                pool = ChromeDriverPool(
+                    self.size, max_pages_per_driver=self.max_pages_per_driver,
+                    prewarm=False, session_factory=functools.partial(
+                        self._session_factory, proxy=proxy))
+                self._proxy_pools[proxy] = pool
+                if len(self._proxy_pools) > self.max_proxy_pools:
+                    _, evicted = self._proxy_pools.popitem(last=False)
+            else:
+                self._proxy_pools.move_to_end(proxy)
+
+        if evicted is not None:
+            logger.debug('Proxy pool limit reached, close oldest pool')
+            evicted.close()
+
+        return pool
+
+    @property
+    def stats(self) -> DriverPoolStats:
+        """Property to get a snapshot of the pool statistics."""
+        with self._condition:
+            return dataclasses.replace(self._stats,
+                                       idle=len(self._idle),
+                                       in_use=len(self._leased))
+
+    @property
+    def closed(self) -> bool:
+        """Property to check if the pool has been closed."""
+        return self._closed
+
+    def close(self) -> None:
+        """Quit all idle drivers, leased ones are quit when released."""
+        with self._condition:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            proxy_pools = list(self._proxy_pools.values())
+            self._proxy_pools.clear()
+            self._condition.notify_all()
+
+        for pooled in idle:
+            self._quit(pooled)
+        for pool in proxy_pools:
+            pool.close()
+
+    def _driver_count(self) -> int:
+        """Count the drivers owned by the pool, including the launching."""
+        return len(self._idle) + len(self._leased) + self._launching
+
+    def _launch(self) -> _PooledSession:
+        """Launch a new driver."""
+        pooled = _PooledSession(self._session_factory())
+        with self._condition:
+            self._stats.launches += 1
+        return pooled
+
+    @staticmethod
+    def _reset_driver(driver: RemoteWebDriver) -> None:
+        """Clear the state left by the previous lease.
+
+        Storage, cookies and the cache of all origins are cleared, without
+        cdp commands only the storage of the current page and the cookies.
+        """
+        try:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin',
+                                   {'origin': '*', 'storageTypes': 'all'})
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        except (AttributeError, WebDriverException):
+            driver.execute_script(browser_scripts.RESET_STORAGE_SCRIPT)
+            driver.delete_all_cookies()
+        driver.set_page_load_timeout(DEFAULT_PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+        driver.get('about:blank')
+
+    @staticmethod
+    def _quit(pooled: _PooledSession) -> None:
+        """Quit the driver, ignoring errors of crashed browsers."""
+        try:
+            pooled.session.close()
+        except WebDriverException as error:
+            logger.debug(F'Error quitting driver: {error}')
+
+    def __enter__(self) -> 'ChromeDriverPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
+        self.close()
+
+
+_DEFAULT_DRIVER_POOL: Optional[ChromeDriverPool] = None
+_DEFAULT_DRIVER_POOL_LOCK = threading.Lock()
+
+
+def get_default_driver_pool() -> ChromeDriverPool:
+    """Get the process wide driver pool, create it if needed."""
+    global _DEFAULT_DRIVER_POOL  # pylint: disable=global-statement
+    with _DEFAULT_DRIVER_POOL_LOCK:
+        if (_DEFAULT_DRIVER_POOL is None) or _DEFAULT_DRIVER_POOL.closed:
+            _DEFAULT_DRIVER_POOL = ChromeDriverPool()
+        return _DEFAULT_DRIVER_POOL
+
+
+def close_default_driver_pool() -> None:
+    """Close the process wide driver pool if it exists."""
+    global _DEFAULT_DRIVER_POOL  # pylint: disable=global-statement
+    with _DEFAULT_DRIVER_POOL_LOCK:
+        pool = _DEFAULT_DRIVER_POOL
+        _DEFAULT_DRIVER_POOL = None
+
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close_default_driver_pool)
+
+
 class SeleniumChromeScraper(core.Scraper):
     """Implement the Scraper using requests."""
 
     def __init__(self, config: core.ScrapeConfig, *,
-                 driver: webdriver.Chrome = None):
-        """Initialize the Selenium Scraper."""
+                 driver: webdriver.Chrome = None,
+                 driver_pool: Optional[ChromeDriverPool] = None):
+        """Initialize the Selenium Scraper.
+
+        The driver is used if given, otherwise one is leased from the
+        driver_pool, or a new session is created if neither is given.
+        The proxy pool of the config can't be used with a given driver.
+        """
         super().__init__(config)
+        if (driver is not None) and (config.proxy_pool is not None):
+            raise exceptions.ScrapeConfigError(
+                'A proxy pool cannot be used with an existing driver')
         self.driver = driver
+        self.driver_pool = driver_pool
+
+    @classmethod
+    def _validate_config(cls, config: core.ScrapeConfig) -> None:
+        """Verify the config can be scraped by Selenium."""
+        super()._validate_config(config)
+
+        if (not config.include_page_source) and\
+                (not config.extract_elem_list):
+            raise exceptions.ScrapeConfigError(
+                'Page source excluded without elements to extract')
+
+        # The proxy resolves the hosts, the resolver rules have no effect
+        if (config.resource_policy is not None) and\
+                (config.resource_policy.allowed_hosts is not None) and\
+                (config.proxy_http or config.proxy_https or
+                 (config.proxy_pool is not None)):
+            raise exceptions.ScrapeConfigError(
+                'Allowed hosts cannot be enforced through a proxy')
 
     def scrape(self) -> core.ScrapeResult:
+        """Scrape with Selenium, retry as defined by the config."""
+        return self._scrape_with_retries(self._scrape_attempt)
+
+    def _scrape_attempt(self) -> core.ScrapeResult:
         """Handle existing driver session or create a new one."""
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return self._scrape()
+
+        # All pages of the scrape count as a single request
+        with limiter.limit(self.config.url,
+                           robots_request=ratelimit.robots_request_for(
+                               self.config)):
+            return self._scrape()
+
+    def iter_pages(self) -> core.PageStream:
+        """Stream the pages, each scraped once requested.
+
+        The next button is only clicked once the next page is requested,
+        the driver is released when the stream ends or is closed. Streams
+        are not retried, scrapes through a proxy pool are complete scrapes.
+        """
+        if (self.driver is None) and (self.config.proxy_pool is not None):
+            return super().iter_pages()
+
+        result = core.ScrapeResult(self.config.url)
+        return core.PageStream(result, self._stream_pages(result))
+
+    def _stream_pages(self, result: core.ScrapeResult
+                      ) -> Generator[core.ScrapePage, None, None]:
+        """Yield the pages as a single attempt counted in the metrics."""
+        retries = core.RetryState(None, scraper=type(self).__name__)
+        with contextlib.ExitStack() as stack:
+            limiter = self.config.rate_limiter
+            if limiter is not None:
+                # All pages of the scrape count as a single request
+                stack.enter_context(limiter.limit(
+                    self.config.url,
+                    robots_request=ratelimit.robots_request_for(
+                        self.config)))
+
+            retries.start_attempt()
+            try:
+                yield from self._iter_pages(result)
+            finally:
+                retries.finish_attempt(result)
+
+    def _scrape(self) -> core.ScrapeResult:
+        """Scrape with the driver, the pool or a new session."""
+        proxy_pool = self.config.proxy_pool
+        if (self.driver is None) and (proxy_pool is not None):
+            return proxy_pool.scrape_through(self.config.url,
+                                             self._scrape_with_proxy)
+
+        result = core.ScrapeResult(self.config.url)
+        return self._collect(result, self._iter_pages(result))
+
+    def _iter_pages(self, result: core.ScrapeResult
+                    ) -> Generator[core.ScrapePage, None, None]:
+        """Yield the pages scraped with the driver, the pool or a session."""
         if self.driver is not None:
-            result = self._scrape_with_driver(self.driver)
+            yield from self._iter_with_driver(self.driver, result)
+        elif (self.driver_pool is not None) and\
+                (not requires_launch_options(self.config)):
+            yield from self._iter_with_pool(self.driver_pool, result)
         else:
-            with SeleniumChromeSession() as driver:
-                result = self._scrape_with_driver(driver)
-        return result
+            with SeleniumChromeSession(config=self.config) as driver:
+                yield from self._iter_with_driver(driver, result)
 
-    def _scrape_with_driver(
-            self, driver: webdriver.Chrome = None) -> core.ScrapeResult:
-        """Scrape using Selenium with Chrome."""
+    def _scrape_with_proxy(self, proxy: str) -> core.ScrapeResult:
+        """Scrape with a driver of the proxy, the proxy is set at launch."""
         result = core.ScrapeResult(self.config.url)
-        count = 0
+        if (self.driver_pool is not None) and\
+                (not requires_launch_options(self.config, proxy_set=True)):
+            return self._collect(result, self._iter_with_pool(
+                self.driver_pool.for_proxy(proxy), result))
+
+        with SeleniumChromeSession(config=self.config, proxy=proxy) as driver:
+            return self._collect(result,
+                                 self._iter_with_driver(driver, result))
 
+    def _iter_with_pool(self, pool: ChromeDriverPool,
+                        result: core.ScrapeResult
+                        ) -> Generator[core.ScrapePage, None, None]:
+        """Yield the pages scraped with a driver leased from the pool."""
+        driver = pool.acquire()
+        pages = 0
+        broken = True
+        try:
+            for page in self._iter_with_driver(driver, result):
+                pages += 1
+                yield page
+            broken = False
+        except GeneratorExit:
+            # Closed early by the consumer, the driver is still usable
+            broken = False
+            raise
+        finally:
+            if broken:
+                pool.release(driver, pages=0, broken=True)
+            else:
+                pool.release(driver, pages=max(pages, 1))
+
+    @staticmethod
+    def _collect(result: core.ScrapeResult,
+                 pages: Iterable[core.ScrapePage]) -> core.ScrapeResult:
+        """Add all pages to the result."""
+        for page in pages:
+            result.add_page(page)
+        return result
+
+    def _iter_with_driver(self, driver: RemoteWebDriver,
+                          result: core.ScrapeResult
+                          ) -> Generator[core.ScrapePage, None, None]:
+        """Yield the pages scraped using Selenium with Chrome."""
         # No Default Waiting Condition = wait for load timeout
         wait_conditions = []
 
@@ -235,8 +889,24 @@ class SeleniumChromeScraper(core.Scraper):
         if self.config.page_load_wait > 0:
             driver.set_page_load_timeout(self.config.page_load_wait)
 
+        with browser_resources.blocked_urls(
+                driver, browser_resources.blocked_url_patterns(
+                    self.config.resource_policy)):
+            yield from self._iter_driver_pages(
+                driver, result, wait_conditions, next_button_condition)
+
+    def _iter_driver_pages(self, driver: RemoteWebDriver,
+                           result: core.ScrapeResult,
+                           wait_conditions: List[WaitCondition],
+                           next_button_condition: Optional[WaitCondition]
+                           ) -> Generator[core.ScrapePage, None, None]:
+        """Yield the page of the url and the following pages."""
+        count = 0
+        # Each page is timed from the navigation to its page source
+        phase_timer = timing.PhaseTimer()
         try:
-            driver.get(self.config.url)
+            with phase_timer.phase(timing.PHASE_NAVIGATION):
+                driver.get(self.config.url)
         except WebDriverException as error:
             result.status = core.ScrapeStatus.ERROR
             result.error_msg = F'EXCEPTION: {type(error).__name__} - {error}'
@@ -246,28 +916,27 @@ class SeleniumChromeScraper(core.Scraper):
 
                 # Initialize the Scraper Wait object for each iteration / page,
                 # because it stores found elements
-                scraper_wait = ScraperWait(wait_conditions)
+                scraper_wait = ScraperWait(
+                    wait_conditions, strategy=self.config.wait_strategy)
 
                 # SOME PAGE LOAD INFO AND TIPS if there are issues
                 # http://www.obeythetestinggoat.com/how-to-get-selenium-to-wait-for-page-load-after-a-click.html
 
                 try:
                     if wait_conditions:
-                        WebDriverWait(
-                            driver,
-                            self.config.request_timeout).until(scraper_wait)
+                        self._wait(driver, scraper_wait, phase_timer)
                 except TimeoutException as error:
                     result.status = core.ScrapeStatus.TIMEOUT
-                    result.add_scrape_page(driver.page_source,
-                                           status=core.ScrapeStatus.TIMEOUT)
                     result.error_msg =\
                         F'EXCEPTION: {type(error).__name__} - {error}'
+                    yield self._capture_page(driver, phase_timer,
+                                             core.ScrapeStatus.TIMEOUT)
                     break
                 else:
                     result.status = core.ScrapeStatus.SUCCESS
 
-                    result.add_scrape_page(driver.page_source,
-                                           status=core.ScrapeStatus.SUCCESS)
+                    yield self._capture_page(driver, phase_timer,
+                                             core.ScrapeStatus.SUCCESS)
 
                     if count >= self.config.max_pages:
                         logger.debug(F'Paging limit of {self.config.max_pages}'
@@ -281,11 +950,61 @@ class SeleniumChromeScraper(core.Scraper):
                         next_elem = scraper_wait.found_elements[
                             next_button_condition.key]
 
-                        next_elem.click()
+                        phase_timer = timing.PhaseTimer()
+                        with phase_timer.phase(timing.PHASE_NAVIGATION):
+                            next_elem.click()
                     else:
                         break
 
-        return result
+    def _wait(self, driver: RemoteWebDriver, scraper_wait: ScraperWait,
+              phase_timer: timing.PhaseTimer) -> None:
+        """Wait for the conditions, raise TimeoutException if not met."""
+        with phase_timer.phase(timing.PHASE_WAIT):
+            try:
+                timeout = self.config.request_timeout
+                if self.config.wait_strategy == core.WaitStrategy.OBSERVE:
+                    start_ns = time.perf_counter_ns()
+                    if scraper_wait.observe(
+                            driver, timeout, self.config.wait_poll_frequency):
+                        return
+                    # Poll for the rest of the timeout
+                    timeout = max(
+                        timeout - timing.elapsed_ms(start_ns) / 1000, 0)
+
+                WebDriverWait(
+                    driver, timeout,
+                    poll_frequency=self.config.wait_poll_frequency).until(
+                        scraper_wait)
+            finally:
+                metrics.get_default_metrics().observe(
+                    metrics.SELENIUM_WAIT_POLLS, scraper_wait.polls)
+
+    def _capture_page(self, driver: RemoteWebDriver,
+                      phase_timer: timing.PhaseTimer,
+                      status: core.ScrapeStatus) -> core.ScrapePage:
+        """Capture the current page of the driver with its timings.
+
+        Only the extracted elements are pulled from the browser if the page
+        source is not included, which serializes the whole page.
+        """
+        html = ''
+        if self.config.include_page_source:
+            with phase_timer.phase(timing.PHASE_PAGE_SOURCE):
+                html = driver.page_source
+
+        extracts = None
+        if self.config.extract_elem_list:
+            with phase_timer.phase(timing.PHASE_EXTRACT):
+                extracts = extract_elements(driver,
+                                            self.config.extract_elem_list)
+
+        page = core.ScrapePage(html)
+        page.request_time_ms = phase_timer.total_ms()
+        page.timings = dict(phase_timer.phases)
+        if extracts:
+            page.extracts = extracts
+        page.status = status
+        return page
 
 
 def get_by_type_from_page_wait_element(
@@ -293,5 +1012,46 @@ def get_by_type_from_page_wait_element(
     """Convert WaitForPageType to Selenium By Type."""
     if wait_element == core.WaitForPageType.XPATH:
         return By.XPATH
+    if wait_element == core.WaitForPageType.CSS:
+        return By.CSS_SELECTOR
 
     raise ValueError(F'Wait Element "{wait_element}" not supported')
+
+
+def extract_elements(driver: RemoteWebDriver,
+                     elems: List[core.WaitForPageElem]
+                     ) -> Dict[core.ExtractKey, List[core.ExtractedElem]]:
+    """Extract the elements matching each locator in a single script.
+
+    The elements are keyed by the key of their locator.
+    """
+    matches = driver.execute_script(
+        browser_scripts.EXTRACT_ELEMENTS_SCRIPT,
+        [[get_by_type_from_page_wait_element(elem.wait_type), elem.wait_text]
+         for elem in elems])
+
+    extracts: Dict[core.ExtractKey, List[core.ExtractedElem]] = {}
+    for elem, elem_matches in zip(elems, matches):
+        if elem_matches is None:
+            logger.warning(F'Invalid locator "{elem.wait_text}", '
+                           F'nothing extracted')
+            elem_matches = []
+        extracts[elem.key] = [core.ExtractedElem(html, text)
+                              for html, text in elem_matches]
+    return extracts
+
+
+def requires_launch_options(config: core.ScrapeConfig, *,
+                            proxy_set: bool = False) -> bool:
+    """Check if Chrome needs to be launched for the config.
+
+    Proxies, the user agent, the page load strategy and allowed hosts are
+    launch options, pooled drivers can't be used for them. The proxies of
+    the config are ignored if proxy_set, as for drivers pooled per proxy.
+    """
+    return bool(
+        ((not proxy_set) and (config.proxy_http or config.proxy_https)) or
+        config.useragent or (config.useragent_provider is not None) or
+        (config.page_load_strategy != core.PageLoadStrategy.NORMAL) or
+        ((config.resource_policy is not None) and
+         (config.resource_policy.allowed_hosts is not None)))
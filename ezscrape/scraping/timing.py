@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""Module providing monotonic timing of the phases of a scrape."""
+
+import contextlib
+import time
+
+from typing import Dict, Iterator, Optional
+
+# Phases of a http request, dns, connect and tls are only measured if a
+# new connection is opened
+PHASE_DNS = 'dns'
+PHASE_CONNECT = 'connect'
+PHASE_TLS = 'tls'
+PHASE_TTFB = 'ttfb'
+PHASE_DOWNLOAD = 'download'
+PHASE_DECODE = 'decode'
+
+# Phases of a browser scrape
+PHASE_NAVIGATION = 'navigation'
+PHASE_WAIT = 'wait'
+PHASE_PAGE_SOURCE = 'page_source'
+PHASE_EXTRACT = 'extract'
+
+PhaseTimings = Dict[str, float]
+
+
+def elapsed_ms(start_ns: int) -> float:
+    """Get the milliseconds passed since the time.perf_counter_ns start."""
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
+
+class PhaseTimer():
+    """Measure the duration of named phases in milliseconds.
+
+    The clock is time.perf_counter_ns, monotonic and unaffected by changes
+    of the system time. Phases measured more than once are added up.
+    """
+
+    def __init__(self, start_ns: Optional[int] = None):
+        """Initialize the Phase Timer, start now if no start is given."""
+        if start_ns is None:
+            start_ns = time.perf_counter_ns()
+        self.start_ns = start_ns
+        self.phases: PhaseTimings = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager to measure a phase, also if it raises."""
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, elapsed_ms(start_ns))
+
+    def add(self, name: str, duration_ms: float) -> None:
+        """Add the duration to the phase."""
+        self.phases[name] = self.phases.get(name, 0.0) + duration_ms
+
+    def update(self, phases: PhaseTimings) -> None:
+        """Add the durations of the phases measured elsewhere."""
+        for name, duration_ms in phases.items():
+            self.add(name, duration_ms)
+
+    def total_ms(self) -> float:
+        """Get the milliseconds passed since the timer started."""
+        return elapsed_ms(self.start_ns)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+"""Module providing an instrumented transport for the requests module.
+
+The connections measure the dns, connect, tls and time to first byte
+phases of each request and record their addresses once when connecting,
+the adapter installs them for requests sessions. Hosts can be resolved
+through a dns cache.
+"""
+
+import dataclasses
+import logging
+import socket
+import time
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Type
+
+import requests
+import requests.adapters
+import urllib3.connection
+import urllib3.connectionpool
+import urllib3.exceptions
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.timing as timing
+
+if TYPE_CHECKING:
+    # pylint: disable=cyclic-import
+    import ezscrape.scraping.dnscache as dnscache  # noqa: F401
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+def resolve(host: str, port: int) -> List[str]:
+    """Resolve the host to its addresses in the order to connect to."""
+    addresses: List[str] = []
+    for *_, sockaddr in socket.getaddrinfo(host, port,
+                                           type=socket.SOCK_STREAM):
+        address = str(sockaddr[0])
+        if address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+class TimedHTTPConnection(urllib3.connection.HTTPConnection):
+    """Http connection measuring the phases of the requests sent over it.
+
+    The phases are collected while connecting and handed over to
+    last_timings once the response headers arrived, reused connections
+    only measure the time to first byte. Likewise last_info has the info
+    of the socket, recorded once when connecting.
+
+    Hosts are resolved through the dns_cache if the class has one.
+    """
+
+    dns_cache: Optional['dnscache.DnsCache'] = None
+
+    def __init__(self, *args, **kwargs):  # type: ignore
+        """Initialize the connection without timings."""
+        super().__init__(*args, **kwargs)
+        self.timings: timing.PhaseTimings = {}
+        self.last_timings: timing.PhaseTimings = {}
+        self.info: Optional[core.ConnectionInfo] = None
+        self.last_info: Optional[core.ConnectionInfo] = None
+        self._responses = 0
+
+    def _new_conn(self) -> socket.socket:
+        """Resolve and connect, each address until one connects."""
+        # pylint: disable=attribute-defined-outside-init
+        host = self._dns_host
+        start_ns = time.perf_counter_ns()
+        try:
+            addresses = self._resolve(host)
+        except socket.gaierror as error:
+            if self.dns_cache is None:
+                # Let urllib3 raise its own error for the failed lookup
+                return super()._new_conn()
+            raise urllib3.exceptions.NewConnectionError(
+                self, F'Failed to resolve "{host}": {error}') from error
+        self._add_phase(timing.PHASE_DNS, timing.elapsed_ms(start_ns))
+
+        start_ns = time.perf_counter_ns()
+        try:
+            for idx, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                except (urllib3.exceptions.NewConnectionError,
+                        urllib3.exceptions.ConnectTimeoutError):
+                    if idx == len(addresses) - 1:
+                        raise
+                else:
+                    self._record_socket(sock)
+                    return sock
+        finally:
+            self._dns_host = host
+            self._add_phase(timing.PHASE_CONNECT,
+                            timing.elapsed_ms(start_ns))
+        raise urllib3.exceptions.NewConnectionError(
+            self, F'No address found for "{host}"')
+
+    def getresponse(self, *args, **kwargs):  # type: ignore
+        """Wait for the response headers, measured as time to first byte."""
+        start_ns = time.perf_counter_ns()
+        try:
+            resp = super().getresponse(*args, **kwargs)
+        except TypeError:
+            # urllib3 < 1.26 tries buffering=True first, only supported by
+            # Python 2, and calls again without it, no response yet
+            if 'buffering' not in kwargs:
+                self._finish_response(start_ns)
+            raise
+        except BaseException:
+            self._finish_response(start_ns)
+            raise
+        self._finish_response(start_ns)
+        return resp
+
+    def _finish_response(self, start_ns: int) -> None:
+        """Hand over the timings and info once per response."""
+        self._add_phase(timing.PHASE_TTFB, timing.elapsed_ms(start_ns))
+        self.last_timings = self.timings
+        self.timings = {}
+        if self.info is not None:
+            self.last_info = dataclasses.replace(
+                self.info, reused=self._responses > 0)
+        self._responses += 1
+
+    def _resolve(self, host: str) -> List[str]:
+        """Resolve the host, through the dns cache if there is one."""
+        if self.dns_cache is None:
+            return resolve(host, self.port)
+        return self.dns_cache.resolve(host, self.port)
+
+    def _record_socket(self, sock: socket.socket) -> None:
+        """Record the addresses of the newly connected socket."""
+        # pylint: disable=attribute-defined-outside-init
+        self._responses = 0
+        try:
+            self.info = core.ConnectionInfo(
+                peer_ip=str(sock.getpeername()[0]),
+                local_ip=str(sock.getsockname()[0]))
+        except OSError as error:
+            self.info = None
+            logger.debug(F'Socket addresses not available: {error}')
+
+    def _add_phase(self, name: str, duration_ms: float) -> None:
+        """Add the duration to the phase of the current request."""
+        self.timings[name] = self.timings.get(name, 0.0) + duration_ms
+
+
+class TimedHTTPSConnection(TimedHTTPConnection,
+                           urllib3.connection.HTTPSConnection):
+    """Https connection also measuring the tls handshake."""
+
+    def connect(self) -> None:
+        """Connect and measure the handshake, also through a proxy tunnel."""
+        connect_ms = self._connect_ms()
+        start_ns = time.perf_counter_ns()
+        try:
+            super().connect()
+        finally:
+            # The dns and connect phases are measured by _new_conn()
+            connect_ms = self._connect_ms() - connect_ms
+            self._add_phase(timing.PHASE_TLS, max(
+                timing.elapsed_ms(start_ns) - connect_ms, 0.0))
+
+        # Also for tls in tls through a https proxy
+        if (self.info is not None) and hasattr(self.sock, 'version'):
+            self.info.tls_version = self.sock.version()
+
+    def _connect_ms(self) -> float:
+        """Get the dns and connect time of the current request."""
+        return (self.timings.get(timing.PHASE_DNS, 0.0) +
+                self.timings.get(timing.PHASE_CONNECT, 0.0))
+
+
+class TimedHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
+    """Connection pool using instrumented http connections."""
+
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(urllib3.connectionpool.HTTPSConnectionPool):
+    """Connection pool using instrumented https connections."""
+
+    ConnectionCls = TimedHTTPSConnection
+
+
+PoolClasses = Dict[str, Type[urllib3.connectionpool.HTTPConnectionPool]]
+
+TIMED_POOL_CLASSES: PoolClasses = {'http': TimedHTTPConnectionPool,
+                                   'https': TimedHTTPSConnectionPool}
+
+
+def timed_pool_classes(
+        cache: Optional['dnscache.DnsCache'] = None) -> PoolClasses:
+    """Get the instrumented pool classes resolving through the cache."""
+    if cache is None:
+        return TIMED_POOL_CLASSES
+
+    # Connections are created by the pools without extra arguments
+    pool_classes: PoolClasses = {}
+    for scheme, pool_cls in TIMED_POOL_CLASSES.items():
+        connection_cls = type(pool_cls.ConnectionCls.__name__,
+                              (pool_cls.ConnectionCls,), {'dns_cache': cache})
+        pool_classes[scheme] = type(pool_cls.__name__, (pool_cls,),
+                                    {'ConnectionCls': connection_cls})
+    return pool_classes
+
+
+class TimedHTTPAdapter(requests.adapters.HTTPAdapter):
+    """Transport adapter using instrumented connections.
+
+    Hosts are resolved through the dns_cache if given. SOCKS proxies keep
+    the connections of urllib3 and are not measured.
+    """
+
+    def __init__(self, *args,  # type: ignore
+                 dns_cache: Optional['dnscache.DnsCache'] = None,
+                 **kwargs):
+        """Initialize the adapter, resolving through the dns cache."""
+        # Needed by init_poolmanager() called by the base class
+        self.pool_classes = timed_pool_classes(dns_cache)
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):  # type: ignore
+        """Create the pool manager with instrumented connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self.pool_classes
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):  # type: ignore
+        """Get the proxy manager with instrumented connection pools."""
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if not proxy.lower().startswith('socks'):
+            manager.pool_classes_by_scheme = self.pool_classes
+        return manager
+
+
+def response_timings(resp: requests.Response) -> timing.PhaseTimings:
+    """Get the measured phases of the streamed response.
+
+    Only available until the body is read and the connection released.
+    """
+    connection = getattr(resp.raw, 'connection', None)
+    return dict(getattr(connection, 'last_timings', {}))
+
+
+def response_connection(
+        resp: requests.Response) -> Optional[core.ConnectionInfo]:
+    """Get the info of the connection of the streamed response.
+
+    Only available until the body is read and the connection released,
+    None for connections not made by the instrumented transport.
+    """
+    connection = getattr(resp.raw, 'connection', None)
+    return getattr(connection, 'last_info', None)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+"""Module classifying urls as local or public by their host.
+
+Hosts are parsed once per url and classified once per host, addresses are
+looked up in tables of networks by bisecting their sorted ranges.
+"""
+
+import bisect
+import enum
+import functools
+import ipaddress
+import urllib.parse
+
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+IpAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+DEFAULT_CACHE_SIZE = 65536
+
+# Host names and shorthand addresses handled as local
+SPECIAL_LOCAL_ADDRESSES = [
+    'localhost',
+    '0.0',
+    '127.1'
+]
+
+# The networks the ipaddress module handles as private
+DEFAULT_LOCAL_NETWORKS = [
+    '0.0.0.0/8',
+    '10.0.0.0/8',
+    '127.0.0.0/8',
+    '169.254.0.0/16',
+    '172.16.0.0/12',
+    '192.0.0.0/29',
+    '192.0.0.170/31',
+    '192.0.2.0/24',
+    '192.168.0.0/16',
+    '198.18.0.0/15',
+    '198.51.100.0/24',
+    '203.0.113.0/24',
+    '240.0.0.0/4',
+    '255.255.255.255/32',
+    '::1/128',
+    '::/128',
+    '::ffff:0:0/96',
+    '100::/64',
+    '2001::/23',
+    '2001:db8::/32',
+    '2001:10::/28',
+    'fc00::/7',
+    'fe80::/10'
+]
+
+
+@enum.unique
+class UrlClass(enum.Enum):
+    """Class of the url by its host."""
+
+    # pylint: disable=invalid-name
+    LOCAL = 'Local'
+    PUBLIC = 'Public'
+    NAME = 'Name'
+    INVALID = 'Invalid'
+
+
+@functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def url_host(url: str) -> str:
+    """Get the lowercase host of the url, also without a scheme.
+
+    Ipv6 addresses are returned without brackets, blank if no host.
+    """
+    if ('://' not in url) and (not url.startswith('//')):
+        url = '//' + url
+
+    try:
+        hostname = urllib.parse.urlsplit(url).hostname
+    except ValueError:
+        # E.g. unbalanced brackets
+        return ''
+    return hostname.rstrip('.') if hostname else ''
+
+
+class AddressTable():
+    """Table of networks looked up by bisecting their sorted ranges.
+
+    Overlapping and adjacent networks are merged into one range.
+    """
+
+    def __init__(self, networks: Iterable[str]):
+        """Initialize the table from the networks in cidr notation."""
+        ranges: Dict[int, List[Tuple[int, int]]] = {4: [], 6: []}
+        for network in networks:
+            parsed = ipaddress.ip_network(network, strict=False)
+            ranges[parsed.version].append(
+                (int(parsed.network_address),
+                 int(parsed.broadcast_address)))
+
+        self._starts: Dict[int, List[int]] = {}
+        self._ends: Dict[int, List[int]] = {}
+        for version, version_ranges in ranges.items():
+            self._starts[version] = []
+            self._ends[version] = []
+            for start, end in sorted(version_ranges):
+                ends = self._ends[version]
+                if ends and (start <= ends[-1] + 1):
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    self._starts[version].append(start)
+                    ends.append(end)
+
+    def __contains__(self, address: object) -> bool:
+        if not isinstance(address, (ipaddress.IPv4Address,
+                                    ipaddress.IPv6Address)):
+            return False
+
+        value = int(address)
+        idx = bisect.bisect_right(self._starts[address.version], value) - 1
+        return (idx >= 0) and (value <= self._ends[address.version][idx])
+
+    def __len__(self) -> int:
+        return sum(len(starts) for starts in self._starts.values())
+
+
+class UrlClassifier():
+    """Classify urls by their host, memoised per host.
+
+    Addresses in the allow networks are local unless also in the deny
+    networks, the local_hosts are local by name.
+    """
+
+    def __init__(self, *, allow: Iterable[str] = tuple(DEFAULT_LOCAL_NETWORKS),
+                 deny: Iterable[str] = (),
+                 local_hosts: Iterable[str] = tuple(SPECIAL_LOCAL_ADDRESSES),
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """Initialize the classifier with its network tables."""
+        self.allow = AddressTable(allow)
+        self.deny = AddressTable(deny)
+        self.local_hosts = frozenset(host.lower() for host in local_hosts)
+        self.classify_host: Callable[[str], UrlClass] = functools.lru_cache(
+            maxsize=cache_size)(self._classify_host)
+
+    def classify(self, url: str) -> UrlClass:
+        """Classify the url by its host."""
+        return self.classify_host(url_host(url))
+
+    def classify_urls(self, urls: Iterable[str]) -> List[UrlClass]:
+        """Classify the urls, in the same order."""
+        classify_host = self.classify_host
+        return [classify_host(url_host(url)) for url in urls]
+
+    def is_local(self, url: str) -> bool:
+        """Check whether the host of the url is local."""
+        return self.classify(url) == UrlClass.LOCAL
+
+    def classify_address(self, address: IpAddress) -> UrlClass:
+        """Classify the address by the network tables."""
+        if isinstance(address, ipaddress.IPv6Address) and (
+                address.ipv4_mapped is not None):
+            address = address.ipv4_mapped
+
+        if (address in self.allow) and (address not in self.deny):
+            return UrlClass.LOCAL
+        return UrlClass.PUBLIC
+
+    def _classify_host(self, host: str) -> UrlClass:
+        """Classify the host, by name or address."""
+        if not host:
+            return UrlClass.INVALID
+        if host in self.local_hosts:
+            return UrlClass.LOCAL
+
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return UrlClass.NAME
+        return self.classify_address(address)
+
+
+DEFAULT_CLASSIFIER = UrlClassifier()
+
+
+def classify_urls(urls: Iterable[str]) -> List[UrlClass]:
+    """Classify the urls with the default classifier."""
+    return DEFAULT_CLASSIFIER.classify_urls(urls)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+"""Module providing user agents for the scrapers."""
+
+import itertools
+import logging
+import random
+import sys
+import threading
+
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+BROWSER_CHROME = 'chrome'
+BROWSER_FIREFOX = 'firefox'
+BROWSER_SAFARI = 'safari'
+BROWSER_EDGE = 'edge'
+
+DEFAULT_BROWSER_WEIGHTS = {
+    BROWSER_CHROME: 65,
+    BROWSER_SAFARI: 15,
+    BROWSER_EDGE: 12,
+    BROWSER_FIREFOX: 8
+}
+
+# Frozen list of common desktop user agents, used without network access
+BUNDLED_USERAGENTS: Tuple[Tuple[str, str], ...] = (
+    (BROWSER_CHROME,
+     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'),
+    (BROWSER_CHROME,
+     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'),
+    (BROWSER_CHROME,
+     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'),
+    (BROWSER_CHROME,
+     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'),
+    (BROWSER_CHROME,
+     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'),
+    (BROWSER_CHROME,
+     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'),
+    (BROWSER_CHROME,
+     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'),
+    (BROWSER_FIREFOX,
+     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) '
+     'Gecko/20100101 Firefox/125.0'),
+    (BROWSER_FIREFOX,
+     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) '
+     'Gecko/20100101 Firefox/124.0'),
+    (BROWSER_FIREFOX,
+     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:125.0) '
+     'Gecko/20100101 Firefox/125.0'),
+    (BROWSER_FIREFOX,
+     'Mozilla/5.0 (X11; Linux x86_64; rv:125.0) '
+     'Gecko/20100101 Firefox/125.0'),
+    (BROWSER_FIREFOX,
+     'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:124.0) '
+     'Gecko/20100101 Firefox/124.0'),
+    (BROWSER_SAFARI,
+     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 '
+     '(KHTML, like Gecko) Version/17.4.1 Safari/605.1.15'),
+    (BROWSER_SAFARI,
+     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 '
+     '(KHTML, like Gecko) Version/17.3.1 Safari/605.1.15'),
+    (BROWSER_SAFARI,
+     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 '
+     '(KHTML, like Gecko) Version/16.6 Safari/605.1.15'),
+    (BROWSER_EDGE,
+     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.0.0'),
+    (BROWSER_EDGE,
+     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36 Edg/123.0.0.0'),
+    (BROWSER_EDGE,
+     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+     '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.0.0')
+)
+
+
+class UserAgentStore():
+    """Read only store of user agents grouped by browser family."""
+
+    def __init__(self, useragents: Iterable[Tuple[str, str]]):
+        """Initialize the store from (browser family, user agent) pairs."""
+        grouped: Dict[str, List[str]] = {}
+        for family, agent in useragents:
+            # Many identical strings are shared instead of copied
+            grouped.setdefault(family.lower(), []).append(sys.intern(agent))
+
+        self._agents: Dict[str, Tuple[str, ...]] = {
+            family: tuple(agents) for family, agents in grouped.items()}
+
+    @property
+    def families(self) -> Tuple[str, ...]:
+        """Property to get the browser families in the store."""
+        return tuple(self._agents)
+
+    def agents(self, family: str) -> Tuple[str, ...]:
+        """Get all user agents of the browser family."""
+        return self._agents.get(family.lower(), ())
+
+    def __len__(self) -> int:
+        return sum(len(agents) for agents in self._agents.values())
+
+
+class UserAgentProvider():
+    """Base Class for providing user agents."""
+
+    # pylint: disable=too-few-public-methods
+
+    def get(self) -> str:
+        """Get a user agent."""
+        raise NotImplementedError
+
+
+class StaticUserAgentProvider(UserAgentProvider):
+    """Provide always the same user agent."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, useragent: str):
+        """Initialize the provider with the user agent."""
+        self.useragent = useragent
+
+    def get(self) -> str:
+        """Get the user agent."""
+        return self.useragent
+
+
+class WeightedUserAgentProvider(UserAgentProvider):
+    """Provide random user agents, picking the browser family by weight."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, weights: Optional[Mapping[str, float]] = None, *,
+                 store: Optional[UserAgentStore] = None):
+        """Initialize the provider.
+
+        Families missing from the store are ignored, families in the store
+        without a weight are never picked.
+        """
+        if weights is None:
+            weights = DEFAULT_BROWSER_WEIGHTS
+        if store is None:
+            store = get_default_store()
+        self._store = store
+
+        self._families: List[str] = []
+        family_weights: List[float] = []
+        for family, weight in weights.items():
+            if (weight > 0) and store.agents(family):
+                self._families.append(family)
+                family_weights.append(weight)
+
+        if not self._families:
+            raise ValueError('No user agents available for the weights')
+
+        self._cum_weights = list(itertools.accumulate(family_weights))
+
+    def get(self) -> str:
+        """Get a random user agent."""
+        # Not used for security purposes
+        family = random.choices(  # nosec
+            self._families, cum_weights=self._cum_weights)[0]
+        return random.choice(self._store.agents(family))  # nosec
+
+
+class FakeUserAgentProvider(UserAgentProvider):
+    """Provide random user agents from the fake_useragent database.
+
+    The database is loaded once on first use. If it cannot be loaded,
+    e.g. when offline, the bundled user agents are used instead.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self) -> None:
+        """Initialize the provider."""
+        self._get_agent: Optional[Callable[[], str]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """Get a random user agent."""
+        get_agent = self._get_agent
+        if get_agent is None:
+            get_agent = self._load()
+        return get_agent()
+
+    def _load(self) -> Callable[[], str]:
+        """Load the fake_useragent database or set up the fallback."""
+        with self._lock:
+            if self._get_agent is None:
+                # pylint: disable=import-outside-toplevel,broad-except
+                try:
+                    import fake_useragent
+                    database = fake_useragent.UserAgent()
+                except Exception as error:
+                    logger.warning(F'Loading fake_useragent failed, use the '
+                                   F'bundled user agents: {error}')
+                    self._get_agent = WeightedUserAgentProvider().get
+                else:
+                    self._get_agent = lambda: str(database.random)
+            return self._get_agent
+
+
+_DEFAULT_STORE: Optional[UserAgentStore] = None
+_DEFAULT_PROVIDER: Optional[UserAgentProvider] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_store() -> UserAgentStore:
+    """Get the store with the bundled user agents, load it on first use."""
+    global _DEFAULT_STORE  # pylint: disable=global-statement
+    if _DEFAULT_STORE is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT_STORE is None:
+                _DEFAULT_STORE = UserAgentStore(BUNDLED_USERAGENTS)
+    return _DEFAULT_STORE
+
+
+def get_default_provider() -> UserAgentProvider:
+    """Get the process wide user agent provider."""
+    global _DEFAULT_PROVIDER  # pylint: disable=global-statement
+    if _DEFAULT_PROVIDER is None:
+        store = get_default_store()
+        with _DEFAULT_LOCK:
+            if _DEFAULT_PROVIDER is None:
+                _DEFAULT_PROVIDER = WeightedUserAgentProvider(store=store)
+    return _DEFAULT_PROVIDER
+
+
+def set_default_provider(provider: Optional[UserAgentProvider]) -> None:
+    """Set the process wide user agent provider, None resets the default."""
+    global _DEFAULT_PROVIDER  # pylint: disable=global-statement
+    with _DEFAULT_LOCK:
+        _DEFAULT_PROVIDER = provider
+
+
+def get_useragent(provider: Optional[UserAgentProvider] = None) -> str:
+    """Get a user agent from the provider or the default provider."""
+    if provider is None:
+        provider = get_default_provider()
+    return provider.get()
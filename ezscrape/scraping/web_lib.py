@@ -2,12 +2,33 @@
 
 """Module providing misc web related functionality."""
 
+import codecs
 import http
+import re
 import urllib.parse
 
 from dataclasses import dataclass
+from typing import Optional
 
-import fake_useragent
+import requests
+
+import ezscrape.scraping.useragent as useragent
+
+# Only the start of the document is searched for a meta charset
+META_SNIFF_BYTES = 1024
+# Guessing the encoding of a sample is much faster than of the whole page
+DETECT_SAMPLE_BYTES = 64 * 1024
+
+# The codecs remove the byte order mark when decoding
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+# Matches <meta charset="..."> and the http-equiv content form
+_META_CHARSET_RE = re.compile(
+    rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.-]+)', re.IGNORECASE)
 
 
 @dataclass
@@ -20,8 +41,8 @@ class UrlSplit:
 
 
 def random_useragent() -> str:
-    """Generate a generic user agent."""
-    return fake_useragent.UserAgent().random  # type: ignore
+    """Generate a generic user agent from the default provider."""
+    return useragent.get_useragent()
 
 
 def phrase_from_response_code(code: int) -> str:
@@ -40,3 +61,76 @@ def split_url(url: str) -> UrlSplit:
     return UrlSplit(scheme=result.scheme,
                     hostname=result.hostname,  # type: ignore
                     port=result.port)  # type: ignore
+
+
+def lookup_encoding(name: Optional[str]) -> Optional[str]:
+    """Get the normalized codec name, None if not a known encoding."""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def encoding_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """Get the charset declared in a Content-Type header."""
+    if not content_type:
+        return None
+
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset':
+            return lookup_encoding(value.strip().strip('"\''))
+    return None
+
+
+def bom_encoding(content: bytes) -> Optional[str]:
+    """Get the encoding from the byte order mark."""
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    return None
+
+
+def meta_encoding(content: bytes) -> Optional[str]:
+    """Get the encoding from a meta charset tag at the start of the page."""
+    match = _META_CHARSET_RE.search(content[:META_SNIFF_BYTES])
+    if match:
+        return lookup_encoding(match.group(1).decode('ascii'))
+    return None
+
+
+def detect_encoding(content: bytes,
+                    declared_encoding: Optional[str] = None) -> str:
+    """Get the encoding of the content.
+
+    A byte order mark takes precedence over the declared encoding, then
+    the meta charset is used. A sample that is valid utf-8 is utf-8,
+    only otherwise the encoding is guessed from it.
+    """
+    encoding = (bom_encoding(content) or
+                lookup_encoding(declared_encoding) or
+                meta_encoding(content))
+    if encoding:
+        return encoding
+
+    sample = content[:DETECT_SAMPLE_BYTES]
+    if _is_utf8(sample):
+        return 'utf-8'
+
+    chardet = requests.compat.chardet
+    if chardet is not None:
+        encoding = lookup_encoding(chardet.detect(sample)['encoding'])
+    return encoding or 'utf-8'
+
+
+def _is_utf8(sample: bytes) -> bool:
+    """Check if the sample is utf-8, it may end within a character."""
+    if sample.isascii():
+        return True
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+import requests
+
+import benchmarks.run_benchmarks as run_benchmarks
+import benchmarks.server as bench_server
+
+
+@pytest.fixture(scope='module')
+def server():
+    with bench_server.BenchmarkServer() as server:
+        yield server
+
+
+PERCENTILES = [
+    ([], 50, 0),
+    ([5], 99, 5),
+    ([1, 2, 3, 4], 50, 2.5),
+    ([4, 3, 2, 1], 0, 1),
+    ([1, 2, 3, 4], 100, 4)
+]
+@pytest.mark.parametrize('values, percent, expected', PERCENTILES)
+def test_percentile(values, percent, expected):
+    assert run_benchmarks.percentile(values, percent) == expected
+
+
+def test_page_body_size():
+    assert len(bench_server.page_body(5000)) == 5000
+    assert bench_server.page_body(0).startswith(b'<html>')
+
+
+def test_server_page(server):
+    resp = requests.get(server.page_url(size=10000, drip_ms=1, chunk_bytes=4000))
+
+    assert resp.status_code == 200
+    assert len(resp.content) == 10000
+
+
+def test_server_error_rate(server):
+    assert requests.get(server.page_url(error_rate=1)).status_code == 500
+
+
+def test_server_latency(server):
+    resp = requests.get(server.page_url(latency_ms=50))
+    assert resp.elapsed.total_seconds() >= 0.05
+
+
+def test_server_files(server):
+    resp = requests.get(server.file_url('SinglePageNoJS.html'))
+
+    assert resp.status_code == 200
+    assert 'NON-Javascript Line' in resp.text
+
+
+def test_run_benchmark(server):
+    benchmark = run_benchmarks.Benchmark(
+        'small', server.page_url(),
+        run_benchmarks.sequential_runner(run_benchmarks.scraper.scrape_url), 3)
+    result = run_benchmarks.run_benchmark(benchmark, memory_iterations=2)
+
+    assert result.statuses == {'SUCCESS': 3}
+    assert 0 < result.latency_ms['min'] <= result.latency_ms['p50'] <= result.latency_ms['max']
+    assert result.throughput_per_s > 0
+    assert result.memory_kib_per_scrape['peak'] > 0
+
+
+def test_compare_results():
+    def _result(name, p50, throughput):
+        return run_benchmarks.BenchmarkResult(
+            name, 10, 1, 1, throughput, latency_ms={'p50': p50})
+
+    lines = run_benchmarks.compare_results(
+        [_result('a', 10, 100), _result('b', 1, 1)], {'a': _result('a', 20, 50)})
+
+    assert lines == ['a: p50 20 -> 10 (-50.0%), throughput 50 -> 100 (+100.0%)',
+                     'b: no baseline']
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / 'results.json'
+    assert run_benchmarks.main(['--iterations', '2', '--filter', 'requests_small',
+                                '--output', str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    assert [result['name'] for result in results['results']] == ['requests_small']
+    assert results['metadata']['python']
+    assert set(results['import_ms']) == set(run_benchmarks.IMPORT_MODULES)
+
+
+def test_measure_import_ms():
+    assert run_benchmarks.measure_import_ms('json', runs=1) > 0
+
+
+def test_main_import_over_budget():
+    assert run_benchmarks.main(['--filter', 'no benchmark',
+                                '--import-budget-ms', '0']) == 1
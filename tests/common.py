@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
+import http.server
+import threading
 import urllib.parse
 
-from typing import Type
+from typing import Dict, List, Tuple, Type
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
@@ -46,3 +48,76 @@ def whatsmyip_ip_from_html(url: str, html: str) -> str:
         return found_ip.string
     else:
         return ''
+
+
+class SequenceServer():
+    """Local http server answering with the given responses in turn.
+
+    Each response is (status code, headers, body), the last response is
+    repeated once all others are used. HEAD requests are only answered if
+    head is set.
+    """
+
+    def __init__(self, responses: List[Tuple[int, Dict[str, str], bytes]],
+                 head: bool = False):
+        self.responses = responses
+        self.request_count = 0
+        self.connection_count = 0
+        # The method and headers of each request
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self._lock = threading.Lock()
+
+        sequence_server = self
+
+        class _Handler(http.server.BaseHTTPRequestHandler):
+            # Keep connections alive like most servers
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with sequence_server._lock:
+                    sequence_server.connection_count += 1
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            if head:
+                def do_HEAD(self):
+                    self._respond(send_body=False)
+
+            def _respond(self, send_body):
+                sequence_server.requests.append((self.command, dict(self.headers)))
+                status, headers, body = sequence_server.next_response()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return F'http://127.0.0.1:{self._server.server_address[1]}/page.html'
+
+    def next_response(self) -> Tuple[int, Dict[str, str], bytes]:
+        with self._lock:
+            idx = min(self.request_count, len(self.responses) - 1)
+            self.request_count += 1
+            return self.responses[idx]
+
+    def __enter__(self) -> 'SequenceServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._server.shutdown()
+        self._server.server_close()
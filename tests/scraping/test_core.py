@@ -2,6 +2,8 @@ import pytest
 
 import ezscrape.scraping.core as core
 import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.timing as timing
+import ezscrape.scraping.useragent as useragent
 
 
 
@@ -70,8 +72,20 @@ def test_scrape_config_default_values_set():
     assert not config.proxy_http
     assert not config.proxy_https
     assert config.useragent is None
+    assert config.useragent_provider is None
     assert not config.wait_for_elem_list
     assert config.next_button == None
+    assert config.cache_policy is None
+    assert config.rate_limiter is None
+    assert config.retry_policy is None
+    assert config.max_body_bytes == 0
+    assert config.chunk_size == core.DEFAULT_CHUNK_SIZE
+    assert config.page_content == core.PageContent.FULL
+    assert config.wait_strategy == core.WaitStrategy.SCRIPT
+    assert config.wait_poll_frequency == core.DEFAULT_WAIT_POLL_FREQUENCY
+    assert config.page_load_strategy == core.PageLoadStrategy.NORMAL
+    assert config.resource_policy is None
+    assert config.pagination is None
 
 
 @pytest.mark.parametrize('invalid_url', [None, '', 15])
@@ -84,6 +98,29 @@ def test_scrape_config_set_invalid_url(invalid_url):
         valid_config.url = invalid_url
 
 
+def test_scrape_config_get_useragent():
+    config = core.ScrapeConfig('url')
+    assert config.get_useragent()
+
+    config.useragent_provider = useragent.StaticUserAgentProvider('provider-agent')
+    assert config.get_useragent() == 'provider-agent'
+
+    config.useragent = 'config-agent'
+    assert config.get_useragent() == 'config-agent'
+
+
+def test_scrape_config_get_proxies():
+    config = core.ScrapeConfig('url')
+    assert config.get_proxies() == {}
+
+    config.proxy_http = 'http://proxy:8080'
+    assert config.get_proxies() == {'http': 'http://proxy:8080'}
+
+    config.proxy_https = 'http://proxy:8443'
+    assert config.get_proxies() == {'http': 'http://proxy:8080',
+                                    'https': 'http://proxy:8443'}
+
+
 def test_scrape_result_single_page_not_found():
     result = core.ScrapeResult('url')
     assert result.first_page is None
@@ -97,6 +134,131 @@ def test_scrape_result_single_page_found():
     assert result.first_page.html == 'html'
     assert result.first_page.request_time_ms == 15
     assert result.first_page.status == core.ScrapeStatus.SUCCESS
+    assert result.first_page.content == b'html'
+    assert result.first_page.chunks is None
+
+
+def test_scrape_result_page_content():
+    result = core.ScrapeResult('url')
+    chunks = iter([b'chunk'])
+    result.add_scrape_page(status=core.ScrapeStatus.SUCCESS, content=b'content')
+    result.add_scrape_page(status=core.ScrapeStatus.SUCCESS, chunks=chunks)
+
+    pages = list(result)
+    assert pages[0].content == b'content'
+    assert pages[0].html == 'content'
+    assert pages[1].chunks is chunks
+    assert pages[1].content is None
+    assert pages[1].html == ''
+
+
+PAGE_ENCODINGS = [
+    (None, '<html>caf\u00e9</html>'.encode('utf-8'), 'utf-8'),
+    ('latin-1', '<html>caf\u00e9</html>'.encode('latin-1'), 'iso8859-1'),
+    ('invalid-codec', '<html>caf\u00e9</html>'.encode('utf-8'), 'utf-8'),
+    (None, '<meta charset="windows-1252"><p>caf\u00e9</p>'.encode('cp1252'), 'cp1252')
+]
+@pytest.mark.parametrize('encoding, content, expected_encoding', PAGE_ENCODINGS)
+def test_scrape_page_decode_content(encoding, content, expected_encoding):
+    page = core.ScrapePage(content=content, encoding=encoding)
+
+    assert page.encoding == expected_encoding
+    assert 'caf\u00e9' in page.html
+    assert page.html is page.html  # Decoded only once
+
+
+def test_scrape_page_content_from_html():
+    page = core.ScrapePage('caf\u00e9')
+
+    assert page.content == 'caf\u00e9'.encode('utf-8')
+    assert page.encoding == 'utf-8'
+
+
+def test_scrape_result_not_from_cache():
+    result = core.ScrapeResult('url')
+    assert not result.from_cache
+    assert result.status_code == 0
+    assert result.attempts == []
+
+
+def test_retry_policy_backoff():
+    policy = core.RetryPolicy(backoff_base=0.5, backoff_cap=3, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1, 2, 3, 3]
+
+    policy.jitter = True
+    for attempt in range(1, 6):
+        assert 0 <= policy.backoff(attempt) <= min(0.5 * 2 ** (attempt - 1), 3)
+
+
+def _result(status, status_code=0):
+    result = core.ScrapeResult('url')
+    result.status = status
+    result.status_code = status_code
+    return result
+
+
+RETRY_DECISIONS = [
+    (core.ScrapeStatus.TIMEOUT, 0, 1, 1.0),
+    (core.ScrapeStatus.PROXY_ERROR, 0, 2, 2.0),
+    (core.ScrapeStatus.TIMEOUT, 0, 3, None),
+    (core.ScrapeStatus.ERROR, 503, 1, 1.0),
+    (core.ScrapeStatus.ERROR, 404, 1, None),
+    (core.ScrapeStatus.ERROR, 0, 1, None),
+    (core.ScrapeStatus.SUCCESS, 200, 1, None),
+    (core.ScrapeStatus.BODY_TOO_LARGE, 200, 1, None)
+]
+@pytest.mark.parametrize('status, status_code, attempt, delay', RETRY_DECISIONS)
+def test_retry_policy_next_delay(status, status_code, attempt, delay):
+    policy = core.RetryPolicy(max_attempts=3, backoff_base=1, jitter=False)
+    assert policy.next_delay(_result(status, status_code), attempt, elapsed=0) == delay
+
+
+def test_retry_policy_next_delay_retry_after_and_deadline():
+    policy = core.RetryPolicy(backoff_base=1, jitter=False, deadline=10)
+    result = _result(core.ScrapeStatus.ERROR, 429)
+
+    assert policy.next_delay(result, 1, elapsed=0, retry_after=5) == 5
+    assert policy.next_delay(result, 1, elapsed=0, retry_after=0.1) == 1
+    assert policy.next_delay(result, 1, elapsed=4, retry_after=6) is None
+    assert policy.next_delay(result, 1, elapsed=9.5) is None
+
+
+def test_retry_policy_next_delay_retry_after_capped():
+    policy = core.RetryPolicy(backoff_base=1, jitter=False, max_retry_after=60)
+    result = _result(core.ScrapeStatus.ERROR, 503)
+
+    assert policy.next_delay(result, 1, elapsed=0, retry_after=86400) == 60
+    assert policy.next_delay(result, 1, elapsed=0, retry_after=30) == 30
+    assert core.RetryPolicy(jitter=False).next_delay(
+        result, 1, elapsed=0, retry_after=86400) == core.DEFAULT_RETRY_MAX_RETRY_AFTER
+
+
+def test_retry_state_records_attempts():
+    retries = core.RetryState(core.RetryPolicy(max_attempts=2, backoff_base=0.25, jitter=False))
+
+    retries.start_attempt()
+    result1 = _result(core.ScrapeStatus.TIMEOUT)
+    result1.error_msg = 'timeout'
+    assert retries.finish_attempt(result1) == 0.25
+
+    retries.start_attempt()
+    result2 = _result(core.ScrapeStatus.TIMEOUT)
+    assert retries.finish_attempt(result2) is None
+
+    assert [attempt.status for attempt in result2.attempts] == [core.ScrapeStatus.TIMEOUT] * 2
+    assert result2.attempts[0].error_msg == 'timeout'
+    assert result2.attempts[0].wait_ms == 0
+    assert result2.attempts[1].wait_ms == 250
+    assert all(attempt.duration_ms >= 0 for attempt in result2.attempts)
+
+
+def test_retry_state_no_policy():
+    retries = core.RetryState(None)
+    retries.start_attempt()
+    result = _result(core.ScrapeStatus.TIMEOUT)
+
+    assert retries.finish_attempt(result) is None
+    assert len(result.attempts) == 1
 
 
 def test_scrape_result_no_pages():
@@ -136,6 +298,53 @@ def test_scrape_result_overall_request_time():
     assert result.request_time_ms == 800
 
 
+def test_scrape_result_overall_timings():
+    result = core.ScrapeResult('url')
+    result.add_scrape_page('html1', status=core.ScrapeStatus.SUCCESS, scrape_time=100,
+                           timings={timing.PHASE_NAVIGATION: 80, timing.PHASE_WAIT: 20})
+    result.add_scrape_page('html2', status=core.ScrapeStatus.SUCCESS, scrape_time=50,
+                           timings={timing.PHASE_NAVIGATION: 50})
+
+    assert result.first_page.timings == {timing.PHASE_NAVIGATION: 80, timing.PHASE_WAIT: 20}
+    assert result.timings == {timing.PHASE_NAVIGATION: 130, timing.PHASE_WAIT: 20}
+
+
+def test_scrape_page_decode_timing():
+    page = core.ScrapePage(content=b'<html></html>', encoding='utf-8')
+    assert timing.PHASE_DECODE not in page.timings
+
+    assert page.html == '<html></html>'
+    assert page.timings[timing.PHASE_DECODE] >= 0
+
+
+def test_scrape_result_page_extracts():
+    extracts = {core.WaitForCssElem('p').key: [core.ExtractedElem('<p>a</p>', 'a')]}
+    result = core.ScrapeResult('url')
+    result.add_scrape_page('', status=core.ScrapeStatus.SUCCESS, extracts=extracts)
+    result.add_scrape_page('<html></html>', status=core.ScrapeStatus.SUCCESS)
+
+    assert result.first_page.extracts == extracts
+    assert result.first_page.html == ''
+    assert list(result)[1].extracts == {}
+
+
+class TwoPageScraper(core.Scraper):
+    def scrape(self):
+        result = core.ScrapeResult(self.config.url)
+        result.add_scrape_page('<html>1</html>', status=core.ScrapeStatus.SUCCESS)
+        result.add_scrape_page('<html>2</html>', status=core.ScrapeStatus.SUCCESS)
+        result.status = core.ScrapeStatus.SUCCESS
+        return result
+
+
+def test_scraper_iter_pages_default():
+    with TwoPageScraper(core.ScrapeConfig('url')).iter_pages() as stream:
+        assert [page.html for page in stream] == ['<html>1</html>', '<html>2</html>']
+
+    assert stream.result.status == core.ScrapeStatus.SUCCESS
+    assert len(stream.result) == 2
+
+
 def test_scraper_scrape_not_implemented():
     scraper = core.Scraper(core.ScrapeConfig('url'))
 
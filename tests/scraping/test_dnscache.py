@@ -0,0 +1,161 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.dnscache as dnscache
+import ezscrape.scraping.transport as transport
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_resolve(host, port):
+        with lock:
+            calls.append(host)
+        if host.endswith('.invalid'):
+            raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+        return ['10.0.0.1', '10.0.0.2']
+
+    monkeypatch.setattr(transport, 'resolve', fake_resolve)
+    return calls
+
+
+def test_dns_cache_resolve_cached(lookups):
+    cache = dnscache.DnsCache()
+
+    assert cache.resolve('Example.com', 80) == ['10.0.0.1', '10.0.0.2']
+    assert cache.resolve('example.com', 443) == ['10.0.0.1', '10.0.0.2']
+    assert lookups == ['Example.com']
+    assert len(cache) == 1
+
+
+def test_dns_cache_resolve_expired(lookups):
+    cache = dnscache.DnsCache(ttl=0)
+
+    cache.resolve('example.com', 80)
+    cache.resolve('example.com', 80)
+
+    assert lookups == ['example.com', 'example.com']
+
+
+def test_dns_cache_negative(lookups):
+    cache = dnscache.DnsCache()
+
+    for _ in range(2):
+        with pytest.raises(socket.gaierror) as error:
+            cache.resolve('unknown.invalid', 80)
+        assert error.value.errno == socket.EAI_NONAME
+
+    assert lookups == ['unknown.invalid']
+    assert cache.cached('unknown.invalid') == []
+
+
+def test_dns_cache_negative_expired(lookups):
+    cache = dnscache.DnsCache(negative_ttl=0.01)
+
+    with pytest.raises(socket.gaierror):
+        cache.resolve('unknown.invalid', 80)
+    time.sleep(0.02)
+    with pytest.raises(socket.gaierror):
+        cache.resolve('unknown.invalid', 80)
+
+    assert len(lookups) == 2
+
+
+def test_dns_cache_ip_address(lookups):
+    cache = dnscache.DnsCache()
+
+    assert cache.resolve('127.0.0.1', 80) == ['127.0.0.1']
+    assert cache.resolve('::1', 80) == ['::1']
+    assert not lookups
+    assert len(cache) == 0
+
+
+def test_dns_cache_max_entries(lookups):
+    cache = dnscache.DnsCache(max_entries=2)
+
+    for host in ['host1.com', 'host2.com', 'host1.com', 'host3.com']:
+        cache.resolve(host, 80)
+
+    assert cache.cached('host1.com') is not None
+    assert cache.cached('host2.com') is None
+    assert cache.cached('host3.com') is not None
+
+
+def test_dns_cache_max_entries_invalid():
+    with pytest.raises(ValueError):
+        dnscache.DnsCache(max_entries=0)
+
+
+def test_dns_cache_clear(lookups):
+    cache = dnscache.DnsCache()
+    cache.resolve('example.com', 80)
+
+    cache.clear()
+
+    assert cache.cached('example.com') is None
+
+
+def test_dns_cache_prefetch(lookups):
+    cache = dnscache.DnsCache()
+    cache.resolve('host1.com', 80)
+
+    resolved = cache.prefetch(
+        ['host1.com', 'HOST2.com', 'host2.com', 'unknown.invalid', '10.1.1.1'])
+
+    assert resolved == {'host1.com': ['10.0.0.1', '10.0.0.2'],
+                        'host2.com': ['10.0.0.1', '10.0.0.2'],
+                        'unknown.invalid': []}
+    assert sorted(lookups) == ['host1.com', 'host2.com', 'unknown.invalid']
+
+
+def test_dns_cache_prefetch_parallel(monkeypatch):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_resolve(host, port):
+        barrier.wait()
+        return ['10.0.0.1']
+
+    monkeypatch.setattr(transport, 'resolve', fake_resolve)
+    cache = dnscache.DnsCache()
+
+    # Only passes the barrier if all 3 lookups run at the same time
+    resolved = cache.prefetch(['host1.com', 'host2.com', 'host3.com'],
+                              max_workers=3)
+
+    assert len(resolved) == 3
+
+
+def test_dns_cache_prefetch_max_workers_invalid():
+    with pytest.raises(ValueError):
+        dnscache.DnsCache().prefetch(['host1.com'], max_workers=0)
+
+
+def test_dns_cache_prefetch_configs(lookups):
+    configs = [core.ScrapeConfig('http://host1.com/page'),
+               core.ScrapeConfig('https://host2.com/page')]
+    configs[1].proxy_https = 'http://proxy.com:8080'
+
+    resolved = dnscache.DnsCache().prefetch_configs(configs)
+
+    assert set(resolved) == {'host1.com', 'proxy.com'}
+
+
+CONFIG_HOST = [
+    ('http://Host.com/page', '', '', 'host.com'),
+    ('http://host.com/page', 'http://proxy.com:80', '', 'proxy.com'),
+    ('http://host.com/page', '', 'http://proxy.com:80', 'host.com'),
+    ('https://host.com/page', '', 'http://proxy.com:80', 'proxy.com'),
+]
+@pytest.mark.parametrize('url, proxy_http, proxy_https, host', CONFIG_HOST)
+def test_config_host(url, proxy_http, proxy_https, host):
+    config = core.ScrapeConfig(url)
+    config.proxy_http = proxy_http
+    config.proxy_https = proxy_https
+
+    assert dnscache.config_host(config) == host
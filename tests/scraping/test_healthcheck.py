@@ -0,0 +1,165 @@
+import socket
+import time
+
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.healthcheck as healthcheck
+import ezscrape.scraping.http_sessions as http_sessions
+import tests.common as common
+
+
+@pytest.fixture
+def unresponsive_url():
+    # Connections are queued in the backlog but never answered
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        sock.listen(8)
+        yield F'http://127.0.0.1:{sock.getsockname()[1]}/'
+
+
+@pytest.mark.requests
+def test_check_head():
+    with common.SequenceServer([(200, {}, b'html')], head=True) as server:
+        result = healthcheck.check(server.url)
+
+    assert result
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.status_code == 200
+    assert result.final_url == server.url
+    assert result.method == 'HEAD'
+    assert result.latency_ms > 0
+    assert not result.error_msg
+    assert [method for method, _ in server.requests] == ['HEAD']
+
+
+@pytest.mark.requests
+def test_check_ranged_get_fallback():
+    # Without HEAD support the server answers 501 Not Implemented
+    with common.SequenceServer([(206, {}, b'h')]) as server:
+        result = healthcheck.check(server.url)
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.status_code == 206
+    assert result.method == 'GET'
+    assert len(server.requests) == 1
+    method, headers = server.requests[0]
+    assert method == 'GET'
+    assert headers['Range'] == 'bytes=0-0'
+
+
+@pytest.mark.requests
+def test_check_config_useragent():
+    config = core.ScrapeConfig('http://unused')
+    config.useragent = 'Test Agent'
+
+    # Without HEAD support both probes are sent
+    responses = [(405, {}, b''), (206, {}, b'h')]
+    with common.SequenceServer(responses, head=True) as server:
+        result = healthcheck.check(server.url, config=config)
+
+    assert result.method == 'GET'
+    assert [headers['User-Agent'] for _, headers in server.requests] == [
+        'Test Agent', 'Test Agent']
+
+
+@pytest.mark.requests
+def test_check_config_proxy():
+    # The proxy answers the request of the url
+    with common.SequenceServer([(200, {}, b'html')], head=True) as proxy:
+        config = core.ScrapeConfig('http://unused')
+        config.proxy_http = proxy.url
+        result = healthcheck.check('http://health.invalid/', config=config)
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert len(proxy.requests) == 1
+
+
+@pytest.mark.requests
+def test_check_redirect():
+    responses = [(302, {'Location': '/final.html'}, b''), (200, {}, b'')]
+    with common.SequenceServer(responses, head=True) as server:
+        result = healthcheck.check(server.url)
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.final_url.endswith('/final.html')
+
+
+@pytest.mark.requests
+def test_check_http_error():
+    with common.SequenceServer([(404, {}, b'')], head=True) as server:
+        result = healthcheck.check(server.url)
+
+    assert not result
+    assert result.status == core.ScrapeStatus.ERROR
+    assert result.status_code == 404
+    assert result.error_msg == 'HTTP Error: 404 - Not Found'
+
+
+def test_check_connection_error():
+    result = healthcheck.check('http://127.0.0.1:1/', timeout=1)
+
+    assert result.status == core.ScrapeStatus.ERROR
+    assert result.status_code is None
+    assert result.final_url is None
+    assert result.error_msg.startswith('EXCEPTION: ConnectionError')
+
+
+def test_check_timeout(unresponsive_url):
+    result = healthcheck.check(unresponsive_url, timeout=0.2)
+
+    assert result.status == core.ScrapeStatus.TIMEOUT
+    assert result.latency_ms < 2000
+
+
+@pytest.mark.requests
+def test_check_reuses_connection():
+    with common.SequenceServer([(200, {}, b'html')], head=True) as server:
+        with http_sessions.SessionPool() as session_pool:
+            for _ in range(3):
+                assert healthcheck.check(server.url, session_pool=session_pool)
+
+    assert len(server.requests) == 3
+    assert server.connection_count == 1
+
+
+@pytest.mark.requests
+def test_check_urls():
+    with common.SequenceServer([(200, {}, b'html')], head=True) as server:
+        urls = [server.url, 'http://127.0.0.1:1/', server.url]
+        results = healthcheck.check_urls(urls, max_workers=2, timeout=1)
+
+    assert [result.url for result in results] == urls
+    assert [result.status for result in results] == [
+        core.ScrapeStatus.SUCCESS, core.ScrapeStatus.ERROR, core.ScrapeStatus.SUCCESS]
+
+
+@pytest.mark.requests
+def test_check_urls_config_useragent():
+    config = core.ScrapeConfig('http://unused')
+    config.useragent = 'Test Agent'
+    with common.SequenceServer([(200, {}, b'html')], head=True) as server:
+        results = healthcheck.check_urls([server.url] * 2, config=config)
+
+    assert all(results)
+    assert [headers['User-Agent'] for _, headers in server.requests] == [
+        'Test Agent', 'Test Agent']
+
+
+def test_check_urls_deadline(unresponsive_url):
+    start = time.monotonic()
+    results = healthcheck.check_urls([unresponsive_url] * 3, max_workers=1,
+                                     deadline=0.3, timeout=5)
+
+    assert time.monotonic() - start < 2
+    assert all(result.status == core.ScrapeStatus.TIMEOUT for result in results)
+    assert results[-1].error_msg == healthcheck.DEADLINE_EXCEEDED_MSG
+
+
+def test_check_urls_empty():
+    assert healthcheck.check_urls([]) == []
+
+
+def test_check_urls_max_workers_invalid():
+    with pytest.raises(ValueError):
+        healthcheck.check_urls(['url'], max_workers=0)
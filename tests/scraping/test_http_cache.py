@@ -0,0 +1,230 @@
+import time
+
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.http_cache as http_cache
+import ezscrape.scraping.scraper_requests as scraper_requests
+import tests.common as common
+
+
+def _entry(url, content=b'html', **kwargs):
+    return http_cache.CacheEntry(url=url, content=content, **kwargs)
+
+
+def test_cache_entry_validators():
+    assert _entry('url').validators() == {}
+
+    entry = _entry('url', etag='"abc"', last_modified='Wed, 21 Oct 2015 07:28:00 GMT')
+    assert entry.validators() == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+
+
+def test_memory_cache_set_get_delete():
+    cache = http_cache.MemoryCache()
+    assert cache.get('url') is None
+
+    entry = _entry('url')
+    cache.set(entry)
+    assert cache.get('url') is entry
+    assert len(cache) == 1
+    assert cache.size == entry.size
+
+    cache.delete('url')
+    assert cache.get('url') is None
+    assert cache.size == 0
+
+
+def test_memory_cache_replace_entry():
+    cache = http_cache.MemoryCache()
+    cache.set(_entry('url', b'old'))
+    cache.set(_entry('url', b'new-html'))
+
+    assert len(cache) == 1
+    assert cache.get('url').content == b'new-html'
+    assert cache.size == _entry('url', b'new-html').size
+
+
+def test_memory_cache_lru_eviction_by_size():
+    entry_size = _entry('url1', b'x' * 100).size
+    cache = http_cache.MemoryCache(max_bytes=entry_size * 2)
+
+    cache.set(_entry('url1', b'x' * 100))
+    cache.set(_entry('url2', b'x' * 100))
+    cache.get('url1')  # url2 is now the least recently used
+    cache.set(_entry('url3', b'x' * 100))
+
+    assert cache.get('url1') is not None
+    assert cache.get('url2') is None
+    assert cache.get('url3') is not None
+    assert cache.size <= cache.max_bytes
+
+
+def test_memory_cache_entry_too_big():
+    cache = http_cache.MemoryCache(max_bytes=10)
+    cache.set(_entry('url', b'x' * 100))
+
+    assert cache.get('url') is None
+    assert len(cache) == 0
+
+
+def test_memory_cache_clear():
+    cache = http_cache.MemoryCache()
+    cache.set(_entry('url1'))
+    cache.set(_entry('url2'))
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    cache = http_cache.DiskCache(str(tmp_path / 'cache'))
+    assert cache.get('url') is None
+
+    entry = _entry('url', 'html äöü'.encode('latin-1'), encoding='latin-1',
+                   request_time_ms=15, etag='"abc"')
+    cache.set(entry)
+    assert cache.get('url') == entry
+
+    # A new cache on the same directory sees the entry
+    assert http_cache.DiskCache(str(tmp_path / 'cache')).get('url') == entry
+
+    cache.delete('url')
+    cache.delete('url')
+    assert cache.get('url') is None
+
+
+def test_disk_cache_clear(tmp_path):
+    cache = http_cache.DiskCache(str(tmp_path))
+    cache.set(_entry('url1'))
+    cache.set(_entry('url2'))
+    cache.clear()
+
+    assert cache.get('url1') is None
+    assert cache.get('url2') is None
+
+
+def test_disk_cache_invalid_file(tmp_path):
+    cache = http_cache.DiskCache(str(tmp_path))
+    cache.set(_entry('url'))
+    with open(cache._path('url'), 'w') as file_handle:
+        file_handle.write('not json')
+
+    assert cache.get('url') is None
+
+
+def test_disk_cache_outdated_file(tmp_path):
+    cache = http_cache.DiskCache(str(tmp_path))
+    cache.set(_entry('url'))
+    with open(cache._path('url'), 'w') as file_handle:
+        file_handle.write('{"url": "url", "html": "html"}')
+
+    assert cache.get('url') is None
+
+
+PARSE_CACHE_CONTROL = [
+    ('', {}),
+    ('no-store', {'no-store': ''}),
+    ('Max-Age=60, no-cache', {'max-age': '60', 'no-cache': ''}),
+    ('private, max-age="30"', {'private': '', 'max-age': '30'})
+]
+@pytest.mark.parametrize('value, directives', PARSE_CACHE_CONTROL)
+def test_parse_cache_control(value, directives):
+    assert http_cache.parse_cache_control(value) == directives
+
+
+POLICY_FRESHNESS = [
+    (True, {}, 100),
+    (True, {'Cache-Control': 'max-age=60'}, 60),
+    (True, {'Cache-Control': 'max-age=invalid'}, 100),
+    (True, {'Cache-Control': 'no-cache, max-age=60'}, 0),
+    (False, {'Cache-Control': 'max-age=60'}, 100),
+    (False, {'Cache-Control': 'no-cache'}, 100)
+]
+@pytest.mark.parametrize('honour_cache_control, headers, fresh_for', POLICY_FRESHNESS)
+def test_cache_policy_store_freshness(honour_cache_control, headers, fresh_for):
+    policy = http_cache.CachePolicy(
+        http_cache.MemoryCache(), ttl=100, honour_cache_control=honour_cache_control)
+
+    entry = policy.store('url', headers, b'html', request_time_ms=5)
+
+    assert entry.fresh_for == fresh_for
+    assert policy.cache.get('url') is entry
+    assert entry.request_time_ms == 5
+
+
+def test_cache_policy_no_store():
+    policy = http_cache.CachePolicy(http_cache.MemoryCache())
+    policy.store('url', {}, b'html', request_time_ms=5)
+
+    assert policy.store('url', {'Cache-Control': 'no-store'}, b'html', request_time_ms=5) is None
+    assert policy.cache.get('url') is None
+
+
+def test_cache_policy_is_fresh():
+    policy = http_cache.CachePolicy(http_cache.MemoryCache(), ttl=100)
+    entry = policy.store('url', {}, b'html', request_time_ms=5)
+    assert policy.is_fresh(entry)
+
+    entry.stored_at = time.time() - 101
+    assert not policy.is_fresh(entry)
+
+
+def test_cache_policy_refresh():
+    policy = http_cache.CachePolicy(http_cache.MemoryCache(), ttl=100)
+    entry = policy.store('url', {'ETag': '"old"'}, b'html', request_time_ms=5)
+    entry.stored_at = 0
+
+    policy.refresh(entry, {'ETag': '"new"'})
+
+    assert policy.is_fresh(entry)
+    assert entry.etag == '"new"'
+    assert entry.content == b'html'
+
+
+@pytest.mark.requests
+def test_requests_scraper_served_from_cache():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    config.cache_policy = http_cache.CachePolicy(http_cache.MemoryCache(), ttl=100)
+
+    result1 = scraper_requests.RequestsScraper(config).scrape()
+    result2 = scraper_requests.RequestsScraper(config).scrape()
+
+    assert result1.status == core.ScrapeStatus.SUCCESS
+    assert not result1.from_cache
+
+    assert result2.status == core.ScrapeStatus.SUCCESS
+    assert result2.from_cache
+    assert result2.first_page.html == result1.first_page.html
+    assert result2.request_time_ms == result1.request_time_ms
+
+
+@pytest.mark.requests
+def test_requests_scraper_revalidated():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    config.cache_policy = http_cache.CachePolicy(http_cache.MemoryCache(), ttl=0)
+
+    result1 = scraper_requests.RequestsScraper(config).scrape()
+    entry = config.cache_policy.cache.get(config.url)
+    assert entry.last_modified
+
+    result2 = scraper_requests.RequestsScraper(config).scrape()
+
+    assert not result1.from_cache
+    assert result2.status == core.ScrapeStatus.SUCCESS
+    assert result2.from_cache
+    assert result2.first_page.html == result1.first_page.html
+    assert result2.request_time_ms == result1.request_time_ms
+
+
+@pytest.mark.requests
+def test_requests_scraper_errors_not_cached():
+    config = core.ScrapeConfig(common.URL_URL_NOT_ONLINE)
+    config.cache_policy = http_cache.CachePolicy(http_cache.MemoryCache())
+
+    result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.ERROR
+    assert config.cache_policy.cache.get(config.url) is None
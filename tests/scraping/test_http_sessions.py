@@ -0,0 +1,131 @@
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.dnscache as dnscache
+import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.http_sessions as http_sessions
+import ezscrape.scraping.scraper_requests as scraper_requests
+import tests.common as common
+
+
+def test_session_pool_same_proxy_same_session():
+    with http_sessions.SessionPool() as pool:
+        session1 = pool.session_for(core.ScrapeConfig('url1'))
+        session2 = pool.session_for(core.ScrapeConfig('url2'))
+
+        assert session1 is session2
+        assert len(pool) == 1
+
+
+def test_session_pool_proxy_specific_sessions():
+    config_no_proxy = core.ScrapeConfig('url')
+    config_proxy = core.ScrapeConfig('url')
+    config_proxy.proxy_http = 'http://1.2.3.4:8080'
+    config_proxy.proxy_https = 'https://1.2.3.4:8080'
+
+    with http_sessions.SessionPool() as pool:
+        session_no_proxy = pool.session_for(config_no_proxy)
+        session_proxy = pool.session_for(config_proxy)
+
+        assert session_no_proxy is not session_proxy
+        assert len(pool) == 2
+        assert not session_no_proxy.proxies
+        assert session_proxy.proxies['http'] == config_proxy.proxy_http
+        assert session_proxy.proxies['https'] == config_proxy.proxy_https
+
+
+def test_session_pool_adapter_sizes():
+    pool_config = http_sessions.SessionPoolConfig(
+        pool_connections=3, pool_maxsize=7)
+
+    with http_sessions.SessionPool(pool_config) as pool:
+        session = pool.session_for(core.ScrapeConfig('url'))
+
+        for prefix in ('http://', 'https://'):
+            adapter = session.get_adapter(prefix)
+            assert adapter._pool_connections == 3
+            assert adapter._pool_maxsize == 7
+
+
+def test_session_pool_dns_cache():
+    cache = dnscache.DnsCache()
+
+    with http_sessions.SessionPool(dns_cache=cache) as pool:
+        session = pool.session_for(core.ScrapeConfig('url'))
+
+        for prefix in ('http://', 'https://'):
+            pool_classes = session.get_adapter(prefix).poolmanager.pool_classes_by_scheme
+            assert all(pool_cls.ConnectionCls.dns_cache is cache
+                       for pool_cls in pool_classes.values())
+
+
+def test_session_pool_max_sessions_evicts_oldest():
+    pool_config = http_sessions.SessionPoolConfig(max_sessions=2)
+
+    with http_sessions.SessionPool(pool_config) as pool:
+        configs = []
+        for idx in range(3):
+            config = core.ScrapeConfig('url')
+            config.proxy_http = F'http://1.2.3.{idx}:8080'
+            configs.append(config)
+
+        first_session = pool.session_for(configs[0])
+        pool.session_for(configs[1])
+        pool.session_for(configs[2])
+
+        assert len(pool) == 2
+        assert pool.session_for(configs[0]) is not first_session
+
+
+def test_session_pool_closed():
+    pool = http_sessions.SessionPool()
+    pool.session_for(core.ScrapeConfig('url'))
+    pool.close()
+
+    assert pool.closed
+    assert len(pool) == 0
+    with pytest.raises(exceptions.ScrapeError):
+        pool.session_for(core.ScrapeConfig('url'))
+
+
+def test_default_pool_recreated_after_close():
+    pool = http_sessions.get_default_pool()
+    assert pool is http_sessions.get_default_pool()
+
+    http_sessions.close_default_pool()
+    assert pool.closed
+
+    new_pool = http_sessions.get_default_pool()
+    assert new_pool is not pool
+    assert not new_pool.closed
+    assert new_pool.dns_cache is dnscache.get_default_cache()
+
+
+def test_requests_scraper_cookies_kept_for_redirects_only():
+    responses = [(302, {'Location': '/final', 'Set-Cookie': 'sid=1; Path=/'}, b''),
+                 (200, {}, b'<html>Done</html>')]
+    with common.SequenceServer(responses) as server:
+        with http_sessions.SessionPool() as pool:
+            config = core.ScrapeConfig(server.url)
+            result = scraper_requests.RequestsScraper(config, session_pool=pool).scrape()
+            assert result.status == core.ScrapeStatus.SUCCESS
+            assert not pool.session_for(config).cookies
+
+            # The next scrape doesn't send the cookie of the previous one
+            scraper_requests.RequestsScraper(config, session_pool=pool).scrape()
+
+    cookies = [headers.get('Cookie') for _, headers in server.requests]
+    assert cookies == [None, 'sid=1', None]
+
+
+@pytest.mark.requests
+def test_requests_scraper_reuses_pool_session():
+    with http_sessions.SessionPool() as pool:
+        for url in [common.URL_SINGLE_PAGE_NO_JS, common.URL_MULTI_PAGE_NO_JS_START_GOOD]:
+            config = core.ScrapeConfig(url)
+            result = scraper_requests.RequestsScraper(config, session_pool=pool).scrape()
+
+            assert result.status == core.ScrapeStatus.SUCCESS
+            assert common.NON_JS_TEST_STRING in result.first_page.html
+
+        assert len(pool) == 1
@@ -0,0 +1,136 @@
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.metrics as metrics
+import ezscrape.scraping.scraper as scraper
+import ezscrape.scraping.scraper_requests as scraper_requests
+import tests.common as common
+
+
+@pytest.fixture
+def collector():
+    collector = metrics.InMemoryMetrics()
+    metrics.set_default_metrics(collector)
+    yield collector
+    metrics.set_default_metrics(None)
+
+
+def test_default_metrics_disabled():
+    default = metrics.get_default_metrics()
+
+    assert isinstance(default, metrics.NullMetrics)
+    assert not default.enabled
+    default.increment('name', labels={'label': 'value'})
+    default.observe('name', 5)
+
+
+def test_set_default_metrics(collector):
+    assert metrics.get_default_metrics() is collector
+    assert collector.enabled
+
+
+def test_collector_interface_not_implemented():
+    with pytest.raises(NotImplementedError):
+        metrics.MetricsCollector().increment('name')
+    with pytest.raises(NotImplementedError):
+        metrics.MetricsCollector().observe('name', 1)
+
+
+def test_in_memory_counter():
+    collector = metrics.InMemoryMetrics()
+    collector.increment('requests', labels={'status': 'ok', 'host': 'a'})
+    collector.increment('requests', 2, labels={'host': 'a', 'status': 'ok'})
+    collector.increment('requests', labels={'status': 'error', 'host': 'a'})
+
+    assert collector.counter('requests', {'status': 'ok', 'host': 'a'}) == 3
+    assert collector.counter('requests', {'status': 'error', 'host': 'a'}) == 1
+    assert collector.counter('requests') == 0
+
+
+def test_in_memory_histogram():
+    collector = metrics.InMemoryMetrics(buckets={'latency': [100, 10]})
+    for value in [5, 10, 50, 500]:
+        collector.observe('latency', value)
+
+    histogram = collector.histogram('latency')
+    assert histogram.buckets == [10, 100]
+    assert histogram.bucket_counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.total == 565
+
+    assert collector.histogram('latency', {'host': 'a'}) is None
+
+
+def test_in_memory_reset():
+    collector = metrics.InMemoryMetrics()
+    collector.increment('requests')
+    collector.observe('latency', 1)
+    collector.reset()
+
+    assert collector.counter('requests') == 0
+    assert collector.to_prometheus() == ''
+
+
+def test_prometheus_export():
+    collector = metrics.InMemoryMetrics(buckets={'latency_ms': [10, 100]})
+    collector.increment('requests_total', labels={'status': 'SUCCESS'})
+    collector.increment('requests_total', labels={'status': 'ERROR'})
+    collector.observe('latency_ms', 5, labels={'host': 'a'})
+    collector.observe('latency_ms', 12.5, labels={'host': 'a'})
+
+    assert collector.to_prometheus() == (
+        '# TYPE requests_total counter\n'
+        'requests_total{status="ERROR"} 1\n'
+        'requests_total{status="SUCCESS"} 1\n'
+        '# TYPE latency_ms histogram\n'
+        'latency_ms_bucket{host="a",le="10"} 1\n'
+        'latency_ms_bucket{host="a",le="100"} 2\n'
+        'latency_ms_bucket{host="a",le="+Inf"} 2\n'
+        'latency_ms_sum{host="a"} 17.5\n'
+        'latency_ms_count{host="a"} 2\n')
+
+
+def test_prometheus_export_escapes_labels():
+    collector = metrics.InMemoryMetrics()
+    collector.increment('total', labels={'label': 'a"b\\c\nd'})
+
+    assert 'total{label="a\\"b\\\\c\\nd"} 1' in collector.to_prometheus()
+
+
+def test_host_label():
+    assert metrics.host_label('http://WWW.Site.com:8080/path') == 'www.site.com'
+    assert metrics.host_label('invalid') == ''
+
+
+def test_count_downloaded_bytes(collector):
+    metrics.count_downloaded_bytes('http://site.com/page1', 100)
+    metrics.count_downloaded_bytes('http://site.com/page2', 50)
+    metrics.count_downloaded_bytes('http://site.com/page3', 0)
+
+    assert collector.counter(metrics.DOWNLOADED_BYTES_TOTAL, {'host': 'site.com'}) == 150
+
+
+@pytest.mark.requests
+def test_requests_scraper_metrics(collector):
+    body = b'<html>page</html>'
+    with common.SequenceServer([(503, {}, b''), (200, {}, body)]) as server:
+        config = core.ScrapeConfig(server.url)
+        config.retry_policy = core.RetryPolicy(backoff_base=0.01, jitter=False)
+        result = scraper.scrape_url(config)
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    scraper_labels = {'scraper': 'RequestsScraper'}
+    assert collector.counter(metrics.SCRAPES_TOTAL, {**scraper_labels, 'status': 'SUCCESS'}) == 1
+    assert collector.counter(metrics.REQUESTS_TOTAL, {**scraper_labels, 'status': 'ERROR'}) == 1
+    assert collector.counter(metrics.REQUESTS_TOTAL, {**scraper_labels, 'status': 'SUCCESS'}) == 1
+    assert collector.counter(metrics.RETRIES_TOTAL, scraper_labels) == 1
+    assert collector.counter(metrics.DOWNLOADED_BYTES_TOTAL, {'host': '127.0.0.1'}) == len(body)
+    assert collector.histogram(metrics.REQUEST_DURATION_MS, {'host': '127.0.0.1'}).count == 2
+
+
+@pytest.mark.requests
+def test_requests_scraper_no_metrics_by_default():
+    result = scraper_requests.RequestsScraper(core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert isinstance(metrics.get_default_metrics(), metrics.NullMetrics)
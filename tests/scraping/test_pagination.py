@@ -0,0 +1,55 @@
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.pagination as pagination
+
+URL = 'http://website.com/list/page1.html'
+
+
+def _page(body):
+    return core.ScrapePage(F'<html><head></head><body>{body}</body></html>')
+
+
+NEXT_LINK_PAGES = [
+    (core.WaitForXpathElem('''//a[text()='Next']'''), '<a href="page2.html">Next</a>', 'http://website.com/list/page2.html'),
+    (core.WaitForXpathElem('''//a[@class='next']/@href'''), '<a class="next" href="/page2.html">></a>', 'http://website.com/page2.html'),
+    (core.WaitForCssElem('nav a.next'), '<nav><a href="?page=2" class="next">></a></nav>', 'http://website.com/list/page1.html?page=2'),
+    (core.WaitForCssElem('a.next'), '<a class="next">no href</a><a class="next" href="page2.html">></a>', 'http://website.com/list/page2.html'),
+    (None, '<a rel="next" href="http://other.com/2">2</a>', 'http://other.com/2'),
+    (None, '<a rel="nofollow next" href="page2.html">2</a>', 'http://website.com/list/page2.html'),
+    (None, '<link rel="next" href="page2.html">', 'http://website.com/list/page2.html'),
+    (None, '<base href="/other/"><a rel="next" href="page2.html">2</a>', 'http://website.com/other/page2.html'),
+]
+@pytest.mark.parametrize('next_link, body, expected_url', NEXT_LINK_PAGES)
+def test_next_page_url(next_link, body, expected_url):
+    assert pagination.next_page_url(_page(body), URL, core.Pagination(next_link)) == expected_url
+
+
+def test_next_page_url_next_link_before_rel_next():
+    page = _page('<a rel="next" href="rel.html">2</a><a class="next" href="link.html">></a>')
+
+    assert pagination.next_page_url(page, URL, core.Pagination(core.WaitForCssElem('a.next'))) ==\
+        'http://website.com/list/link.html'
+
+
+NO_NEXT_PAGES = [
+    ('<a href="page2.html">2</a>', True),
+    ('<a rel="next" href="page2.html">2</a>', False),
+    ('<a rel="next" href="javascript:next()">2</a>', True),
+    ('<a rel="next" href="#">2</a>', True),
+    ('<a rel="next">2</a>', True),
+]
+@pytest.mark.parametrize('body, rel_next', NO_NEXT_PAGES)
+def test_next_page_url_none(body, rel_next):
+    assert pagination.next_page_url(_page(body), URL, core.Pagination(rel_next=rel_next)) is None
+
+
+def test_next_page_url_empty_page():
+    assert pagination.next_page_url(core.ScrapePage(''), URL, core.Pagination()) is None
+
+
+def test_next_page_url_xml_declaration():
+    page = core.ScrapePage(content=b'<?xml version="1.0" encoding="utf-8"?><html><a rel="next" href="2.html"></a></html>',
+                           encoding='utf-8')
+
+    assert pagination.next_page_url(page, URL, core.Pagination()) == 'http://website.com/list/2.html'
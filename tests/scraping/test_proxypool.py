@@ -0,0 +1,197 @@
+import time
+
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.proxypool as proxypool
+import ezscrape.scraping.scraper_aiohttp as scraper_aiohttp
+import ezscrape.scraping.scraper_requests as scraper_requests
+import tests.common as common
+
+DEAD_PROXY = 'http://127.0.0.1:1'
+
+
+def _result(status, request_time_ms=0, status_code=0):
+    result = core.ScrapeResult('url')
+    result.status = status
+    result.status_code = status_code
+    if request_time_ms:
+        result.add_scrape_page('html', scrape_time=request_time_ms, status=status)
+    return result
+
+
+def _success(request_time_ms):
+    return _result(core.ScrapeStatus.SUCCESS, request_time_ms, 200)
+
+
+@pytest.mark.parametrize('kwargs', [{'failure_threshold': 0}, {'smoothing': 0}, {'smoothing': 1.5}])
+def test_proxy_pool_invalid_config(kwargs):
+    with pytest.raises(ValueError):
+        proxypool.ProxyPool([], **kwargs)
+
+
+def test_proxy_pool_add_remove():
+    pool = proxypool.ProxyPool(['proxy1', 'proxy2', 'proxy1'])
+    assert len(pool) == 2
+
+    pool.add('proxy3')
+    pool.remove('proxy1')
+    pool.remove('unknown')
+    assert sorted(stats.url for stats in pool.stats()) == ['proxy2', 'proxy3']
+
+
+def test_proxy_pool_empty():
+    assert proxypool.ProxyPool([]).acquire() is None
+
+
+def test_proxy_pool_picks_fastest():
+    pool = proxypool.ProxyPool(['slow', 'fast'])
+    for proxy, request_time_ms in [('slow', 500), ('fast', 100)]:
+        pool.report(proxy, _success(request_time_ms))
+
+    assert pool.acquire() == 'fast'
+    pool.report('fast', _success(100))
+
+
+def test_proxy_pool_untried_first():
+    pool = proxypool.ProxyPool(['tried'])
+    pool.acquire()
+    pool.report('tried', _success(100))
+
+    pool.add('new')
+    assert pool.acquire() == 'new'
+
+
+def test_proxy_pool_only_failed_loses_to_success():
+    pool = proxypool.ProxyPool(['bad', 'good'], failure_threshold=10)
+    pool.report('bad', _result(core.ScrapeStatus.PROXY_ERROR))
+    pool.report('good', _success(1000))
+
+    picks = []
+    for _ in range(6):
+        picks.append(pool.acquire())
+        pool.release(picks[-1])
+    assert picks == ['good'] * 6
+
+
+def test_proxy_pool_only_failed_after_untried():
+    pool = proxypool.ProxyPool(['bad', 'new'], failure_threshold=10)
+    pool.report('bad', _result(core.ScrapeStatus.PROXY_ERROR))
+
+    assert pool.acquire() == 'new'
+
+
+def test_proxy_pool_spreads_load_in_flight():
+    pool = proxypool.ProxyPool(['proxy1', 'proxy2'])
+    for proxy in ['proxy1', 'proxy2']:
+        pool.report(proxy, _success(100))
+
+    # The second request goes to the other proxy while the first is running
+    assert {pool.acquire(), pool.acquire()} == {'proxy1', 'proxy2'}
+    assert [stats.in_flight for stats in pool.stats()] == [1, 1]
+
+
+def test_proxy_pool_success_rate_scoring():
+    pool = proxypool.ProxyPool(['flaky', 'reliable'], failure_threshold=10)
+    pool.report('flaky', _success(100))
+    pool.report('flaky', _result(core.ScrapeStatus.PROXY_ERROR))
+    pool.report('reliable', _success(120))
+
+    assert pool.acquire() == 'reliable'
+
+
+FAILURES = [
+    (core.ScrapeStatus.PROXY_ERROR, 0, True),
+    (core.ScrapeStatus.TIMEOUT, 0, True),
+    (core.ScrapeStatus.ERROR, 407, True),
+    (core.ScrapeStatus.ERROR, 429, True),
+    (core.ScrapeStatus.ERROR, 404, False),
+    (core.ScrapeStatus.SUCCESS, 200, False)
+]
+@pytest.mark.parametrize('status, status_code, failed', FAILURES)
+def test_proxy_pool_failures(status, status_code, failed):
+    pool = proxypool.ProxyPool(['proxy'])
+    pool.acquire()
+    pool.report('proxy', _result(status, status_code=status_code))
+
+    stats = pool.stats()[0]
+    assert stats.failures == int(failed)
+    assert stats.successes == int(not failed)
+    assert stats.in_flight == 0
+
+
+def test_proxy_pool_quarantine_and_decay():
+    pool = proxypool.ProxyPool(['proxy'], failure_threshold=2,
+                               quarantine_time=0.05, max_quarantine_time=0.15)
+
+    pool.report('proxy', _result(core.ScrapeStatus.PROXY_ERROR))
+    assert pool.healthy_count() == 1
+    pool.report('proxy', _result(core.ScrapeStatus.PROXY_ERROR))
+    assert pool.healthy_count() == 0
+    assert pool.acquire() is None
+
+    # Back on probation after the quarantine
+    time.sleep(0.06)
+    assert pool.acquire() == 'proxy'
+    assert pool.stats()[0].success_score == proxypool.PROBATION_SUCCESS_SCORE
+
+    # Repeated quarantines take longer, capped at the max
+    pool.report('proxy', _result(core.ScrapeStatus.TIMEOUT))
+    pool.report('proxy', _result(core.ScrapeStatus.TIMEOUT))
+    stats = pool.stats()[0]
+    assert stats.quarantines == 2
+    assert 0.09 < stats.quarantined_until - time.monotonic() <= 0.1
+
+    pool.report('proxy', _success(100))
+    assert pool.stats()[0].quarantines == 1
+
+
+def test_proxy_pool_scrape_through():
+    pool = proxypool.ProxyPool(['proxy'])
+
+    result = pool.scrape_through('url', lambda proxy: _success(100))
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert pool.stats()[0].latency_ms == 100
+
+    def _raise(proxy):
+        raise RuntimeError('scrape failed')
+    with pytest.raises(RuntimeError):
+        pool.scrape_through('url', _raise)
+    assert pool.stats()[0].in_flight == 0
+
+    pool.remove('proxy')
+    result = pool.scrape_through('url', lambda proxy: _success(100))
+    assert result.status == core.ScrapeStatus.PROXY_ERROR
+    assert result.error_msg == 'No healthy proxy available'
+
+
+@pytest.mark.requests
+def test_requests_scraper_rotates_proxies():
+    # The sequence server answers the proxied requests itself
+    with common.SequenceServer([(200, {}, b'proxied')]) as proxy_server:
+        proxy = proxy_server.url.rsplit('/', 1)[0]
+        pool = proxypool.ProxyPool([DEAD_PROXY, proxy], failure_threshold=1)
+
+        for _ in range(3):
+            config = core.ScrapeConfig('http://www.example.invalid/page.html')
+            config.proxy_pool = pool
+            config.retry_policy = core.RetryPolicy(backoff_base=0.01)
+            result = scraper_requests.RequestsScraper(config).scrape()
+
+            assert result.status == core.ScrapeStatus.SUCCESS
+            assert result.first_page.html == 'proxied'
+
+    stats = {stats.url: stats for stats in pool.stats()}
+    assert stats[DEAD_PROXY].failures == 1
+    assert stats[DEAD_PROXY].quarantined_until > time.monotonic()
+    assert stats[proxy].successes == 3
+    assert proxy_server.request_count == 3
+
+
+def test_async_scraper_rejects_proxy_pool():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    config.proxy_pool = proxypool.ProxyPool([DEAD_PROXY])
+
+    with pytest.raises(exceptions.ScrapeConfigError):
+        scraper_aiohttp.AsyncRequestsScraper(config)
@@ -0,0 +1,229 @@
+import email.utils
+import threading
+import time
+
+import pytest
+import requests
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.ratelimit as ratelimit
+import ezscrape.scraping.scraper_requests as scraper_requests
+import tests.common as common
+
+
+@pytest.fixture
+def too_many_requests_url():
+    with common.SequenceServer([(429, {'Retry-After': '120'}, b'')]) as server:
+        yield server.url
+
+
+def _http_date(seconds_from_now):
+    return email.utils.formatdate(time.time() + seconds_from_now, usegmt=True)
+
+
+PARSE_RETRY_AFTER = [
+    (None, None),
+    ('', None),
+    ('120', 120),
+    (' 5 ', 5),
+    ('not a date', None),
+    (_http_date(-60), 0)
+]
+@pytest.mark.parametrize('value, seconds', PARSE_RETRY_AFTER)
+def test_parse_retry_after(value, seconds):
+    assert ratelimit.parse_retry_after(value) == seconds
+
+
+def test_parse_retry_after_http_date():
+    assert 50 < ratelimit.parse_retry_after(_http_date(60)) <= 60
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'requests_per_second': 0}, {'burst': 0}, {'max_per_host': -1}])
+def test_rate_limiter_invalid_config(kwargs):
+    with pytest.raises(ValueError):
+        ratelimit.RateLimiter(**kwargs)
+
+
+def test_rate_limiter_token_bucket():
+    limiter = ratelimit.RateLimiter(10, burst=2, max_per_host=0)
+
+    assert limiter.try_acquire('http://host/1') == 0
+    assert limiter.try_acquire('http://host/2') == 0
+    assert 0 < limiter.try_acquire('http://host/3') <= 0.1
+
+    # Other hosts have their own bucket
+    assert limiter.try_acquire('http://other-host/1') == 0
+
+    time.sleep(0.1)
+    assert limiter.try_acquire('http://host/3') == 0
+
+
+def test_rate_limiter_max_per_host():
+    limiter = ratelimit.RateLimiter(1000, burst=10, max_per_host=1)
+
+    assert limiter.acquire('http://host/1')
+    assert limiter.try_acquire('http://host/2') == ratelimit.CONCURRENCY_POLL_INTERVAL
+    assert not limiter.acquire('http://host/2', timeout=0.05)
+
+    limiter.release('http://host/1')
+    assert limiter.acquire('http://host/2', timeout=0)
+
+
+def test_rate_limiter_acquire_waits_for_release():
+    limiter = ratelimit.RateLimiter(1000, burst=10, max_per_host=1)
+    limiter.acquire('http://host/1')
+
+    timer = threading.Timer(0.1, limiter.release, args=('http://host/1',))
+    timer.start()
+
+    start = time.monotonic()
+    assert limiter.acquire('http://host/2', timeout=5)
+    assert time.monotonic() - start >= 0.05
+    timer.join()
+
+
+def test_rate_limiter_limit_context_manager():
+    limiter = ratelimit.RateLimiter(1000, burst=10, max_per_host=1)
+
+    with limiter.limit('http://host/1'):
+        assert not limiter.acquire('http://host/2', timeout=0)
+    assert limiter.acquire('http://host/2', timeout=0)
+
+
+def test_rate_limiter_retry_after():
+    limiter = ratelimit.RateLimiter(1000, burst=10, max_retry_after=60)
+
+    limiter.acquire('http://host/1')
+    limiter.release('http://host/1', retry_after=3600)
+
+    assert 50 < limiter.try_acquire('http://host/2') <= 60
+    assert limiter.try_acquire('http://other-host/1') == 0
+
+    limiter.defer('http://other-host/1', 0.05)
+    assert not limiter.acquire('http://other-host/2', timeout=0)
+    assert limiter.acquire('http://other-host/2', timeout=1)
+
+
+def test_rate_limiter_prunes_idle_hosts(monkeypatch):
+    monkeypatch.setattr(ratelimit, 'HOST_PRUNE_THRESHOLD', 4)
+    limiter = ratelimit.RateLimiter(1000)
+
+    assert limiter.acquire('http://busy/1')
+    limiter.defer('http://deferred/1', 60)
+    for idx in range(10):
+        assert limiter.acquire(F'http://host{idx}/1')
+        limiter.release(F'http://host{idx}/1')
+        time.sleep(0.01)
+
+    assert len(limiter._hosts) <= 5
+    assert {'busy', 'deferred'} <= set(limiter._hosts)
+    assert limiter._hosts['busy'].in_flight == 1
+    limiter.release('http://busy/1')
+
+
+ROBOTS_TXT = [
+    ('User-agent: *\nCrawl-delay: 2\n', 0.5),
+    ('User-agent: *\nRequest-rate: 1/4\n', 0.25),
+    ('User-agent: *\nCrawl-delay: 0.01\n', 10),
+    ('User-agent: other\nCrawl-delay: 2\n', 10),
+    ('', 10)
+]
+@pytest.mark.parametrize('robots_txt, requests_per_second', ROBOTS_TXT)
+def test_rate_limiter_robots_txt(robots_txt, requests_per_second):
+    fetched = []
+    def _fetch(url, robots_request):
+        fetched.append(url)
+        return robots_txt
+
+    limiter = ratelimit.RateLimiter(10, honour_robots_txt=True, robots_fetcher=_fetch)
+    limiter.acquire('http://host/1')
+    limiter.load_robots_txt('http://host/2')
+
+    assert fetched == ['http://host/1']
+    assert limiter._hosts['host'].requests_per_second == requests_per_second
+
+
+def test_rate_limiter_robots_txt_not_honoured():
+    def _fetch(url, robots_request):
+        raise AssertionError('robots.txt must not be fetched')
+
+    limiter = ratelimit.RateLimiter(10, robots_fetcher=_fetch)
+    assert limiter.acquire('http://host/1', timeout=0)
+
+
+@pytest.mark.requests
+def test_fetch_robots_txt_with_request():
+    with common.SequenceServer([(200, {}, b'User-agent: *\nCrawl-delay: 2\n')]) as server:
+        with requests.Session() as session:
+            robots_txt = ratelimit.fetch_robots_txt(
+                server.url, ratelimit.RobotsRequest('Test Agent', session=session))
+
+    assert 'Crawl-delay: 2' in robots_txt
+    method, headers = server.requests[0]
+    assert headers['User-Agent'] == 'Test Agent'
+
+
+def test_robots_request_for():
+    config = core.ScrapeConfig('http://host/1')
+    assert ratelimit.robots_request_for(config) is None
+
+    config.rate_limiter = ratelimit.RateLimiter(honour_robots_txt=True)
+    config.useragent = 'Test Agent'
+    config.proxy_https = 'http://10.0.0.1:3128'
+    robots_request = ratelimit.robots_request_for(config)
+
+    assert robots_request.useragent == 'Test Agent'
+    assert robots_request.proxies == {'https': 'http://10.0.0.1:3128'}
+    assert robots_request.session is None
+
+
+def test_requests_scraper_robots_request():
+    robots_requests = []
+    def _fetch(url, robots_request):
+        robots_requests.append(robots_request)
+        return ''
+
+    with common.SequenceServer([(200, {}, b'html')]) as server:
+        config = core.ScrapeConfig(server.url)
+        config.useragent = 'Test Agent'
+        config.rate_limiter = ratelimit.RateLimiter(
+            100, honour_robots_txt=True, robots_fetcher=_fetch)
+        scraper_requests.RequestsScraper(config).scrape()
+
+    assert robots_requests[0].useragent == 'Test Agent'
+    assert robots_requests[0].session is not None
+
+
+@pytest.mark.requests
+def test_fetch_robots_txt_not_found():
+    assert ratelimit.fetch_robots_txt(common.URL_SINGLE_PAGE_NO_JS) == ''
+
+
+@pytest.mark.requests
+def test_requests_scraper_rate_limited():
+    limiter = ratelimit.RateLimiter(20, burst=1, max_per_host=1)
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    config.rate_limiter = limiter
+
+    start = time.monotonic()
+    for _ in range(3):
+        result = scraper_requests.RequestsScraper(config).scrape()
+        assert result.status == core.ScrapeStatus.SUCCESS
+
+    # Three requests at 20/s need at least 2 intervals of 50ms
+    assert time.monotonic() - start >= 0.09
+    assert limiter._hosts['127.0.0.1'].in_flight == 0
+
+
+@pytest.mark.requests
+def test_requests_scraper_honours_retry_after(too_many_requests_url):
+    limiter = ratelimit.RateLimiter(1000, burst=10)
+    config = core.ScrapeConfig(too_many_requests_url)
+    config.rate_limiter = limiter
+
+    result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.ERROR
+    assert '429' in result.error_msg
+    assert 110 < limiter.try_acquire(too_many_requests_url) <= 120
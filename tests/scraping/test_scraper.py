@@ -1,8 +1,19 @@
+import collections
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
 import pytest
 
 import ezscrape.scraping.scraper as scraper
 import ezscrape.scraping.core as core
+import ezscrape.scraping.dnscache as dnscache
 import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.http_sessions as http_sessions
+import ezscrape.scraping.transport as transport
+import ezscrape.scraping.urlclass as urlclass
 import tests.common as common
 
 ########################################
@@ -45,6 +56,133 @@ def test_scrape_url_scraper_js():
     assert common.JS_TEST_STRING in page
 
 
+########################################
+# Tests for Fuction scrape_urls
+########################################
+SCRAPE_URLS_NO_JS = [
+    common.URL_SINGLE_PAGE_NO_JS,
+    common.URL_MULTI_PAGE_NO_JS_START_GOOD,
+    common.URL_SINGLE_PAGE_JS,
+    common.URL_URL_NOT_ONLINE,
+    common.URL_MULTI_PAGE_JS_DYNAMIC_LINKS
+]
+@pytest.mark.requests
+def test_scrape_urls_ordered():
+    configs = [core.ScrapeConfig(url) for url in SCRAPE_URLS_NO_JS]
+    results = list(scraper.scrape_urls(configs, max_workers=3, ordered=True))
+
+    assert [result.url for result in results] == SCRAPE_URLS_NO_JS
+    for result in results:
+        if result.url == common.URL_URL_NOT_ONLINE:
+            assert result.status == core.ScrapeStatus.ERROR
+        else:
+            assert result.status == core.ScrapeStatus.SUCCESS
+
+
+@pytest.mark.requests
+def test_scrape_urls_as_completed():
+    configs = [core.ScrapeConfig(url) for url in SCRAPE_URLS_NO_JS]
+    results = list(scraper.scrape_urls(configs, max_workers=3))
+
+    assert sorted(result.url for result in results) == sorted(SCRAPE_URLS_NO_JS)
+
+
+def test_scrape_urls_no_configs():
+    assert not list(scraper.scrape_urls([]))
+
+
+@pytest.mark.parametrize('max_workers, max_per_host', [(0, 1), (1, 0)])
+def test_scrape_urls_invalid_limits(max_workers, max_per_host):
+    with pytest.raises(ValueError):
+        list(scraper.scrape_urls([core.ScrapeConfig('url')],
+                                 max_workers=max_workers, max_per_host=max_per_host))
+
+
+def test_scrape_urls_max_per_host(monkeypatch):
+    lock = threading.Lock()
+    running = collections.Counter()
+    max_running = collections.Counter()
+
+    def fake_scrape_url(config, **kwargs):
+        host = config.url.split('/')[2]
+        with lock:
+            running[host] += 1
+            max_running[host] = max(max_running[host], running[host])
+        time.sleep(0.05)
+        with lock:
+            running[host] -= 1
+        return core.ScrapeResult(config.url)
+
+    monkeypatch.setattr(scraper, 'scrape_url', fake_scrape_url)
+
+    urls = [F'http://host{idx % 2}.com/page{idx}' for idx in range(10)]
+    results = list(scraper.scrape_urls(
+        [core.ScrapeConfig(url) for url in urls], max_workers=6, max_per_host=2))
+
+    assert len(results) == len(urls)
+    assert max_running['host0.com'] == 2
+    assert max_running['host1.com'] == 2
+
+
+def test_scrape_urls_config_raises(monkeypatch):
+    def fake_scrape_url(config, **kwargs):
+        if config.url.endswith('bad'):
+            raise exceptions.ScrapeError('No Chrome')
+        return core.ScrapeResult(config.url)
+
+    monkeypatch.setattr(scraper, 'scrape_url', fake_scrape_url)
+
+    urls = ['http://host.com/good1', 'http://host.com/bad', 'http://host.com/good2']
+    results = list(scraper.scrape_urls(
+        [core.ScrapeConfig(url) for url in urls], max_workers=1, ordered=True))
+
+    assert [result.url for result in results] == urls
+    assert results[1].status == core.ScrapeStatus.ERROR
+    assert results[1].error_msg == 'EXCEPTION: ScrapeError - No Chrome'
+    assert results[2].status != core.ScrapeStatus.ERROR
+
+
+def test_scrape_urls_prefetches_dns(monkeypatch):
+    resolved_before_scrape = []
+    cache = dnscache.DnsCache()
+
+    def fake_scrape_url(config, **kwargs):
+        resolved_before_scrape.append(cache.cached('host1.com') is not None)
+        return core.ScrapeResult(config.url)
+
+    monkeypatch.setattr(transport, 'resolve', lambda host, port: ['10.0.0.1'])
+    monkeypatch.setattr(scraper, 'scrape_url', fake_scrape_url)
+
+    configs = [core.ScrapeConfig(F'http://host{idx}.com/') for idx in range(3)]
+    with http_sessions.SessionPool(dns_cache=cache) as session_pool:
+        results = list(scraper.scrape_urls(configs, session_pool=session_pool))
+
+    assert len(results) == 3
+    assert all(resolved_before_scrape)
+    assert len(cache) == 3
+
+
+########################################
+# Tests for the lazy imports
+########################################
+def test_import_requests_path_without_optional_backends():
+    code = ('import sys; import ezscrape.scraping.scraper; '
+            'print(sorted({name.split(".")[0] for name in sys.modules}))')
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+    for module in ['selenium', 'aiohttp', 'lxml', 'fake_useragent']:
+        assert F"'{module}'" not in output
+
+
+def test_scraper_selenium_module_attribute():
+    assert scraper.scraper_selenium is importlib.import_module(
+        'ezscrape.scraping.scraper_selenium')
+
+    with pytest.raises(AttributeError):
+        scraper.unknown_module
+
+
 ########################################
 # Tests for Fuction is_local_address
 ########################################
@@ -69,13 +207,38 @@ IS_LOCAL_ADDRESS = [
     (False, 'http://www.google.com'),
     (False, 'https://www.google.com'),
     (False, '15.1.1.1'),
-    (False, '8.8.8.8')
+    (False, '8.8.8.8'),
+    (True, 'http://[::1]:8000/page'),
+    (True, 'localhost:8080'),
+    (True, 'http://user@192.168.0.1:8080'),
+    (False, 'http://[2001:4860::8888]/'),
+    (False, 'http://[::1')
 ]
 @pytest.mark.parametrize('is_local, url', IS_LOCAL_ADDRESS)
 def test_is_local_address(is_local, url):
     assert scraper.is_local_address(url) == is_local
 
 
+def test_is_local_address_dns_cache(monkeypatch):
+    monkeypatch.setattr(transport, 'resolve', lambda host, port: {
+        'intranet': ['192.168.0.1'], 'mixed': ['192.168.0.1', '8.8.8.8']}[host])
+    cache = dnscache.DnsCache()
+    cache.prefetch(['intranet', 'mixed'])
+
+    assert scraper.is_local_address('http://intranet/page', dns_cache=cache)
+    assert not scraper.is_local_address('http://mixed/page', dns_cache=cache)
+    assert not scraper.is_local_address('http://intranet/page')
+    assert not scraper.is_local_address('http://uncached/page', dns_cache=cache)
+
+
+def test_is_local_address_classifier():
+    classifier = urlclass.UrlClassifier(allow=['10.0.0.0/8'], deny=['10.0.1.0/24'])
+
+    assert scraper.is_local_address('http://10.0.0.1/', classifier=classifier)
+    assert not scraper.is_local_address('http://10.0.1.1/', classifier=classifier)
+    assert not scraper.is_local_address('http://192.168.0.1/', classifier=classifier)
+
+
 ########################################
 # Tests for Fuction check_url
 ########################################
@@ -83,6 +246,27 @@ def test_local_test_server_running():
     assert scraper.check_url(common.LOCAL_SERVER_HTTP, local_only=True)
 
 
+def test_check_url_no_body_downloaded():
+    with common.SequenceServer([(200, {}, b'html')], head=True) as server:
+        assert scraper.check_url(server.url, local_only=True)
+
+    assert [method for method, _ in server.requests] == ['HEAD']
+
+
+def test_check_url_config_useragent():
+    config = core.ScrapeConfig('http://unused')
+    config.useragent = 'Test Agent'
+    with common.SequenceServer([(200, {}, b'html')], head=True) as server:
+        assert scraper.check_url(server.url, local_only=True, config=config)
+
+    assert server.requests[0][1]['User-Agent'] == 'Test Agent'
+
+
+def test_check_url_http_error():
+    with common.SequenceServer([(500, {}, b'')], head=True) as server:
+        assert not scraper.check_url(server.url, local_only=True)
+
+
 URL_ONLINE = [
     ('https://www.web.de/')
 ]
@@ -100,3 +284,12 @@ URL_FAILED = [
 def test_check_url_local_only_exception(url):
     with pytest.raises(ValueError):
         scraper.check_url(url, local_only=True)
+
+
+def test_iter_pages_streams_with_scraper_for_config():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    with scraper.iter_pages(config) as stream:
+        pages = list(stream)
+
+    assert len(pages) == 1
+    assert stream.result.status == core.ScrapeStatus.SUCCESS
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+import pytest
+
+import ezscrape.scraping.core as core
+import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.http_cache as http_cache
+import ezscrape.scraping.proxypool as proxypool
+import ezscrape.scraping.ratelimit as ratelimit
+import tests.common as common
+
+import ezscrape.scraping.scraper_aiohttp as scraper_aiohttp
+
+
+async def _collect(async_iter):
+    return [item async for item in async_iter]
+
+
+def test_async_scraper_valid_config():
+    config = core.ScrapeConfig('url')
+
+    scraper_aiohttp.AsyncRequestsScraper._validate_config(config)
+    scraper = scraper_aiohttp.AsyncRequestsScraper(config)
+    assert scraper is not None
+
+
+ASYNC_BAD_CONFIG = [
+    (True, False, False),
+    (False, True, False),
+    (False, False, True)
+]
+@pytest.mark.parametrize('xpath_located, xpath_next, wait_for_load', ASYNC_BAD_CONFIG)
+def test_async_scraper_invalid_config(xpath_located, xpath_next, wait_for_load):
+    config = core.ScrapeConfig('url')
+
+    if xpath_located:
+        config.wait_for_elem_list.append(
+            core.WaitForPageElem(core.WaitForPageType.XPATH, 'xpath_load'))
+    if xpath_next:
+        config.next_button = core.WaitForPageElem(core.WaitForPageType.XPATH, 'xpath_next')
+    if wait_for_load:
+        config.page_load_wait = 5
+
+    with pytest.raises(exceptions.ScrapeConfigError):
+        scraper_aiohttp.AsyncRequestsScraper(config)
+
+
+ASYNC_UNSUPPORTED_CONFIG = [
+    ('pagination', core.Pagination()),
+    ('page_content', core.PageContent.CHUNKS),
+    ('max_body_bytes', 1024),
+    ('proxy_pool', proxypool.ProxyPool(['http://10.0.0.1:3128'])),
+    ('cache_policy', http_cache.CachePolicy(http_cache.MemoryCache()))
+]
+@pytest.mark.parametrize('attr, value', ASYNC_UNSUPPORTED_CONFIG)
+def test_async_scraper_unsupported_config(attr, value):
+    config = core.ScrapeConfig('url')
+    setattr(config, attr, value)
+
+    with pytest.raises(exceptions.ScrapeConfigError):
+        scraper_aiohttp.AsyncRequestsScraper(config)
+
+
+ASYNC_GOOD_URLS = [
+    (common.URL_SINGLE_PAGE_JS),
+    (common.URL_SINGLE_PAGE_NO_JS),
+    (common.URL_MULTI_PAGE_NO_JS_START_GOOD)
+]
+@pytest.mark.aiohttp
+@pytest.mark.parametrize('url', ASYNC_GOOD_URLS)
+def test_async_scraper_scrape_ok(url):
+    result = asyncio.run(scraper_aiohttp.scrape_url(core.ScrapeConfig(url)))
+
+    assert result.url == url
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.request_time_ms > 0
+    assert not result.error_msg
+    assert len(result) == 1
+
+    page = result.first_page.html
+    assert common.NON_JS_TEST_STRING in page
+    assert common.JS_TEST_STRING not in page
+
+
+ASYNC_BAD_URLS = [
+    (common.URL_BAD_URL, ''),
+    (common.URL_URL_NOT_ONLINE, 'HTTP Error: 404 - Not Found')
+]
+@pytest.mark.aiohttp
+@pytest.mark.parametrize('url, error_msg', ASYNC_BAD_URLS)
+def test_async_scraper_bad_url(url, error_msg):
+    result = asyncio.run(scraper_aiohttp.scrape_url(core.ScrapeConfig(url)))
+
+    assert not result
+    assert result.url == url
+    assert result.status == core.ScrapeStatus.ERROR
+    assert error_msg in result.error_msg
+
+
+@pytest.mark.aiohttp
+def test_async_scraper_scrape_timeout():
+    config = core.ScrapeConfig(common.URL_TIMEOUT)
+    config.request_timeout = 2
+    result = asyncio.run(scraper_aiohttp.scrape_url(config))
+
+    assert not result
+    assert result.status == core.ScrapeStatus.TIMEOUT
+    assert result.error_msg
+
+
+@pytest.mark.aiohttp
+@pytest.mark.parametrize('ordered', [True, False])
+def test_async_scrape_urls(ordered):
+    urls = [common.URL_SINGLE_PAGE_NO_JS, common.URL_URL_NOT_ONLINE] * 10
+    configs = [core.ScrapeConfig(url) for url in urls]
+
+    results = asyncio.run(_collect(scraper_aiohttp.scrape_urls(
+        configs, max_concurrency=5, max_per_host=2, ordered=ordered)))
+
+    if ordered:
+        assert [result.url for result in results] == urls
+    else:
+        assert sorted(result.url for result in results) == sorted(urls)
+
+
+@pytest.mark.aiohttp
+def test_async_scrape_urls_rate_limited():
+    limiter = ratelimit.RateLimiter(20, burst=1, max_per_host=1)
+    configs = []
+    for _ in range(3):
+        config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+        config.rate_limiter = limiter
+        configs.append(config)
+
+    async def _scrape_all():
+        return [result async for result in scraper_aiohttp.scrape_urls(configs)]
+
+    start = time.monotonic()
+    results = asyncio.run(_scrape_all())
+
+    assert all(result.status == core.ScrapeStatus.SUCCESS for result in results)
+    assert time.monotonic() - start >= 0.09
+    assert limiter._hosts['127.0.0.1'].in_flight == 0
+
+
+@pytest.mark.aiohttp
+def test_async_scraper_retry():
+    with common.SequenceServer([(503, {}, b''), (200, {}, b'ok')]) as server:
+        config = core.ScrapeConfig(server.url)
+        config.retry_policy = core.RetryPolicy(backoff_base=0.01)
+        result = asyncio.run(scraper_aiohttp.scrape_url(config))
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.first_page.html == 'ok'
+    assert [attempt.status_code for attempt in result.attempts] == [503, 200]
+
+
+@pytest.mark.parametrize('max_concurrency, max_per_host', [(0, 0), (1, -1)])
+def test_async_scrape_urls_invalid_limits(max_concurrency, max_per_host):
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(scraper_aiohttp.scrape_urls(
+            [], max_concurrency=max_concurrency, max_per_host=max_per_host)))
@@ -2,6 +2,8 @@ import pytest
 
 import ezscrape.scraping.core as core
 import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.http_sessions as http_sessions
+import ezscrape.scraping.timing as timing
 import ezscrape.scraping.web_lib as web_lib
 import tests.common as common
 
@@ -17,12 +19,13 @@ def test_requests_scraper_valid_config():
 
 
 REQUESTS_BAD_CONFIG = [
-    (True, False, False),
-    (False, True, False),
-    (False, False, True)
+    (True, False, False, False),
+    (False, True, False, False),
+    (False, False, True, False),
+    (False, False, False, True)
 ]
-@pytest.mark.parametrize('xpath_located, xpath_next, wait_for_load', REQUESTS_BAD_CONFIG)
-def test_requests_scraper_invalid_config(xpath_located, xpath_next, wait_for_load):
+@pytest.mark.parametrize('xpath_located, xpath_next, wait_for_load, extract', REQUESTS_BAD_CONFIG)
+def test_requests_scraper_invalid_config(xpath_located, xpath_next, wait_for_load, extract):
     config = core.ScrapeConfig('url')
 
     if xpath_located:
@@ -32,6 +35,8 @@ def test_requests_scraper_invalid_config(xpath_located, xpath_next, wait_for_loa
         config.next_button = core.WaitForPageElem(core.WaitForPageType.XPATH, 'xpath_next')
     if wait_for_load:
         config.page_load_wait = 5
+    if extract:
+        config.extract_elem_list.append(core.WaitForCssElem('p.price'))
 
     # Failed if We check the Config Directly
     with pytest.raises(exceptions.ScrapeConfigError):
@@ -101,6 +106,161 @@ def test_requests_scraper_scrape_timeout():
     assert not result
     assert result.request_time_ms < (config.request_timeout + 0.5) * 1000  # Account for function overhead
 
+@pytest.mark.requests
+def test_requests_scraper_page_keeps_content():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    result = scraper_requests.RequestsScraper(config).scrape()
+    page = result.first_page
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert page.chunks is None
+    assert common.NON_JS_TEST_STRING.encode() in page.content
+    assert page.html == page.content.decode(page.encoding)
+
+
+@pytest.mark.requests
+def test_requests_scraper_phase_timings():
+    body = b'<html>' + b'x' * 100000 + b'</html>'
+    with common.SequenceServer([(200, {}, body)]) as server:
+        with http_sessions.SessionPool() as session_pool:
+            config = core.ScrapeConfig(server.url)
+            results = [scraper_requests.RequestsScraper(config, session_pool=session_pool).scrape()
+                       for _ in range(2)]
+
+    # The first request opens the connection, the second reuses it
+    assert set(results[0].first_page.timings) == {
+        timing.PHASE_DNS, timing.PHASE_CONNECT, timing.PHASE_TTFB, timing.PHASE_DOWNLOAD}
+    assert set(results[1].first_page.timings) == {timing.PHASE_TTFB, timing.PHASE_DOWNLOAD}
+
+    for result in results:
+        page = result.first_page
+        assert result.status == core.ScrapeStatus.SUCCESS
+        assert sum(page.timings.values()) <= page.request_time_ms
+        assert page.request_time_ms < 5000
+
+        assert page.html
+        assert timing.PHASE_DECODE in page.timings
+
+
+@pytest.mark.requests
+def test_requests_scraper_connection():
+    with common.SequenceServer([(200, {}, b'html')]) as server:
+        with http_sessions.SessionPool() as session_pool:
+            config = core.ScrapeConfig(server.url)
+            results = [scraper_requests.RequestsScraper(config, session_pool=session_pool).scrape()
+                       for _ in range(2)]
+
+    for result in results:
+        assert result.caller_ip == '127.0.0.1'
+        assert result.connection.peer_ip == '127.0.0.1'
+
+    assert not results[0].connection.reused
+    assert results[1].connection.reused
+
+
+@pytest.mark.requests
+def test_requests_scraper_page_content_chunks():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    config.page_content = core.PageContent.CHUNKS
+    config.chunk_size = 16
+    result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.first_page.content is None
+    assert result.first_page.html == ''
+
+    chunks = list(result.first_page.chunks)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 16 for chunk in chunks)
+    assert common.NON_JS_TEST_STRING.encode() in b''.join(chunks)
+
+
+@pytest.mark.requests
+@pytest.mark.parametrize('page_content', [
+    core.PageContent.FULL, core.PageContent.CHUNKS])
+def test_requests_scraper_content_length_too_large(page_content):
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    config.page_content = page_content
+    config.max_body_bytes = 10
+    result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert not result
+    assert result.status == core.ScrapeStatus.BODY_TOO_LARGE
+    assert 'Content-Length' in result.error_msg
+    assert len(result) == 0
+
+
+class FakeStreamResponse():
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+def test_requests_scraper_body_too_large_while_streaming():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_NO_JS)
+    config.max_body_bytes = 10
+    scraper = scraper_requests.RequestsScraper(config)
+
+    resp = FakeStreamResponse([b'123456', b'789', b'0'])
+    assert list(scraper._iter_body(resp)) == [b'123456', b'789', b'0']
+
+    resp = FakeStreamResponse([b'123456', b'7890', b'1'])
+    chunks = scraper._iter_chunks(resp)
+    assert next(chunks) == b'123456'
+    assert next(chunks) == b'7890'
+    with pytest.raises(exceptions.ScrapeBodyTooLargeError):
+        next(chunks)
+    assert resp.closed
+
+
+RETRY_RESPONSES = [
+    ([(503, {}, b''), (502, {}, b''), (200, {}, b'ok')], 3, core.ScrapeStatus.SUCCESS),
+    ([(503, {}, b''), (503, {}, b''), (503, {}, b''), (200, {}, b'ok')], 3, core.ScrapeStatus.ERROR),
+    ([(404, {}, b''), (200, {}, b'ok')], 1, core.ScrapeStatus.ERROR)
+]
+@pytest.mark.requests
+@pytest.mark.parametrize('responses, attempts, status', RETRY_RESPONSES)
+def test_requests_scraper_retry(responses, attempts, status):
+    with common.SequenceServer(responses) as server:
+        config = core.ScrapeConfig(server.url)
+        config.retry_policy = core.RetryPolicy(max_attempts=3, backoff_base=0.01)
+        result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert server.request_count == attempts
+    assert result.status == status
+    assert len(result.attempts) == attempts
+    assert [attempt.status_code for attempt in result.attempts] == [
+        response[0] for response in responses[:attempts]]
+    assert result.status_code == responses[attempts - 1][0]
+
+
+@pytest.mark.requests
+def test_requests_scraper_retry_after():
+    responses = [(503, {'Retry-After': '1'}, b''), (200, {}, b'ok')]
+    with common.SequenceServer(responses) as server:
+        config = core.ScrapeConfig(server.url)
+        config.retry_policy = core.RetryPolicy(backoff_base=0.01)
+        result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.attempts[1].wait_ms >= 1000
+
+
+@pytest.mark.requests
+def test_requests_scraper_no_retry_policy():
+    with common.SequenceServer([(503, {}, b''), (200, {}, b'ok')]) as server:
+        result = scraper_requests.RequestsScraper(core.ScrapeConfig(server.url)).scrape()
+
+    assert result.status == core.ScrapeStatus.ERROR
+    assert len(result.attempts) == 1
+    assert result.attempts[0].duration_ms > 0
+
 #TODO - ADD SOME PROXY TESTS
 #TODO - Proxy List should probably come from Env Variables for testing
 #'''
@@ -145,3 +305,71 @@ def test_proxies(url, http_proxy, https_proxy):
     assert html_ip == proxy_ip
     '''
 #'''
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_requests_scraper_pagination(prefetch):
+    config = core.ScrapeConfig(common.URL_MULTI_PAGE_NO_JS_START_GOOD)
+    config.pagination = core.Pagination(core.WaitForXpathElem('''//a[text()='Next']'''), prefetch=prefetch)
+
+    result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert [F'THIS IS PAGE {idx}/3' in page.html for idx, page in enumerate(result, start=1)] == [True] * 3
+    assert len(result.attempts) == 3
+
+
+def test_requests_scraper_pagination_max_pages():
+    config = core.ScrapeConfig(common.URL_MULTI_PAGE_NO_JS_START_GOOD)
+    config.pagination = core.Pagination(core.WaitForXpathElem('''//a[text()='Next']'''))
+    config.max_pages = 2
+
+    assert len(scraper_requests.RequestsScraper(config).scrape()) == 2
+
+
+def test_requests_scraper_pagination_stream_prefetch():
+    config = core.ScrapeConfig(common.URL_MULTI_PAGE_NO_JS_START_GOOD)
+    config.pagination = core.Pagination(core.WaitForXpathElem('''//a[text()='Next']'''), prefetch=True)
+
+    with scraper_requests.RequestsScraper(config).iter_pages() as stream:
+        assert 'THIS IS PAGE 1/3' in next(stream).html
+        assert 'THIS IS PAGE 2/3' in next(stream).html
+
+    assert stream.result.status == core.ScrapeStatus.SUCCESS
+    assert len(stream.result) == 0
+
+
+def test_requests_scraper_pagination_stops_at_seen_page():
+    body = b'<html><body><a rel="next" href="page.html">Next</a></body></html>'
+    with common.SequenceServer([(200, {}, body)]) as server:
+        config = core.ScrapeConfig(server.url)
+        config.pagination = core.Pagination()
+
+        result = scraper_requests.RequestsScraper(config).scrape()
+
+        assert len(result) == 1
+        assert server.request_count == 1
+
+
+def test_requests_scraper_pagination_next_page_fails():
+    responses = [(200, {}, b'<html><body><a rel="next" href="page2.html">Next</a></body></html>'),
+                 (404, {}, b'')]
+    with common.SequenceServer(responses) as server:
+        config = core.ScrapeConfig(server.url)
+        config.pagination = core.Pagination()
+
+        result = scraper_requests.RequestsScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.ERROR
+    assert result.status_code == 404
+    assert len(result) == 1
+    assert len(result.attempts) == 2
+
+
+def test_requests_scraper_pagination_chunks_invalid():
+    config = core.ScrapeConfig('url')
+    config.pagination = core.Pagination()
+    config.page_content = core.PageContent.CHUNKS
+
+    with pytest.raises(exceptions.ScrapeConfigError):
+        scraper_requests.RequestsScraper(config)
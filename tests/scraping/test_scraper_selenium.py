@@ -1,12 +1,18 @@
+import threading
+
 import pytest
 
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+import ezscrape.scraping.browser_resources as browser_resources
 import ezscrape.scraping.core as core
+import ezscrape.scraping.proxypool as proxypool
+import ezscrape.scraping.timing as timing
 import ezscrape.scraping.exceptions as exceptions
+import ezscrape.scraping.useragent as useragent
 import tests.common as common
 
 import ezscrape.scraping.scraper_selenium as scraper_selenium
@@ -20,6 +26,30 @@ def test_selenium_scraper_valid_config():
     assert scraper is not None
 
 
+def test_selenium_scraper_no_page_source_without_extracts():
+    config = core.ScrapeConfig('url')
+    config.include_page_source = False
+
+    with pytest.raises(exceptions.ScrapeConfigError):
+        scraper_selenium.SeleniumChromeScraper(config)
+
+    config.extract_elem_list.append(core.WaitForCssElem('p'))
+    assert scraper_selenium.SeleniumChromeScraper(config)
+
+
+@pytest.mark.parametrize('attr, value', [
+    ('proxy_http', 'http://10.0.0.1:3128'),
+    ('proxy_https', 'http://10.0.0.1:3128'),
+    ('proxy_pool', proxypool.ProxyPool(['http://10.0.0.1:3128']))])
+def test_selenium_scraper_allowed_hosts_with_proxy(attr, value):
+    config = core.ScrapeConfig('http://website.com')
+    config.resource_policy = core.ResourcePolicy(allowed_hosts=['cdn.com'])
+    setattr(config, attr, value)
+
+    with pytest.raises(exceptions.ScrapeConfigError):
+        scraper_selenium.SeleniumChromeScraper(config)
+
+
 def test_selenium_scraper_invalid_config():
     config = None
 
@@ -38,7 +68,8 @@ def test_get_by_type_from_page_wait_element_all_handled():
 
 
 WAIT_TYPE_TO_BY_TYPE_GOOD = [
-    (core.WaitForPageType.XPATH, By.XPATH)
+    (core.WaitForPageType.XPATH, By.XPATH),
+    (core.WaitForPageType.CSS, By.CSS_SELECTOR)
 ]
 @pytest.mark.parametrize('wait_type, expected_by_type', WAIT_TYPE_TO_BY_TYPE_GOOD)
 def test_get_by_type_from_page_wait_element(wait_type, expected_by_type):
@@ -331,4 +362,682 @@ def test_class_ScraperWait_1_of_2_might_haves():
         assert my_elem == elem
 
 
+class FakeElement():
+    def __init__(self, *, displayed=True, enabled=True):
+        self.displayed = displayed
+        self.enabled = enabled
+
+    def is_displayed(self):
+        return self.displayed
+
+    def is_enabled(self):
+        return self.enabled
+
+
+class FakeWaitDriver():
+    """Driver finding the elements by locator, the script finds the same."""
+
+    def __init__(self, elements, *, script_error=False, invalid=(), observe_timeout=False):
+        self.elements = elements
+        self.script_error = script_error
+        self.invalid = invalid
+        self.observe_timeout = observe_timeout
+        self.script_timeouts = []
+        self.calls = []
+
+    def execute_script(self, script, conditions):
+        self.calls.append('execute_script')
+        if self.script_error:
+            raise WebDriverException('scripts disabled')
+        return self._checks(conditions)
+
+    def execute_async_script(self, script, conditions, timeout_ms, recheck_ms):
+        self.calls.append(F'execute_async_script {timeout_ms} {recheck_ms}')
+        if self.script_error:
+            raise WebDriverException('document unloaded')
+        if self.observe_timeout:
+            return None
+        return self._checks(conditions)
+
+    def set_script_timeout(self, timeout):
+        self.script_timeouts.append(timeout)
+
+    def _checks(self, conditions):
+        checks = []
+        for by, locator, clickable, *_ in conditions:
+            elem = self.elements.get(locator)
+            if locator in self.invalid:
+                checks.append(['invalid', None])
+            elif (elem is None) or (clickable and not (elem.displayed and elem.enabled)):
+                checks.append(['missing', None])
+            else:
+                checks.append(['found', elem])
+        return checks
+
+    def find_element(self, by, locator):
+        self.calls.append(F'find_element {locator}')
+        if locator not in self.elements:
+            raise NoSuchElementException(locator)
+        return self.elements[locator]
+
+
+def _wait_conditions(*conditions):
+    return [scraper_selenium.WaitCondition((by, locator), scraper_selenium.WaitLogic.MUST_HAVE, wait_type)
+            for by, locator, wait_type in conditions]
+
+
+def test_class_ScraperWait_script_single_round_trip():
+    located = FakeElement()
+    hidden = FakeElement(displayed=False)
+    driver = FakeWaitDriver({'//p': located, '//a': hidden})
+    conditions = _wait_conditions(
+        (By.XPATH, '//p', scraper_selenium.WaitType.WAIT_FOR_LOCATED),
+        (By.XPATH, '//a', scraper_selenium.WaitType.WAIT_FOR_CLICKABLE))
+    scraper_wait = scraper_selenium.ScraperWait(conditions)
+
+    assert scraper_wait(driver) is False
+    assert driver.calls == ['execute_script']
+
+    # Only the outstanding condition is checked again
+    hidden.displayed = True
+    assert scraper_wait(driver) is located
+    assert driver.calls == ['execute_script', 'execute_script']
+    assert scraper_wait.polls == 2
+    assert scraper_wait.found_elements == {conditions[0].key: located, conditions[1].key: hidden}
+
+
+def test_class_ScraperWait_script_invalid_locator_per_element():
+    elem = FakeElement()
+    driver = FakeWaitDriver({'//p': elem, 'text()': elem}, invalid=['text()'])
+    conditions = _wait_conditions(
+        (By.XPATH, '//p', scraper_selenium.WaitType.WAIT_FOR_LOCATED),
+        (By.XPATH, 'text()', scraper_selenium.WaitType.WAIT_FOR_LOCATED),
+        (By.NAME, 'name', scraper_selenium.WaitType.WAIT_FOR_LOCATED))
+
+    assert scraper_selenium.ScraperWait(conditions)(driver) is False
+    assert driver.calls == ['execute_script', 'find_element name', 'find_element text()']
+
+
+def test_class_ScraperWait_script_error_falls_back():
+    elem = FakeElement()
+    driver = FakeWaitDriver({'//p': elem}, script_error=True)
+    conditions = _wait_conditions((By.XPATH, '//p', scraper_selenium.WaitType.WAIT_FOR_CLICKABLE))
+    scraper_wait = scraper_selenium.ScraperWait(conditions + _wait_conditions(
+        (By.XPATH, '//a', scraper_selenium.WaitType.WAIT_FOR_LOCATED)))
+
+    assert scraper_wait(driver) is False
+    assert scraper_wait(driver) is False
+    assert driver.calls == ['execute_script', 'find_element //p', 'find_element //a', 'find_element //a']
+
+
+def test_class_ScraperWait_elements_strategy():
+    elem = FakeElement()
+    driver = FakeWaitDriver({'//p': elem})
+    conditions = _wait_conditions((By.XPATH, '//p', scraper_selenium.WaitType.WAIT_FOR_CLICKABLE))
+
+    scraper_wait = scraper_selenium.ScraperWait(conditions, strategy=core.WaitStrategy.ELEMENTS)
+
+    assert scraper_wait(driver) is elem
+    assert driver.calls == ['find_element //p']
+
+
+def test_class_ScraperWait_observe():
+    elem = FakeElement()
+    driver = FakeWaitDriver({'//p': elem})
+    conditions = _wait_conditions((By.XPATH, '//p', scraper_selenium.WaitType.WAIT_FOR_CLICKABLE))
+    scraper_wait = scraper_selenium.ScraperWait(conditions, strategy=core.WaitStrategy.OBSERVE)
+
+    assert scraper_wait.observe(driver, 10, 0.25) is elem
+    assert driver.calls == ['execute_async_script 10000 250']
+    assert driver.script_timeouts == [
+        10 + scraper_selenium.OBSERVE_SCRIPT_TIMEOUT_MARGIN, scraper_selenium.DEFAULT_SCRIPT_TIMEOUT]
+    assert scraper_wait.polls == 1
+    assert scraper_wait.found_elements == {conditions[0].key: elem}
+
+
+def test_class_ScraperWait_observe_timeout():
+    driver = FakeWaitDriver({}, observe_timeout=True)
+    conditions = _wait_conditions((By.XPATH, '//p', scraper_selenium.WaitType.WAIT_FOR_LOCATED))
+
+    with pytest.raises(TimeoutException):
+        scraper_selenium.ScraperWait(conditions, strategy=core.WaitStrategy.OBSERVE).observe(driver, 1, 0.5)
+    assert driver.script_timeouts[-1] == scraper_selenium.DEFAULT_SCRIPT_TIMEOUT
+
+
+@pytest.mark.parametrize('driver_kwargs, by, locator', [
+    ({'script_error': True}, By.XPATH, '//p'),
+    ({'invalid': ['text()']}, By.XPATH, 'text()'),
+    ({}, By.NAME, 'name')])
+def test_class_ScraperWait_observe_falls_back_to_polling(driver_kwargs, by, locator):
+    elem = FakeElement()
+    driver = FakeWaitDriver({locator: elem}, **driver_kwargs)
+    conditions = _wait_conditions((by, locator, scraper_selenium.WaitType.WAIT_FOR_LOCATED))
+    scraper_wait = scraper_selenium.ScraperWait(conditions, strategy=core.WaitStrategy.OBSERVE)
+
+    assert scraper_wait.observe(driver, 1, 0.5) is False
+    assert scraper_wait(driver) is elem
+
+
+@pytest.mark.selenium
+@pytest.mark.parametrize('strategy', [core.WaitStrategy.SCRIPT, core.WaitStrategy.ELEMENTS, core.WaitStrategy.OBSERVE])
+def test_selenium_scraper_wait_strategy(strategy):
+    config = core.ScrapeConfig(common.URL_MULTI_PAGE_JS_STATIC_LINKS_WITH_STATE_01)
+    config.wait_for_elem_list.append(core.WaitForXpathElem(R'''//a[@title='page1']'''))
+    config.wait_for_elem_list.append(core.WaitForXpathElem(R'''//a[@title='page2']'''))
+    config.wait_strategy = strategy
+    config.wait_poll_frequency = 0.1
+
+    result = scraper_selenium.SeleniumChromeScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert 'MultiPageJS_STATIC_LINKS_WITH_STATE_2.html' in result.first_page.html
+
+
+@pytest.mark.selenium
+def test_selenium_scraper_resource_policy():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_JS_DELAYED)
+    config.wait_for_elem_list.append(core.WaitForXpathElem(R'''//p[contains(text(),'LOADED-Javascript Line')]'''))
+    config.page_load_strategy = core.PageLoadStrategy.EAGER
+    config.resource_policy = core.ResourcePolicy(
+        blocked_types=frozenset(core.ResourceType), allowed_hosts=[])
+
+    result = scraper_selenium.SeleniumChromeScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert 'LOADED-Javascript Line' in result.first_page.html
+
+
+class FakeDriver():
+    def __init__(self, *, fail_reset=False, cdp=True):
+        self.fail_reset = fail_reset
+        self.cdp = cdp
+        self.calls = []
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if self.fail_reset:
+            raise WebDriverException('crashed')
+        self.calls.append('execute_script')
+
+    def execute_cdp_cmd(self, cmd, args):
+        if self.fail_reset or not self.cdp:
+            raise WebDriverException('cdp not supported')
+        self.calls.append(cmd)
+
+    def set_page_load_timeout(self, timeout):
+        self.calls.append(('page_load_timeout', timeout))
+
+    def set_script_timeout(self, timeout):
+        self.calls.append(('script_timeout', timeout))
+
+    def delete_all_cookies(self):
+        self.calls.append('delete_all_cookies')
+
+    def get(self, url):
+        self.calls.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeExtractDriver():
+    page_source = '<html><p>a</p></html>'
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_script(self, script, locators):
+        self.calls.append(locators)
+        return [[['<p>a</p>', 'a'], ['<p class="b">b</p>', 'b']], None]
+
+
+def test_extract_elements():
+    driver = FakeExtractDriver()
+    extracts = scraper_selenium.extract_elements(driver, [core.WaitForCssElem('p'), core.WaitForXpathElem('//[')])
+
+    assert driver.calls == [[[By.CSS_SELECTOR, 'p'], [By.XPATH, '//[']]]
+    assert extracts == {
+        (core.WaitForPageType.CSS, 'p'): [core.ExtractedElem('<p>a</p>', 'a'),
+                                          core.ExtractedElem('<p class="b">b</p>', 'b')],
+        (core.WaitForPageType.XPATH, '//['): []}
+
+
+def test_extract_elements_same_text():
+    # Each locator type gets its own matches even with the same text
+    driver = FakeExtractDriver()
+    elems = [core.WaitForCssElem('p'), core.WaitForXpathElem('p')]
+    extracts = scraper_selenium.extract_elements(driver, elems)
+
+    assert len(extracts) == 2
+    assert extracts[elems[0].key][0].text == 'a'
+    assert extracts[elems[1].key] == []
+
+
+@pytest.mark.parametrize('include_page_source', [True, False])
+def test_selenium_scraper_capture_page_extracts(include_page_source):
+    config = core.ScrapeConfig('http://website.com')
+    config.extract_elem_list.append(core.WaitForCssElem('p'))
+    config.include_page_source = include_page_source
+    phase_timer = timing.PhaseTimer()
+
+    page = scraper_selenium.SeleniumChromeScraper(config)._capture_page(
+        FakeExtractDriver(), phase_timer, core.ScrapeStatus.SUCCESS)
+
+    assert page.extracts[config.extract_elem_list[0].key][0].text == 'a'
+    assert timing.PHASE_EXTRACT in page.timings
+    assert (timing.PHASE_PAGE_SOURCE in page.timings) is include_page_source
+    assert page.html == (FakeExtractDriver.page_source if include_page_source else '')
+
+
+@pytest.mark.selenium
+def test_selenium_scraper_extract_without_page_source():
+    config = core.ScrapeConfig(common.URL_SINGLE_PAGE_JS_DELAYED)
+    config.wait_for_elem_list.append(core.WaitForXpathElem(R'''//p[contains(text(),'LOADED-Javascript Line')]'''))
+    config.extract_elem_list.append(core.WaitForXpathElem(R'''//p[contains(text(),'LOADED-Javascript Line')]'''))
+    config.include_page_source = False
+
+    result = scraper_selenium.SeleniumChromeScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert result.first_page.html == ''
+    extracted = result.first_page.extracts[config.extract_elem_list[0].key]
+    assert 'LOADED-Javascript Line' in extracted[0].text
+    assert extracted[0].html.startswith('<p')
+
+
+def test_blocked_url_patterns():
+    policy = core.ResourcePolicy(blocked_types=frozenset({core.ResourceType.STYLESHEET, core.ResourceType.FONT}),
+                                 blocked_urls=['*://tracker.com/*'])
+
+    patterns = browser_resources.blocked_url_patterns(policy)
+
+    assert patterns[0] == '*://tracker.com/*'
+    assert '*.css' in patterns
+    assert '*.woff2?*' in patterns
+    assert '*.png' not in patterns
+    assert browser_resources.blocked_url_patterns(None) == []
+
+
+def test_host_resolver_rules():
+    assert browser_resources.host_resolver_rules(['website.com', '*.cdn.com', 'website.com']) ==\
+        'MAP * ~NOTFOUND, EXCLUDE website.com, EXCLUDE *.cdn.com'
+
+
+@pytest.mark.parametrize('attr, value, requires', [
+    (None, None, False),
+    ('proxy_http', 'http://10.0.0.1:3128', True),
+    ('useragent', 'Mozilla/5.0 Test', True),
+    ('useragent_provider', useragent.StaticUserAgentProvider('Mozilla/5.0 Test'), True),
+    ('page_load_strategy', core.PageLoadStrategy.EAGER, True),
+    ('resource_policy', core.ResourcePolicy(blocked_types=frozenset({core.ResourceType.IMAGE})), False),
+    ('resource_policy', core.ResourcePolicy(allowed_hosts=['website.com']), True)])
+def test_requires_launch_options(attr, value, requires):
+    config = core.ScrapeConfig('http://website.com')
+    if attr is not None:
+        setattr(config, attr, value)
+
+    assert scraper_selenium.requires_launch_options(config) is requires
+
+
+def test_blocked_urls_unblocked_after_scrape():
+    driver = FakeDriver()
+
+    with browser_resources.blocked_urls(driver, ['*.png']):
+        assert driver.calls == ['Network.enable', 'Network.setBlockedURLs']
+    assert driver.calls == ['Network.enable', 'Network.setBlockedURLs', 'Network.setBlockedURLs']
+
+    driver = FakeDriver()
+    with browser_resources.blocked_urls(driver, []):
+        pass
+    assert driver.calls == []
+
+
+def test_blocked_urls_not_supported():
+    # Drivers other than Chrome have no cdp commands
+    driver = FakeWaitDriver({})
+
+    with browser_resources.blocked_urls(driver, ['*.png']):
+        pass
+
+
+class FakeNextButton():
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.calls.append('click')
+        self.driver.page += 1
+
+
+class FakePagingDriver():
+    """Driver with a next button on every page."""
+
+    def __init__(self):
+        self.page = 0
+        self.calls = []
+
+    def get(self, url):
+        self.calls.append(url)
+        self.page = 1 if url != 'about:blank' else 0
+
+    def execute_script(self, script, *args):
+        if args:
+            return [['found', FakeNextButton(self)]]
+        return None
+
+    def execute_cdp_cmd(self, cmd, args):
+        pass
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    @property
+    def page_source(self):
+        return F'<html>page {self.page}</html>'
+
+    def quit(self):
+        pass
+
+
+class FakePagingSession():
+    def __init__(self, *, proxy=None):
+        self.proxy = proxy
+        self.driver = FakePagingDriver()
+
+    def close(self):
+        self.driver.quit()
+
+
+def _paging_config(max_pages):
+    config = core.ScrapeConfig('http://website.com')
+    config.next_button = core.WaitForXpathElem(R'''//a[@title='next']''')
+    config.max_pages = max_pages
+    return config
+
+
+def test_selenium_scraper_iter_pages_lazy():
+    driver = FakePagingDriver()
+    stream = scraper_selenium.SeleniumChromeScraper(_paging_config(3), driver=driver).iter_pages()
+    assert driver.calls == []
+
+    assert next(stream).html == '<html>page 1</html>'
+    assert driver.calls == ['http://website.com']
+
+    # The next button is clicked once the next page is requested
+    assert [page.html for page in stream] == ['<html>page 2</html>', '<html>page 3</html>']
+    assert driver.calls == ['http://website.com', 'click', 'click']
+    assert stream.result.status == core.ScrapeStatus.SUCCESS
+    assert len(stream.result) == 0
+    assert len(stream.result.attempts) == 1
+
+
+def test_selenium_scraper_iter_pages_close_releases_driver():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakePagingSession) as pool:
+        scraper = scraper_selenium.SeleniumChromeScraper(_paging_config(10), driver_pool=pool)
+
+        with scraper.iter_pages() as stream:
+            next(stream)
+            assert pool.stats.in_use == 1
+
+        stats = pool.stats
+        assert stats.in_use == 0
+        assert stats.idle == 1
+        assert stats.recycles == 0
+
+        # Complete scrapes keep the pages in the result
+        result = scraper.scrape()
+        assert len(result) == 10
+        assert result.status == core.ScrapeStatus.SUCCESS
+
+
+class FakeSession():
+    def __init__(self, *, proxy=None):
+        self.driver = FakeDriver()
+        self.driver.proxy = proxy
+
+    def close(self):
+        self.driver.quit()
+
+
+def test_driver_pool_prewarm():
+    with scraper_selenium.ChromeDriverPool(3, session_factory=FakeSession) as pool:
+        stats = pool.stats
+        assert stats.launches == 3
+        assert stats.idle == 3
+        assert stats.in_use == 0
+
+
+def test_driver_pool_lazy_launch():
+    with scraper_selenium.ChromeDriverPool(2, prewarm=False, session_factory=FakeSession) as pool:
+        assert pool.stats.launches == 0
+
+        driver = pool.acquire()
+        assert pool.stats.launches == 1
+        assert pool.stats.in_use == 1
+
+        pool.release(driver)
+        assert pool.stats.idle == 1
+        assert pool.stats.in_use == 0
+
+
+def test_driver_pool_reuse_and_reset():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakeSession) as pool:
+        with pool.lease() as driver1:
+            pass
+        with pool.lease() as driver2:
+            pass
+
+        assert driver1 is driver2
+        assert pool.stats.leases == 2
+        assert pool.stats.launches == 1
+        assert driver1.calls == [
+            'Storage.clearDataForOrigin', 'Network.clearBrowserCookies', 'Network.clearBrowserCache',
+            ('page_load_timeout', scraper_selenium.DEFAULT_PAGE_LOAD_TIMEOUT),
+            ('script_timeout', scraper_selenium.DEFAULT_SCRIPT_TIMEOUT),
+            'about:blank'] * 2
+
+
+def test_driver_pool_reset_without_cdp():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakeSession) as pool:
+        with pool.lease() as driver:
+            driver.cdp = False
+            driver.set_page_load_timeout(5)
+
+        assert driver.calls == [
+            ('page_load_timeout', 5), 'execute_script', 'delete_all_cookies',
+            ('page_load_timeout', scraper_selenium.DEFAULT_PAGE_LOAD_TIMEOUT),
+            ('script_timeout', scraper_selenium.DEFAULT_SCRIPT_TIMEOUT),
+            'about:blank']
+
+
+def test_driver_pool_recycle_after_max_pages():
+    with scraper_selenium.ChromeDriverPool(
+            1, max_pages_per_driver=3, session_factory=FakeSession) as pool:
+        driver1 = pool.acquire()
+        pool.release(driver1, pages=2)
+        driver2 = pool.acquire()
+        pool.release(driver2, pages=1)
+
+        assert driver1 is driver2
+        assert driver1.quit_called
+        assert pool.stats.recycles == 1
+
+        driver3 = pool.acquire()
+        assert driver3 is not driver1
+        assert pool.stats.launches == 2
+        pool.release(driver3)
+
+
+def test_driver_pool_recycle_broken():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakeSession) as pool:
+        with pytest.raises(RuntimeError):
+            with pool.lease() as driver:
+                raise RuntimeError('Scrape failed')
+
+        assert driver.quit_called
+        assert pool.stats.recycles == 1
+        assert pool.stats.idle == 0
+
+
+def test_driver_pool_recycle_failed_reset():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakeSession) as pool:
+        driver = pool.acquire()
+        driver.fail_reset = True
+        pool.release(driver)
+
+        assert driver.quit_called
+        assert pool.stats.recycles == 1
+
+
+def test_driver_pool_wait_for_driver():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakeSession) as pool:
+        driver = pool.acquire()
+        timer = threading.Timer(0.1, pool.release, args=(driver,))
+        timer.start()
+
+        assert pool.acquire(timeout=5) is driver
+        assert pool.stats.waits == 1
+        assert pool.stats.wait_time_ms > 0
+        pool.release(driver)
+
+
+def test_driver_pool_wait_timeout():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakeSession) as pool:
+        driver = pool.acquire()
+        with pytest.raises(TimeoutException):
+            pool.acquire(timeout=0.1)
+        pool.release(driver)
+
+
+def test_driver_pool_close():
+    pool = scraper_selenium.ChromeDriverPool(2, session_factory=FakeSession)
+    leased = pool.acquire()
+    idle = pool.acquire()
+    pool.release(idle)
+    pool.close()
+
+    assert idle.quit_called
+    assert not leased.quit_called
+    with pytest.raises(scraper_selenium.SeleniumSetupError):
+        pool.acquire()
+
+    pool.release(leased)
+    assert leased.quit_called
+
+
+def test_driver_pool_for_proxy():
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakeSession) as pool:
+        proxy_pool = pool.for_proxy('http://proxy1:80')
+        assert pool.for_proxy('http://proxy1:80') is proxy_pool
+        assert proxy_pool.stats.launches == 0
+
+        with proxy_pool.lease() as driver:
+            assert driver.proxy == 'http://proxy1:80'
+
+        assert pool.stats.launches == 1
+        assert proxy_pool.stats.launches == 1
+        assert proxy_pool.stats.idle == 1
+
+    assert proxy_pool.closed
+    assert driver.quit_called
+
+
+def test_driver_pool_for_proxy_evicts_oldest():
+    with scraper_selenium.ChromeDriverPool(1, max_proxy_pools=2, session_factory=FakeSession) as pool:
+        proxy_pool1 = pool.for_proxy('http://proxy1:80')
+        proxy_pool2 = pool.for_proxy('http://proxy2:80')
+        pool.for_proxy('http://proxy1:80')
+        pool.for_proxy('http://proxy3:80')
+
+        assert not proxy_pool1.closed
+        assert proxy_pool2.closed
+
+
+def test_driver_pool_prewarm_failed_launch():
+    sessions = []
+    lock = threading.Lock()
+
+    def session_factory():
+        with lock:
+            if sessions:
+                raise scraper_selenium.SeleniumSetupError('Chrome crashed')
+            sessions.append(FakeSession())
+            return sessions[-1]
+
+    with pytest.raises(scraper_selenium.SeleniumSetupError):
+        scraper_selenium.ChromeDriverPool(3, session_factory=session_factory)
+
+    assert len(sessions) == 1
+    assert sessions[0].driver.quit_called
+
+
+@pytest.mark.parametrize('size, max_pages', [(0, 1), (1, 0)])
+def test_driver_pool_invalid_args(size, max_pages):
+    with pytest.raises(ValueError):
+        scraper_selenium.ChromeDriverPool(
+            size, max_pages_per_driver=max_pages, session_factory=FakeSession)
+
+
+@pytest.mark.slow
+@pytest.mark.selenium
+def test_selenium_scraper_driver_pool():
+    with scraper_selenium.ChromeDriverPool(1) as pool:
+        for url, javascript in SELENIUM_CHROME_GOOD_URLS_SINGLE_PAGE:
+            config = core.ScrapeConfig(url)
+            result = scraper_selenium.SeleniumChromeScraper(config, driver_pool=pool).scrape()
+
+            assert result.status == core.ScrapeStatus.SUCCESS
+            page = result.first_page.html
+            if javascript:
+                assert common.JS_TEST_STRING in page
+            else:
+                assert common.JS_TEST_STRING not in page
+
+        assert pool.stats.launches == 1
+        assert pool.stats.leases == len(SELENIUM_CHROME_GOOD_URLS_SINGLE_PAGE)
+
+
+def test_selenium_scraper_proxy_pool_reuses_drivers():
+    proxy = 'http://proxy1:80'
+    config = _paging_config(1)
+    config.proxy_pool = proxypool.ProxyPool([proxy])
+
+    with scraper_selenium.ChromeDriverPool(1, session_factory=FakePagingSession) as pool:
+        scraper = scraper_selenium.SeleniumChromeScraper(config, driver_pool=pool)
+        for _ in range(2):
+            assert scraper.scrape().status == core.ScrapeStatus.SUCCESS
+
+        stats = pool.for_proxy(proxy).stats
+        assert stats.launches == 1
+        assert stats.leases == 2
+    assert config.proxy_pool.stats()[0].successes == 2
+
+
+def test_selenium_scraper_proxy_pool_with_driver():
+    config = core.ScrapeConfig('http://website.com')
+    config.proxy_pool = proxypool.ProxyPool(['http://proxy1:80'])
+
+    with pytest.raises(exceptions.ScrapeConfigError):
+        scraper_selenium.SeleniumChromeScraper(config, driver=FakePagingDriver())
+
+
+@pytest.mark.selenium
+def test_selenium_scraper_proxy_pool():
+    # The sequence server answers the proxied requests itself
+    with common.SequenceServer([(200, {}, b'<html><body>proxied</body></html>')]) as proxy_server:
+        proxy = proxy_server.url.rsplit('/', 1)[0]
+        pool = proxypool.ProxyPool([proxy])
+
+        config = core.ScrapeConfig('http://www.example.invalid/page.html')
+        config.proxy_pool = pool
+        result = scraper_selenium.SeleniumChromeScraper(config).scrape()
+
+    assert result.status == core.ScrapeStatus.SUCCESS
+    assert 'proxied' in result.first_page.html
+    assert pool.stats()[0].successes == 1
+
+
 #TODO - ADD SOME PROXY TESTS
\ No newline at end of file
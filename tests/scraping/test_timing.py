@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+import ezscrape.scraping.timing as timing
+
+
+def test_phase_timer_phase():
+    phase_timer = timing.PhaseTimer()
+
+    with phase_timer.phase(timing.PHASE_DOWNLOAD):
+        time.sleep(0.02)
+
+    assert 15 < phase_timer.phases[timing.PHASE_DOWNLOAD] < 1000
+    assert phase_timer.total_ms() >= phase_timer.phases[timing.PHASE_DOWNLOAD]
+
+
+def test_phase_timer_phase_raises():
+    phase_timer = timing.PhaseTimer()
+
+    with pytest.raises(ValueError):
+        with phase_timer.phase(timing.PHASE_WAIT):
+            raise ValueError('failed')
+
+    assert timing.PHASE_WAIT in phase_timer.phases
+
+
+def test_phase_timer_phases_add_up():
+    phase_timer = timing.PhaseTimer()
+    phase_timer.add(timing.PHASE_TTFB, 5)
+    phase_timer.add(timing.PHASE_TTFB, 10)
+    phase_timer.update({timing.PHASE_DNS: 1, timing.PHASE_TTFB: 1})
+
+    assert phase_timer.phases == {timing.PHASE_TTFB: 16, timing.PHASE_DNS: 1}
+
+
+def test_phase_timer_start():
+    start_ns = time.perf_counter_ns() - 50 * 1000000
+    assert timing.PhaseTimer(start_ns).total_ms() >= 50
@@ -0,0 +1,150 @@
+import socket
+
+import pytest
+import requests
+
+import ezscrape.scraping.dnscache as dnscache
+import ezscrape.scraping.timing as timing
+import ezscrape.scraping.transport as transport
+import tests.common as common
+
+
+@pytest.fixture
+def timed_session():
+    with requests.Session() as session:
+        session.mount('http://', transport.TimedHTTPAdapter())
+        yield session
+
+
+def test_resolve_localhost():
+    assert '127.0.0.1' in transport.resolve('localhost', 80)
+
+
+def test_resolve_unknown_host():
+    with pytest.raises(socket.gaierror):
+        transport.resolve('unknown.invalid', 80)
+
+
+@pytest.mark.requests
+def test_timed_adapter_new_connection(timed_session):
+    resp = timed_session.get(common.URL_SINGLE_PAGE_NO_JS, stream=True)
+    timings = transport.response_timings(resp)
+    resp.close()
+
+    assert set(timings) == {timing.PHASE_DNS, timing.PHASE_CONNECT,
+                            timing.PHASE_TTFB}
+    assert all(duration >= 0 for duration in timings.values())
+
+
+@pytest.mark.requests
+def test_timed_adapter_reused_connection():
+    with common.SequenceServer([(200, {}, b'html')]) as server:
+        with requests.Session() as session:
+            session.mount('http://', transport.TimedHTTPAdapter())
+            session.get(server.url).close()
+
+            resp = session.get(server.url, stream=True)
+            timings = transport.response_timings(resp)
+            resp.close()
+
+    assert set(timings) == {timing.PHASE_TTFB}
+
+
+@pytest.mark.requests
+def test_response_connection_new_connection(timed_session):
+    resp = timed_session.get(common.URL_SINGLE_PAGE_NO_JS, stream=True)
+    info = transport.response_connection(resp)
+    resp.close()
+
+    assert info.peer_ip == '127.0.0.1'
+    assert info.local_ip == '127.0.0.1'
+    assert info.tls_version is None
+    assert not info.reused
+
+
+def test_response_connection_reused_connection(timed_session):
+    with common.SequenceServer([(200, {}, b'html')]) as server:
+        resp = timed_session.get(server.url, stream=True)
+        first_info = transport.response_connection(resp)
+        # Read the body to release the connection for reuse
+        assert resp.content == b'html'
+
+        resp = timed_session.get(server.url, stream=True)
+        info = transport.response_connection(resp)
+        resp.close()
+
+    assert not first_info.reused
+    assert info.reused
+    assert info.peer_ip == first_info.peer_ip
+
+
+def test_getresponse_buffering_retry():
+    # urllib3 < 1.26 asks for a buffered response first, then calls again
+    with common.SequenceServer([(200, {}, b'html')]) as server:
+        host, port = server.url.split('/')[2].split(':')
+        conn = transport.TimedHTTPConnection(host, int(port))
+        conn.request('GET', '/')
+        with pytest.raises(TypeError):
+            conn.getresponse(buffering=True)
+        resp = conn.getresponse()
+        assert resp.status == 200
+        conn.close()
+
+    assert set(conn.last_timings) == {timing.PHASE_DNS, timing.PHASE_CONNECT,
+                                      timing.PHASE_TTFB}
+    # The failed buffering call doesn't count as a response on the connection
+    assert not conn.last_info.reused
+
+
+@pytest.mark.requests
+def test_timed_adapter_dns_cache(monkeypatch):
+    lookups = []
+    real_resolve = transport.resolve
+
+    def counting_resolve(host, port):
+        lookups.append(host)
+        return real_resolve(host, port)
+
+    monkeypatch.setattr(transport, 'resolve', counting_resolve)
+    cache = dnscache.DnsCache()
+    with requests.Session() as session:
+        # A new connection each request
+        session.mount('http://', transport.TimedHTTPAdapter(
+            pool_maxsize=1, dns_cache=cache))
+        for _ in range(2):
+            session.get('http://localhost:8000/SinglePageNoJS.html',
+                        headers={'Connection': 'close'})
+
+    assert lookups == ['localhost']
+    assert cache.cached('localhost')
+
+
+def test_timed_adapter_dns_cache_failed_lookup():
+    cache = dnscache.DnsCache()
+    with requests.Session() as session:
+        session.mount('http://', transport.TimedHTTPAdapter(dns_cache=cache))
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                session.get('http://unknown.invalid/', timeout=1)
+
+    assert cache.cached('unknown.invalid') == []
+
+
+def test_timed_adapter_connection_error(timed_session):
+    with pytest.raises(requests.ConnectionError):
+        timed_session.get('http://127.0.0.1:1/', timeout=1)
+
+
+def test_response_timings_read_response(timed_session):
+    with common.SequenceServer([(200, {}, b'html')]) as server:
+        resp = timed_session.get(server.url)
+
+    # The connection is released once the body is read
+    assert transport.response_timings(resp) == {}
+
+
+def test_response_connection_read_response(timed_session):
+    with common.SequenceServer([(200, {}, b'html')]) as server:
+        resp = timed_session.get(server.url)
+
+    assert transport.response_connection(resp) is None
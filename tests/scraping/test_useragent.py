@@ -0,0 +1,82 @@
+import collections
+
+import pytest
+
+import ezscrape.scraping.useragent as useragent
+
+
+def test_bundled_store_all_families():
+    store = useragent.get_default_store()
+
+    assert len(store) == len(useragent.BUNDLED_USERAGENTS)
+    for family in useragent.DEFAULT_BROWSER_WEIGHTS:
+        assert store.agents(family)
+
+
+def test_default_store_loaded_once():
+    assert useragent.get_default_store() is useragent.get_default_store()
+
+
+def test_store_grouped_by_family():
+    store = useragent.UserAgentStore(
+        [('Chrome', 'agent1'), ('firefox', 'agent2'), ('chrome', 'agent3')])
+
+    assert len(store) == 3
+    assert sorted(store.families) == ['chrome', 'firefox']
+    assert store.agents('chrome') == ('agent1', 'agent3')
+    assert store.agents('CHROME') == ('agent1', 'agent3')
+    assert store.agents('safari') == ()
+
+
+def test_static_provider():
+    provider = useragent.StaticUserAgentProvider('my-agent')
+    assert provider.get() == 'my-agent'
+    assert useragent.get_useragent(provider) == 'my-agent'
+
+
+def test_base_provider_not_implemented():
+    with pytest.raises(NotImplementedError):
+        useragent.UserAgentProvider().get()
+
+
+def test_weighted_provider_single_family():
+    provider = useragent.WeightedUserAgentProvider({useragent.BROWSER_FIREFOX: 1})
+    firefox_agents = useragent.get_default_store().agents(useragent.BROWSER_FIREFOX)
+
+    for _ in range(50):
+        assert provider.get() in firefox_agents
+
+
+def test_weighted_provider_distribution():
+    store = useragent.UserAgentStore([('family1', 'agent1'), ('family2', 'agent2')])
+    provider = useragent.WeightedUserAgentProvider(
+        {'family1': 9, 'family2': 1, 'unknown': 100}, store=store)
+
+    counter = collections.Counter(provider.get() for _ in range(2000))
+
+    assert set(counter) == {'agent1', 'agent2'}
+    assert counter['agent1'] > counter['agent2'] * 4
+
+
+@pytest.mark.parametrize('weights', [{}, {'unknown': 1}, {useragent.BROWSER_CHROME: 0}])
+def test_weighted_provider_no_agents(weights):
+    with pytest.raises(ValueError):
+        useragent.WeightedUserAgentProvider(weights)
+
+
+def test_set_default_provider():
+    provider = useragent.StaticUserAgentProvider('my-agent')
+    try:
+        useragent.set_default_provider(provider)
+        assert useragent.get_useragent() == 'my-agent'
+    finally:
+        useragent.set_default_provider(None)
+
+    assert useragent.get_useragent() != 'my-agent'
+
+
+def test_fake_useragent_provider():
+    provider = useragent.FakeUserAgentProvider()
+
+    assert provider.get()
+    assert provider.get()
@@ -3,6 +3,10 @@ import pytest
 import ezscrape.scraping.web_lib as web_lib
 
 
+def test_random_useragent():
+    assert web_lib.random_useragent()
+
+
 def test_phrase_from_response_code():
     phrase = web_lib.phrase_from_response_code(200)
     assert phrase == 'OK'
@@ -20,3 +24,37 @@ def test_split_url():
     assert url_split.scheme == 'http'
     assert url_split.hostname == '91.208.39.70'
     assert url_split.port == 8080
+
+
+CONTENT_TYPE_ENCODINGS = [
+    (None, None),
+    ('text/html', None),
+    ('text/html; charset=UTF-8', 'utf-8'),
+    ('text/html; Charset="ISO-8859-1"', 'iso8859-1'),
+    ('text/html; charset=no-such-codec', None)
+]
+@pytest.mark.parametrize('content_type, encoding', CONTENT_TYPE_ENCODINGS)
+def test_encoding_from_content_type(content_type, encoding):
+    assert web_lib.encoding_from_content_type(content_type) == encoding
+
+
+DETECT_ENCODINGS = [
+    (b'<html></html>', None, 'utf-8'),
+    (b'<html></html>', 'latin-1', 'iso8859-1'),
+    (b'\xef\xbb\xbf<html></html>', 'latin-1', 'utf-8-sig'),
+    ('<html></html>'.encode('utf-16'), None, 'utf-16'),
+    (b'<meta charset="Shift_JIS">', None, 'shift_jis'),
+    (b"<meta http-equiv='Content-Type' content='text/html; charset=koi8-r'>", None, 'koi8-r'),
+    (b'<meta charset="no-such-codec">', None, 'utf-8'),
+    ('<p>\u20ac</p>'.encode('utf-8') * 50, None, 'utf-8'),
+    ('<html>caf\u00e9</html>'.encode('utf-8'), None, 'utf-8'),
+    (b'<p>' + '\u20ac'.encode('utf-8') * web_lib.DETECT_SAMPLE_BYTES, None, 'utf-8')
+]
+@pytest.mark.parametrize('content, declared, encoding', DETECT_ENCODINGS)
+def test_detect_encoding(content, declared, encoding):
+    assert web_lib.detect_encoding(content, declared) == encoding
+
+
+def test_meta_encoding_only_start_of_page():
+    content = b' ' * web_lib.META_SNIFF_BYTES + b'<meta charset="koi8-r">'
+    assert web_lib.meta_encoding(content) is None